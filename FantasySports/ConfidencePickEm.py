@@ -14,6 +14,7 @@ the most points that week wins.
 '''
 
 import sportsref_nfl as sr
+import resources
 import pandas as pd
 from bs4 import BeautifulSoup
 from io import StringIO
@@ -33,7 +34,7 @@ def load_pick_probs(week: int) -> pd.DataFrame:
     Returns:
         pd.DataFrame: dataframe containing the percentage of players picking each team in every matchup for that week.
     """
-    nfl_teams = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/team_abbrevs.csv")
+    nfl_teams = resources.read_csv("football/team_abbrevs.csv")
     tempData = open("PickEmDistribution_Week{}.txt".format(week),'r')
     raw_str = tempData.read()
     tempData.close()
@@ -88,7 +89,7 @@ def load_pick_probs_alt(probs_html: str) -> pd.DataFrame:
     probs = pd.DataFrame({"team":[team.text[:-1] for team in teams],"pick_prob":[pct.text[:-1] for pct in pcts]})
     probs.team = probs.team.str.replace("@ ","").str.replace("(LAR)", "Rams")\
     .str.replace("(LAC)", "Chargers").str.replace("(NYJ)", "Jets").str.replace("(NYG)", "Giants")
-    nfl_teams = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/team_abbrevs.csv")
+    nfl_teams = resources.read_csv("football/team_abbrevs.csv")
     probs = pd.merge(left=probs,right=nfl_teams[["name","yahoo"]].rename(columns={"name":"team","yahoo":"pick"}),how="inner",on="team")
     probs.pick_prob = probs.pick_prob.astype(float)/100.0
     return probs
@@ -159,7 +160,7 @@ def load_picks(week: int, schedule: pd.DataFrame) -> pd.DataFrame:
             bad_inds = actual.loc[(actual.player == player) & (actual.points_bid == 0)].index
             actual.loc[bad_inds[0],'points_bid'] = val
     actual = pd.merge(left=actual,right=matchups,how='inner',on='matchup_ind')
-    nfl_teams = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/team_abbrevs.csv")
+    nfl_teams = resources.read_csv("football/team_abbrevs.csv")
     for col in ['pick','favorite','underdog']:
         actual = pd.merge(left=actual,right=nfl_teams[['yahoo','real_abbrev']].rename(columns={"yahoo":col}),how='left',on=col)
         actual.loc[~actual.real_abbrev.isnull(),col] = actual.loc[~actual.real_abbrev.isnull(),'real_abbrev']
@@ -228,7 +229,7 @@ def load_vegas(vegas_loc: str = None):
     matchups.away_prob /= matchups.norm_sum
     del matchups['norm_sum']
     # Converting team names to SportsRef abbreviations
-    nfl_teams = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/team_abbrevs.csv")
+    nfl_teams = resources.read_csv("football/team_abbrevs.csv")
     for team in ['home','away']:
         matchups = pd.merge(left=matchups,right=nfl_teams[["mascot","real_abbrev"]]\
         .rename(columns={"mascot":team + '_team',"real_abbrev":team + "_abbrev"}),how='inner',on=[team + '_team'])
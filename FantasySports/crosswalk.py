@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+# -*-coding:utf-8 -*-
+"""
+@File    :   crosswalk.py
+@Time    :   2026/10/19 14:45:00
+@Author  :   Taylor Firman
+@Version :   1.0
+@Contact :   tefirman@gmail.com
+@Desc    :   Persisted crosswalk between the player identifiers used by each data source
+(Yahoo, Pro Football Reference, Sleeper, and ESPN depth charts).
+"""
+
+import os
+import re
+import pandas as pd
+import numpy as np
+from difflib import SequenceMatcher
+from unidecode import unidecode
+
+
+def clean_name(name: str):
+    """
+    Normalizes a single player name for matching across sources (accents, punctuation, capitalization, and suffixes).
+
+    Args:
+        name (str): player name as provided by the source.
+
+    Returns:
+        str: normalized player name.
+    """
+    cleaned = re.sub(r"[^a-z ]", "", unidecode(str(name)).lower())
+    cleaned = re.sub(r"\s+(jr|sr|ii|iii|iv|v)$", "", cleaned)
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+def clean_names(names: pd.Series):
+    """
+    Normalizes player names for matching across sources (see clean_name).
+
+    Args:
+        names (pd.Series): player names as provided by the source.
+
+    Returns:
+        pd.Series: normalized player names.
+    """
+    return names.fillna("").apply(clean_name)
+
+
+def match_candidates(players: pd.DataFrame, candidates: pd.DataFrame, threshold: float = 0.8, \
+name_weight: float = 0.7, team_weight: float = 0.15, pos_weight: float = 0.15):
+    """
+    Identifies the most likely candidate for each player based on name, team, and position.
+    Exact name matches are found with a single join, while players without one are compared
+    against candidates at the same position via fuzzy string matching. Each match is scored
+    as a weighted sum of name similarity, team agreement, and position agreement, and each
+    candidate is assigned to at most one player (highest confidence wins).
+
+    Args:
+        players (pd.DataFrame): dataframe containing the key, name, team, and position of each player to match.  
+        candidates (pd.DataFrame): dataframe containing the candidate_id, name, team, and position of each candidate.  
+        threshold (float, optional): minimum confidence required for a match, defaults to 0.8.  
+        name_weight (float, optional): weight of name similarity in the confidence score, defaults to 0.7.  
+        team_weight (float, optional): weight of team agreement in the confidence score, defaults to 0.15.  
+        pos_weight (float, optional): weight of position agreement in the confidence score, defaults to 0.15.
+
+    Returns:
+        pd.DataFrame: dataframe containing the key, matched candidate_id, and confidence of each matched player.
+    """
+    players = players.assign(clean=clean_names(players.name))
+    candidates = candidates.assign(clean=clean_names(candidates.name))
+    exact = pd.merge(left=players, right=candidates, how="inner", on="clean", suffixes=("", "_cand"))
+    exact["similarity"] = 1.0
+    unmatched = players.loc[~players.key.isin(exact.key)]
+    fuzzy = []
+    for pos in unmatched.position.dropna().unique():
+        pos_cands = candidates.loc[candidates.position == pos]
+        for key, name, team in unmatched.loc[unmatched.position == pos, ["key", "clean", "team"]].values:
+            sims = np.array([SequenceMatcher(None, name, cand).ratio() for cand in pos_cands.clean])
+            if sims.shape[0] == 0:
+                continue
+            best = sims.argmax()
+            fuzzy.append({"key": key, "team": team, "position": pos, "candidate_id": pos_cands.candidate_id.values[best], \
+            "team_cand": pos_cands.team.values[best], "position_cand": pos, "similarity": sims[best]})
+    scored = pd.concat([exact, pd.DataFrame(fuzzy, columns=["key", "team", "position", "candidate_id", \
+    "team_cand", "position_cand", "similarity"])], ignore_index=True)
+    scored["confidence"] = name_weight*scored.similarity + team_weight*(scored.team == scored.team_cand) \
+    + pos_weight*(scored.position == scored.position_cand)
+    scored = scored.loc[scored.confidence >= threshold].sort_values(by="confidence", ascending=False, kind="stable")
+    scored = scored.drop_duplicates(subset=["key"], keep="first").drop_duplicates(subset=["candidate_id"], keep="first")
+    return scored[["key", "candidate_id", "confidence"]].reset_index(drop=True)
+
+
+class Crosswalk:
+    """
+    Crosswalk class that keeps a persisted table linking the identifiers of each player across sources:
+    Yahoo player ID, Pro Football Reference player ID, Sleeper player ID, and ESPN depth chart name and team.
+    New players are matched automatically (with a confidence score) and previous matches are reused,
+    so each update only considers players the crosswalk hasn't seen before. Manual fixes can be made
+    by editing the persisted table and setting the source to "manual".
+
+    Attributes:
+        path: location of the persisted crosswalk table.
+        table: dataframe containing the identifiers of each player across sources.
+    """
+
+    columns = ["xwalk_id", "yahoo_id", "sr_id", "sleeper_id", "espn_name", "espn_team", "name", "team", "position", "confidence", "source"]
+    """Columns of the crosswalk table."""
+
+    def __init__(self, path: str = "PlayerCrosswalk.csv"):
+        """
+        Loads the persisted crosswalk table if it exists.
+
+        Args:
+            path (str, optional): location of the persisted crosswalk table, defaults to "PlayerCrosswalk.csv".
+        """
+        self.path = path
+        if path and os.path.exists(path):
+            self.table = pd.read_csv(path, dtype={"sr_id": str, "sleeper_id": str, "espn_name": str, "espn_team": str}).reindex(columns=self.columns)
+        else:
+            self.table = pd.DataFrame(columns=self.columns)
+        self.set_dtypes()
+
+    def set_dtypes(self):
+        """
+        Enforces consistent data types across the crosswalk table (integer IDs, string identifiers, float confidence).
+        """
+        self.table = self.table.astype({"xwalk_id": int, "yahoo_id": "Int64", "confidence": float})
+        for col in ["sr_id", "sleeper_id", "espn_name", "espn_team", "name", "team", "position", "source"]:
+            self.table[col] = self.table[col].astype(object).where(self.table[col].notnull(), None)
+
+    def save(self):
+        """
+        Persists the crosswalk table.
+        """
+        if self.path:
+            self.table.to_csv(self.path, index=False)
+
+    def add_players(self, players: pd.DataFrame):
+        """
+        Adds new players to the crosswalk table, assigning each one a new integer crosswalk ID.
+
+        Args:
+            players (pd.DataFrame): dataframe containing whichever crosswalk columns are known for the new players.
+        """
+        first = self.table.xwalk_id.max() + 1 if self.table.shape[0] > 0 else 1
+        players = players.reindex(columns=self.columns)
+        players["xwalk_id"] = np.arange(first, first + players.shape[0])
+        self.table = pd.concat([self.table, players], ignore_index=True)
+        self.set_dtypes()
+
+    def update_yahoo(self, players: pd.DataFrame, candidates: pd.DataFrame, threshold: float = 0.8):
+        """
+        Adds any Yahoo players the crosswalk hasn't seen before and matches them (along with any
+        previously unmatched Yahoo players) to Pro Football Reference player IDs.
+
+        Args:
+            players (pd.DataFrame): dataframe containing the player_id, name, current_team, and position of each Yahoo player.  
+            candidates (pd.DataFrame): dataframe containing the sr_id, name, team, and position of each Pro Football Reference player.  
+            threshold (float, optional): minimum confidence required for a match, defaults to 0.8.
+        """
+        players = players[["player_id", "name", "current_team", "position"]].drop_duplicates(subset=["player_id"])
+        new = players.loc[~players.player_id.isin(self.table.yahoo_id.dropna())]
+        if new.shape[0] > 0:
+            self.add_players(new.rename(columns={"player_id": "yahoo_id", "current_team": "team"}))
+        unmatched = self.table.yahoo_id.isin(players.player_id) & self.table.sr_id.isnull() & (self.table.source != "manual")
+        if not unmatched.any():
+            return
+        # Retrying with where they are now (e.g. a free agent who has since signed)
+        current = players.set_index("player_id")
+        for col, yahoo_col in [("team", "current_team"), ("position", "position")]:
+            self.table.loc[unmatched, col] = self.table.loc[unmatched, "yahoo_id"].map(current[yahoo_col]).values
+        taken = candidates.sr_id.isin(self.table.sr_id.dropna())
+        matches = match_candidates(
+            self.table.loc[unmatched, ["xwalk_id", "name", "team", "position"]].rename(columns={"xwalk_id": "key"}),
+            candidates.loc[~taken].rename(columns={"sr_id": "candidate_id"}),
+            threshold,
+        )
+        self.set_matches(matches, "sr_id")
+
+    def update_sleeper(self, players: pd.DataFrame, threshold: float = 0.8):
+        """
+        Matches crosswalk players without a Sleeper player ID to the Sleeper player list
+        (e.g. from sleeper_api.get_raw_players).
+
+        Args:
+            players (pd.DataFrame): dataframe containing the player_id, full_name, team, and position of each Sleeper player.  
+            threshold (float, optional): minimum confidence required for a match, defaults to 0.8.
+        """
+        unmatched = self.table.sleeper_id.isnull() & (self.table.source != "manual")
+        taken = players.player_id.astype(str).isin(self.table.sleeper_id.dropna())
+        matches = match_candidates(
+            self.table.loc[unmatched, ["xwalk_id", "name", "team", "position"]].rename(columns={"xwalk_id": "key"}),
+            players.loc[~taken, ["player_id", "full_name", "team", "position"]]\
+            .rename(columns={"player_id": "candidate_id", "full_name": "name"}).astype({"candidate_id": str}),
+            threshold,
+        )
+        self.set_matches(matches, "sleeper_id")
+
+    def update_espn(self, depths: pd.DataFrame, threshold: float = 0.8):
+        """
+        Matches crosswalk players to the players listed on ESPN depth charts by name and team,
+        so players sharing a name stay separate. Players without an ESPN listing yet, or whose listing
+        is no longer on the depth charts (e.g. after a trade), are matched again.
+
+        Args:
+            depths (pd.DataFrame): dataframe containing the player, team, and pos of each player on ESPN depth charts.  
+            threshold (float, optional): minimum confidence required for a match, defaults to 0.8.
+        """
+        depths = depths[["player", "team", "pos"]].drop_duplicates(subset=["player", "team"], ignore_index=True)
+        listed = pd.merge(left=self.table[["espn_name", "espn_team"]], right=depths[["player", "team"]]\
+        .rename(columns={"player": "espn_name", "team": "espn_team"}), how="left", on=["espn_name", "espn_team"], indicator=True)
+        listed = (listed._merge == "both").values
+        unmatched = ~listed & (self.table.source != "manual").values
+        taken = pd.merge(left=depths[["player", "team"]], right=self.table.loc[listed, ["espn_name", "espn_team"]]\
+        .rename(columns={"espn_name": "player", "espn_team": "team"}), how="left", on=["player", "team"], indicator=True)
+        depths = depths.loc[(taken._merge == "left_only").values]
+        matches = match_candidates(
+            self.table.loc[unmatched, ["xwalk_id", "name", "team", "position"]].rename(columns={"xwalk_id": "key"}),
+            depths.rename(columns={"player": "name", "pos": "position"}).assign(candidate_id=depths.index),
+            threshold,
+        )
+        rows = self.table.xwalk_id.isin(matches.key)
+        self.table.loc[rows, "espn_team"] = self.table.loc[rows, "xwalk_id"].map(matches.set_index("key").candidate_id.map(depths.team)).values
+        self.set_matches(matches.assign(candidate_id=matches.candidate_id.map(depths.player)), "espn_name")
+
+    def set_matches(self, matches: pd.DataFrame, col: str):
+        """
+        Records newly matched identifiers in the crosswalk table and persists it.
+
+        Args:
+            matches (pd.DataFrame): dataframe containing the crosswalk ID (key), matched identifier, and confidence of each match.  
+            col (str): crosswalk column of the matched identifier.
+        """
+        if matches.shape[0] == 0:
+            return
+        matches = matches.set_index("key")
+        rows = self.table.xwalk_id.isin(matches.index)
+        self.table.loc[rows, col] = self.table.loc[rows, "xwalk_id"].map(matches.candidate_id).values
+        # Confidence of a row reflects its weakest link
+        self.table.loc[rows, "confidence"] = np.fmin(
+            self.table.loc[rows, "confidence"].values,
+            self.table.loc[rows, "xwalk_id"].map(matches.confidence).astype(float).values,
+        )
+        self.table.loc[rows & self.table.source.isnull(), "source"] = "auto"
+        self.save()
+
+    def lookup(self, cols, values):
+        """
+        Translates identifiers from one source into integer crosswalk IDs.
+
+        Args:
+            cols (str or list): crosswalk column(s) of the identifiers provided (e.g. "sr_id", or ["espn_name", "espn_team"]).  
+            values (pd.Series or pd.DataFrame): identifiers to translate (one column for each crosswalk column).
+
+        Returns:
+            pd.Series: crosswalk ID of each identifier (missing if not in the crosswalk).
+        """
+        cols = [cols] if isinstance(cols, str) else list(cols)
+        keys = values.to_frame() if isinstance(values, pd.Series) else values
+        mapping = self.table.dropna(subset=cols).drop_duplicates(subset=cols)[cols + ["xwalk_id"]]
+        xwalk_ids = pd.merge(left=keys.set_axis(cols, axis=1), right=mapping, how="left", on=cols).xwalk_id
+        return pd.Series(xwalk_ids.values, index=values.index).astype("Int64")
+
+    def resolve(self, players: pd.DataFrame, xwalk_ids: pd.Series = None, threshold: float = 0.8):
+        """
+        Translates players only known by name (e.g. ADP rankings or keeper lists) into integer crosswalk IDs,
+        using team and position (where provided) to tell apart players who share a name.
+
+        Args:
+            players (pd.DataFrame): dataframe containing the name, team, and position of each player (team and position may be missing).
+            xwalk_ids (pd.Series, optional): crosswalk IDs eligible to be matched, defaults to None (entire crosswalk).
+            threshold (float, optional): minimum confidence required for a match, defaults to 0.8.
+
+        Returns:
+            pd.Series: crosswalk ID of each player (missing if no confident match).
+        """
+        keys = players.reindex(columns=["name", "team", "position"]).assign(key=np.arange(players.shape[0]))
+        candidates = self.table if xwalk_ids is None else self.table.loc[self.table.xwalk_id.isin(xwalk_ids)]
+        matches = match_candidates(keys, candidates[["xwalk_id", "name", "team", "position"]]\
+        .rename(columns={"xwalk_id": "candidate_id"}), threshold)
+        resolved = matches.set_index("key").candidate_id.reindex(keys.key.values)
+        return pd.Series(resolved.values, index=players.index).astype("Int64")
+
+
+class NameIndex:
+    """
+    NameIndex class that provides fast fuzzy lookups of player names via an inverted index
+    of character trigrams over normalized names. Candidates sharing the most trigrams with the query
+    are narrowed down to a few dozen before being scored exactly, so lookups stay quick regardless
+    of the size of the player pool.
+
+    Attributes:
+        names: array of player names in the order of the table they came from.
+        postings: dictionary of the positions of the names containing each trigram.
+        positions: dictionary of the positions of each exact name.
+    """
+
+    def __init__(self, names: pd.Series):
+        """
+        Builds the trigram index for the names provided.
+
+        Args:
+            names (pd.Series): player names to index.
+        """
+        self.names = names.fillna("").astype(str).values
+        postings = {}
+        self.positions = {}
+        for ind, name in enumerate(self.names):
+            self.positions.setdefault(name, []).append(ind)
+            for gram in set(self.trigrams(clean_name(name))):
+                postings.setdefault(gram, []).append(ind)
+        self.postings = {gram: np.array(inds, dtype=np.int32) for gram, inds in postings.items()}
+
+    @staticmethod
+    def trigrams(name: str):
+        """
+        Breaks a normalized name into overlapping three character chunks (padded so that word boundaries count).
+
+        Args:
+            name (str): normalized player name.
+
+        Returns:
+            list: trigrams of the name.
+        """
+        padded = "  " + name + " "
+        return [padded[ind:ind + 3] for ind in range(len(padded) - 2)]
+
+    @staticmethod
+    def refresh(index, names: pd.Series):
+        """
+        Reuses the provided index if it still matches the names provided, otherwise builds a new one.
+
+        Args:
+            index (NameIndex): previously built index (or None).  
+            names (pd.Series): current player names.
+
+        Returns:
+            NameIndex: index matching the current player names.
+        """
+        names = names.fillna("").astype(str).values
+        if index is not None and index.names.shape == names.shape and (index.names == names).all():
+            return index
+        return NameIndex(pd.Series(names))
+
+    def exact(self, name: str):
+        """
+        Identifies the positions of the exact name provided.
+
+        Args:
+            name (str): player name of interest.
+
+        Returns:
+            list: positions of the players with that name.
+        """
+        return self.positions.get(name, [])
+
+    def closest(self, query: str, num_results: int = 3, mask: np.ndarray = None, num_candidates: int = 24):
+        """
+        Identifies the names that most closely resemble the query.
+
+        Args:
+            query (str): name to look up.  
+            num_results (int, optional): number of closest names to provide, defaults to 3.  
+            mask (np.ndarray, optional): boolean array of which names are eligible, defaults to None (all names).  
+            num_candidates (int, optional): number of trigram candidates to score exactly, defaults to 24.
+
+        Returns:
+            np.ndarray: positions of the closest names, most similar first.
+        """
+        hits = [self.postings[gram] for gram in set(self.trigrams(clean_name(query))) if gram in self.postings]
+        counts = np.bincount(np.concatenate(hits), minlength=self.names.shape[0]) if hits \
+        else np.zeros(self.names.shape[0], dtype=int)
+        if mask is not None:
+            counts = np.where(mask, counts, -1)
+        if counts.shape[0] > num_candidates:
+            candidates = np.argpartition(-counts, num_candidates)[:num_candidates]
+        else:
+            candidates = np.arange(counts.shape[0])
+        candidates = candidates[counts[candidates] >= 0]
+        scores = np.array([SequenceMatcher(None, self.names[ind], query).ratio() for ind in candidates])
+        return candidates[np.argsort(-scores, kind="stable")[:num_results]]
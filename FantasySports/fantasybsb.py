@@ -15,6 +15,7 @@ import datetime
 import time
 import os
 import sportsref_mlb as mlb
+import resources
 from bs4 import BeautifulSoup
 from pytz import timezone
 import unidecode
@@ -106,13 +107,7 @@ def establish_oauth(season=None,name=None,new_login=False):
     del mlb_schedule['opp_starter']
     mlb_schedule = pd.merge(left=mlb_schedule,right=mlb_schedule[['team','date','starter']]\
     .rename(columns={'team':'opp','starter':'opp_starter'}),how='left',on=['opp','date'])
-    try:
-        mlb_teams = pd.read_csv("https://raw.githubusercontent.com/" + \
-        "tefirman/FantasySports/master/res/baseball/team_abbrevs.csv")
-    except:
-        mlb_teams = [team.split(',') for team in requests.get("https://raw.githubusercontent.com/" + \
-        "tefirman/FantasySports/master/res/baseball/team_abbrevs.csv",verify=False).text.split('\r')]
-        mlb_teams = pd.DataFrame(mlb_teams[1:],columns=mlb_teams[0])
+    mlb_teams = resources.read_csv("baseball/team_abbrevs.csv")
     mlb_schedule = pd.merge(left=mlb_schedule,right=mlb_teams,how='inner',on='team')
     mlb_schedule = mlb_schedule.loc[mlb_schedule.date > datetime.datetime.now()].reset_index(drop=True)
     mlb_schedule.loc[mlb_schedule.starter.isin(['Shohei Ohtani','Michael Lorenzen','Brendan McKay']),'starter'] += ' (Pitcher)'
@@ -459,13 +454,7 @@ def get_rates_pitcher(player_stats,min_games=0,num_sims=10000):
     return player_stats
 
 def add_injuries(by_player):
-    try:
-        inj_proj = pd.read_csv("https://raw.githubusercontent.com/" + \
-        "tefirman/FantasySports/master/res/baseball/injured_list.csv")
-    except:
-        inj_proj = [player.split(',') for player in requests.get("https://raw.githubusercontent.com/" + \
-        "tefirman/FantasySports/master/res/baseball/injured_list.csv",verify=False).text.split('\r')]
-        inj_proj = pd.DataFrame(inj_proj[1:],columns=inj_proj[0])
+    inj_proj = resources.read_csv("baseball/injured_list.csv")
     inj_proj.until = pd.to_datetime(inj_proj.until)
     inj_proj = inj_proj.loc[inj_proj.until >= datetime.datetime.now()]
     by_player = pd.merge(left=by_player,right=inj_proj,how='left',on=['full_name','editorial_team_abbr'])
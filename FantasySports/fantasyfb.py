@@ -14,6 +14,8 @@ import os
 import shutil
 import numpy as np
 import sportsref_nfl as sr
+import resources
+import crosswalk
 import time
 import datetime
 from pytz import timezone
@@ -321,10 +323,7 @@ class League:
         """
         Loads a translation table for all NFL team abbreviations across platforms
         """
-        self.nfl_teams = pd.read_csv(
-            "https://raw.githubusercontent.com/"
-            + "tefirman/FantasySports/main/res/football/team_abbrevs.csv"
-        )
+        self.nfl_teams = resources.read_csv("football/team_abbrevs.csv")
 
     def load_nfl_schedule(self, path: str = "NFLSchedule.csv"):
         """
@@ -539,29 +538,33 @@ class League:
             ]
         ]
 
-    def pull_stats(self, start: int, finish: int, path: str = "GameByGameFantasyFootballStats.csv"):
+    def pull_stats(self, start: int, finish: int, path: str = "GameByGameFantasyFootballStats"):
         """
         Pulls a dataframe containing event rates based on per-game statistics during the specified timeframe.
+        Only the columns needed for fantasy scoring are read from the stats store.
 
         Args:
             start (int): year and number of the first week of interest (YYYYWW, e.g. 202102 = week 2 of 2021).  
             finish (int): year and number of the last week of interest (YYYYWW, e.g. 202307 = week 7 of 2023).  
-            path (str, optional): location of saved per-game statistics, defaults to "GameByGameFantasyFootballStats.csv".
+            path (str, optional): location of the per-game statistics store, defaults to "GameByGameFantasyFootballStats".
 
         Returns:
             pd.DataFrame: dataframe containing player rates based on games during the timespan of interest.
         """
-        stats = sr.get_bulk_stats(start//100,start%100,finish//100,finish%100,False,path)
+        columns = ["season", "week", "game_id", "player", "player_id", "team", "opponent", "pos", "string",
+                   "pass_cmp", "pass_yds", "pass_td", "pass_int", "pass_first_down", "rush_att", "rush_yds", 
+                   "rush_td", "rush_first_down", "rec", "rec_yds", "rec_td", "rec_first_down", "fumbles_lost",
+                   "kick_ret_yds", "kick_ret_td", "punt_ret_yds", "punt_ret_td", "xpm", "fgm", "sacks",
+                   "def_int", "def_int_td", "fumbles_rec", "fumbles_rec_td"]
+        # Sticking with object dtypes since the groupbys below assume non-categorical keys
+        stats = sr.get_bulk_stats(start//100,start%100,finish//100,finish%100,False,path,columns=columns,categorical=False)
         s = sr.Schedule(stats.season.min(),stats.season.max())
         pts_allowed = pd.concat([s.schedule[['boxscore_abbrev','team1_abbrev','score2']]\
         .rename(columns={'boxscore_abbrev':'game_id','team1_abbrev':'team','score2':'points_allowed'}),\
         s.schedule[['boxscore_abbrev','team2_abbrev','score1']]\
         .rename(columns={'boxscore_abbrev':'game_id','team2_abbrev':'team','score1':'points_allowed'})],ignore_index=True)
         stats = pd.merge(left=stats,right=pts_allowed,how='left',on=['game_id','team'])
-        pos_corrections = pd.read_csv(
-            "https://raw.githubusercontent.com/"
-            + "tefirman/FantasySports/main/res/football/pos_corrections.csv"
-        )
+        pos_corrections = resources.read_csv("football/pos_corrections.csv")
         stats = pd.merge(left=stats,right=pos_corrections[['player_id','actual_pos']],how='left',on=['player_id'])
         stats.loc[~stats.actual_pos.isnull(),'pos'] = stats.loc[~stats.actual_pos.isnull(),'actual_pos']
         del stats['actual_pos']
@@ -658,6 +661,7 @@ class League:
         Loads individual player statistics for each game in the specified timeframe 
         and calculates fantasy points based on league settings. Initially looks for 
         pre-pulled statistics saved locally and pulls new stats when necessary.
+        Also indexes the statistics by player, team, and position for quick lookups.
 
         Args:
             start (int): year and number of the first week of interest (YYYYWW, e.g. 202102 = week 2 of 2021).  
@@ -671,16 +675,14 @@ class League:
             how="left",
             on=["season", "week", "team"],
         )
+        self.game_logs = sr.GameLogIndex(self.stats, "player_id_sr", position="position")
 
     def name_corrections(self):
         """
         Applies name corrections between Pro Football Reference and Yahoo.
         """
         self.load_stats((self.season - 2) * 100 + 1, self.season * 100 + self.week - 1)
-        corrections = pd.read_csv(
-            "https://raw.githubusercontent.com/"
-            + "tefirman/FantasySports/main/res/football/name_corrections.csv"
-        )
+        corrections = resources.read_csv("football/name_corrections.csv")
         self.players = pd.merge(
             left=self.players, right=corrections, how="left", on="name"
         )
@@ -689,9 +691,10 @@ class League:
 
     def get_player_ids(self):
         """
-        Maps between Yahoo player ID's and SportsRef player ID's based on team rosters and draft results.
+        Maps between Yahoo player ID's and SportsRef player ID's based on team rosters and draft results, 
+        by way of the persisted player crosswalk (only players the crosswalk hasn't matched yet are looked at).
         """
-        self.nfl_rosters = sr.get_bulk_rosters(self.season - 1,self.latest_season,"NFLRosters.csv")
+        self.nfl_rosters = sr.get_bulk_rosters(self.season - 1,self.latest_season,"NFLRosters")
         self.nfl_rosters = self.nfl_rosters.rename(columns={'player':'name','player_id':'player_id_sr','team':'current_team'})
         self.players = pd.merge(
             left=self.players,right=self.nfl_teams[["real_abbrev", "yahoo"]].rename(
@@ -700,27 +703,22 @@ class League:
             how="inner",
             on="editorial_team_abbr",
         )
-        self.players = pd.merge(left=self.players,right=self.nfl_rosters[['name','current_team','player_id_sr']].drop_duplicates()\
-        .rename(columns={'player':'name','player_id':'player_id_sr','team':'current_team'}),how='left',on=['name','current_team'])
-        # Two Michael Carter's on the same team. What are the odds...
-        self.players = self.players.loc[~self.players.player_id_sr.isin(['CartMi02'])].reset_index(drop=True)
-        id_check = self.players.groupby('player_id_sr').size().to_frame('freq').reset_index()
-        if id_check.freq.max() > 1:
-            print('Found the same player ID on multiple players: ' + ', '.join(id_check.loc[id_check.freq > 1,'player_id_sr'].tolist()))
         defenses = self.players.position.isin(['DEF'])
+        self.xwalk = crosswalk.Crosswalk()
+        # New Yahoo players, or ones still without a match (rookies, new signings) get another look at the latest rosters
+        matched = self.xwalk.table.loc[~self.xwalk.table.sr_id.isnull(),'yahoo_id'].dropna()
+        if (~self.players.loc[~defenses,'player_id'].isin(matched)).any():
+            latest_draft = sr.get_draft(self.latest_season)[['player','player_id','team_abbrev','pos']]\
+            .rename(columns={'player':'name','player_id':'player_id_sr','team_abbrev':'current_team'})
+            candidates = pd.concat([self.nfl_rosters[['name','player_id_sr','current_team','pos']],latest_draft],ignore_index=True)\
+            .rename(columns={'player_id_sr':'sr_id','current_team':'team','pos':'position'})\
+            .dropna(subset=['sr_id']).drop_duplicates(subset=['sr_id'],keep='last')
+            self.xwalk.update_yahoo(self.players.loc[~defenses],candidates)
+        self.players = pd.merge(left=self.players,right=self.xwalk.table[['yahoo_id','xwalk_id','sr_id']]\
+        .dropna(subset=['yahoo_id']).astype({'yahoo_id':int})\
+        .rename(columns={'yahoo_id':'player_id','sr_id':'player_id_sr'}),how='left',on='player_id')
+        self.players.xwalk_id = self.players.xwalk_id.astype("Int64")
         self.players.loc[defenses,'player_id_sr'] = self.players.loc[defenses,'name']
-        latest_draft = sr.get_draft(self.latest_season)[['player','player_id','team_abbrev']]\
-        .rename(columns={'player':'name','player_id':'player_id_sr','team_abbrev':'current_team'})
-        missing = self.players.player_id_sr.isnull() & self.players.name.isin(latest_draft.name.unique())
-        unsigned = self.players[missing].reset_index(drop=True)
-        del unsigned['player_id_sr']
-        unsigned = pd.merge(left=unsigned,right=latest_draft[['name','current_team','player_id_sr']].drop_duplicates(subset=['name'],keep='first'),how='inner',on=['name','current_team'])
-        self.players = pd.concat([self.players[~missing],unsigned],ignore_index=True)
-        missing = self.players.player_id_sr.isnull() & self.players.name.isin(self.nfl_rosters.name.unique())
-        closest = self.players[missing].reset_index(drop=True)
-        del closest['player_id_sr'], closest['current_team']
-        closest = pd.merge(left=closest,right=self.nfl_rosters[['name','current_team','player_id_sr']].drop_duplicates(subset=['name'],keep='last'),how='inner',on='name')
-        self.players = pd.concat([self.players[~missing],closest],ignore_index=True)
         still_missing = self.players.player_id_sr.isnull()
         self.players.loc[still_missing,'player_id_sr'] = self.players.loc[still_missing,'player_id']
 
@@ -735,10 +733,7 @@ class League:
             reference_games (int, optional): number of games to include the prior for rate calculation, defaults to None.  
             basaloppstringtime (list, optional): list containing the basal factor, opponent elo factor, and depth chart factor, defaults to [].
         """
-        params = pd.read_csv(
-            "https://raw.githubusercontent.com/"
-            + "tefirman/FantasySports/main/res/football/weighting_factors.csv"
-        )
+        params = resources.read_csv("football/weighting_factors.csv")
         if earliest:
             self.earliest = {}
             for pos in ["QB","RB","WR","TE","K","DEF"]:
@@ -777,26 +772,17 @@ class League:
         self.players["until"] = float("NaN")
         if as_of < self.latest_season * 100 + self.current_week:
             self.load_stats(self.season * 100 + 1, self.season * 100 + 17)
-            self.stats = self.stats.loc[
-                self.stats.season * 100 + self.stats.week >= as_of
-            ]
-            healthy = self.stats.loc[
-                self.stats.season * 100 + self.stats.week == as_of, "name"
-            ].tolist()
-            injured = self.players.loc[
-                ~self.players.name.isin(healthy), "name"
+            first_games = sr.GameLogIndex(self.stats, "name", position="position").first_games(as_of)
+            healthy = first_games.loc[
+                first_games.season * 100 + first_games.week == as_of, "name"
             ].tolist()
-            for name in injured:
-                until = self.stats.loc[self.stats.name == name, "week"].min() - 1
-                if not np.isnan(until):
-                    self.players.loc[self.players.name == name, "until"] = until
-                elif self.season < self.latest_season:
-                    self.players.loc[self.players.name == name, "until"] = 17
+            injured = ~self.players.name.isin(healthy)
+            self.players.loc[injured, "until"] = self.players.loc[injured, "name"]\
+            .map(first_games.set_index("name").week - 1)
+            if self.season < self.latest_season:
+                self.players.loc[injured & self.players.until.isnull(), "until"] = 17
         if as_of // 100 == self.latest_season:
-            inj_proj = pd.read_csv(
-                "https://raw.githubusercontent.com/"
-                + "tefirman/FantasySports/main/res/football/injured_list.csv"
-            )
+            inj_proj = resources.read_csv("football/injured_list.csv")
             inj_proj = inj_proj.loc[inj_proj.until >= self.current_week]
             self.players = pd.merge(
                 left=self.players.rename(columns={"until": "until_orig"}),
@@ -962,10 +948,12 @@ class League:
         Pulls current team depth charts from ESPN and merges them into the players dataframe.
         """
         if self.season == self.latest_season and self.week == self.current_week:
-            # Include name corrections here???
-            self.players = pd.merge(left=self.players,right=sr.get_all_depth_charts()\
-            .rename(columns={'player':'name','pos':'position','team':'current_team'}),\
-            how="left",on=["current_team","name",'position'])
+            depths = sr.get_all_depth_charts()
+            self.xwalk.update_espn(depths)
+            depths["xwalk_id"] = self.xwalk.lookup(["espn_name","espn_team"], depths[["player","team"]])
+            self.players = pd.merge(left=self.players,right=depths.dropna(subset=["xwalk_id"])\
+            .drop_duplicates(subset=["xwalk_id","pos"])[["xwalk_id","pos","string"]].rename(columns={'pos':'position'}),\
+            how="left",on=["xwalk_id",'position'])
             missing = self.players.string.isnull() & ~self.players.position.isin(['DEF']) \
             & ((self.players.pct_rostered > 0.05) | ~self.players.fantasy_team.isnull()) \
             & ~self.players.status.isin(['NA']) & self.players.until.isnull()
@@ -976,9 +964,7 @@ class League:
                 )
         else:
             self.load_stats(self.season * 100 + 1, self.season * 100 + 17)
-            strings = self.stats.loc[self.stats.season * 100 + self.stats.week >= self.season*100 + self.week]\
-            .sort_values(by=['season','week'],ascending=True)[['player_id_sr','string']]\
-            .drop_duplicates(subset=['player_id_sr'],keep='first')
+            strings = self.game_logs.first_games(self.season*100 + self.week)[['player_id_sr','string']]
             self.players = pd.merge(left=self.players,right=strings,how='left',on=['player_id_sr'])
         self.players.loc[self.players.position == 'DEF','string'] = 1.0
         self.players.string = self.players.string.fillna(2.0)
@@ -994,11 +980,8 @@ class League:
         as_of = self.season * 100 + self.week
         if not hasattr(self,"stats") or reload:
             self.load_stats(min(self.earliest.values()), as_of - 1)
-        rel_stats = self.stats.copy()
-        for pos in self.earliest:
-            rel_stats = rel_stats.loc[(rel_stats["position"] != pos) | \
-            ((rel_stats.season*100 + rel_stats.week <= as_of - 1) & \
-            (rel_stats.season*100 + rel_stats.week >= self.earliest[pos]))].reset_index(drop=True)
+        rel_stats = pd.concat([self.stats.loc[~self.stats.position.isin(list(self.earliest))]] + \
+        [self.game_logs.position_games(pos, self.earliest[pos], as_of - 1) for pos in self.earliest],ignore_index=True)
         rel_stats = pd.merge(left=rel_stats,right=self.basaloppstringtime,how='left',on='position')
         rel_stats["game_factor"] = rel_stats["basal"] + rel_stats["opp_elo_weight"]*rel_stats["elo_diff"] \
             + rel_stats["string_weight"]*(1 - rel_stats["string"])
@@ -1180,11 +1163,7 @@ class League:
         avgs = by_player.player_id_sr.astype(str).str.startswith("avg_")
         by_player.loc[avgs,"name"] = "Average_" + by_player.loc[avgs,"position"]
         teams_as_of = (
-            self.stats.loc[self.stats.season * 100 + self.stats.week >= as_of]
-            .sort_values(by=["season","week"],ascending=True)
-            .drop_duplicates(subset="player_id_sr", keep="first")[
-                ["player_id_sr", "team"]
-            ]
+            self.game_logs.first_games(as_of)[["player_id_sr", "team"]]
             .rename(columns={"team": "actual_team"})
         )
         by_player = pd.merge(
@@ -1243,8 +1222,8 @@ class League:
         schedule.score_2 = schedule.score_2.astype(float)
 
         """ MANY MILE POSTSEASON """
-        if os.path.exists("res/football/many_mile.csv"):
-            many_mile_sched = pd.read_csv("res/football/many_mile.csv")
+        if resources.resource_path("football/many_mile.csv"):
+            many_mile_sched = pd.read_csv(resources.resource_path("football/many_mile.csv"))
         else:
             many_mile_sched = pd.DataFrame(columns=["season", "week"])
         algo = (
@@ -1451,24 +1430,109 @@ class League:
                         "starter",
                     ] = True
 
-    def bestball_sims(self, payouts: list = [20,20,20]):
+    def future_lineups(self, players: pd.DataFrame, weeks: list, bestball: bool = False):
+        """
+        Vectorized equivalent of starters for weeks that haven't kicked off yet, 
+        projecting every player for every week at once and picking out each team's starters.
+
+        Args:
+            players (pd.DataFrame): rostered players to project.  
+            weeks (list): weeks to project.  
+            bestball (bool, optional): whether to return every player's weekly projection instead of summing up starters, defaults to False.
+
+        Returns:
+            pd.DataFrame: weekly projections for each fantasy team (or each rostered player when using best ball settings).
+        """
+        as_of = self.season * 100 + self.week
+        cols = ["player_id_sr", "name", "position", "current_team", "fantasy_team", "points_rate", "points_stdev", "string", "until", "bye_week"]
+        cols += [col for col in self.basaloppstringtime.columns if col in players.columns and col != "position"]
+        games = pd.merge(left=players[cols], right=pd.DataFrame({"week": list(weeks)}), how="cross")
+        games = pd.merge(
+            left=games,
+            right=self.nfl_schedule.loc[
+                self.nfl_schedule.season == as_of // 100, ["week", "team", "elo_diff"]
+            ],
+            how="left",
+            left_on=["week", "current_team"],
+            right_on=["week", "team"],
+        )
+        games.elo_diff = games.elo_diff.infer_objects(copy=False).fillna(0.0)
+        if "opp_elo_weight" not in games.columns:
+            games = pd.merge(left=games,right=self.basaloppstringtime,how='left',on='position')
+        games["points_avg"] = games["points_rate"]*(games['basal'] + games['opp_elo_weight']*games["elo_diff"] \
+        + games['string_weight']*(1 - games["string"]))
+        if bestball:
+            return games[['player_id_sr','name','position','fantasy_team','points_avg','points_stdev','week']]
+        # Within each week, a team's top N available players at a position are its starters there
+        games = games.sort_values(by="points_avg", ascending=False)
+        games["starter"] = False
+        available = ~(games.until >= games.week) & (games.bye_week != games.week)
+        num_pos = self.roster_spots.loc[~self.roster_spots.position.isin(["W/T", "W/R/T", "Q/W/R/T", "BN", "IR"])].set_index('position').to_dict()['count']
+        for pos in num_pos:
+            depth = games.loc[available & (games.position == pos)].groupby(["week", "fantasy_team"]).cumcount()
+            games.loc[depth.index[depth < num_pos[pos]], "starter"] = True
+        flex_pos = {"W/T":['WR','TE'],"W/R/T":['WR','RB','TE'],"Q/W/R/T":['WR','RB','TE','QB']}
+        for pos in flex_pos:
+            num_flex = self.roster_spots.loc[self.roster_spots.position == pos,'count'].sum()
+            depth = games.loc[available & ~games.starter & games.position.isin(flex_pos[pos])].groupby(["week", "fantasy_team"]).cumcount()
+            games.loc[depth.index[depth < num_flex], "starter"] = True
+        games["points_var"] = games.points_stdev**2
+        return games.loc[games.starter].groupby(["fantasy_team", "week"])[["points_avg", "points_var"]].sum().reset_index()
+
+    def weekly_projections(self, team_names: list = None, bestball: bool = False):
+        """
+        Projects each fantasy team's lineup for every week being simulated, 
+        which can be cached and updated one team at a time when only a few rosters change (e.g. during a draft).
+
+        Args:
+            team_names (list, optional): fantasy teams to project, defaults to None (every team with a roster).  
+            bestball (bool, optional): whether to keep every rostered player's projection for best ball simulations instead of summing up starters, defaults to False.
+
+        Returns:
+            pd.DataFrame: weekly projections for each fantasy team (or each rostered player when using best ball settings).
+        """
+        as_of = self.season * 100 + self.week
+        rostered = self.players.loc[~self.players.fantasy_team.isnull()]
+        if team_names is not None:
+            rostered = rostered.loc[rostered.fantasy_team.isin(team_names)]
+        if bestball:
+            return self.future_lineups(rostered, range(self.week,self.settings['playoff_start_week']), bestball=True)
+        live = as_of // 100 == self.latest_season and datetime.datetime.now().month > 8
+        future = [week + 1 for week in range(17) if week + 1 > as_of % 100 or (week + 1 == as_of % 100 and not live)]
+        projections = self.future_lineups(rostered, future)
+        if live and as_of % 100 <= 17:
+            # The current week depends on who's already played, which starters keeps track of
+            all_players = self.players
+            if team_names is not None:
+                self.players = all_players.loc[all_players.fantasy_team.isin(team_names)].copy()
+            try:
+                self.starters(as_of % 100)
+                self.players["points_var"] = self.players.points_stdev**2
+                current = self.players.loc[self.players.starter].groupby("fantasy_team")[["points_avg", "points_var"]].sum().reset_index()
+                current["week"] = as_of % 100
+                del self.players["points_var"]
+            finally:
+                if team_names is not None:
+                    self.players = all_players
+            projections = pd.concat([current,projections],ignore_index=True,sort=False)
+        projections["points_stdev"] = projections["points_var"] ** 0.5
+        return projections
+
+    def bestball_sims(self, payouts: list = [20,20,20], projections: pd.DataFrame = None):
         """
         Simulates the remainder of the fantasy season based on current rosters 
         and best ball settings using Monte Carlo simulations.
 
         Args:
-            payouts (list, optional): list of prize amounts for first, second, and third, defaults to [800, 300, 100].
+            payouts (list, optional): list of prize amounts for first, second, and third, defaults to [800, 300, 100].  
+            projections (pd.DataFrame, optional): precomputed best ball projections from weekly_projections, defaults to None (projecting every roster from scratch).
 
         Returns:
             standings (pd.DataFrame): simulated results for the final season standings and playoff projections.
         """
         self.refresh_oauth()
-        projections = pd.DataFrame(columns=["fantasy_team", "week", "points_avg", "points_stdev"])
-        for week in range(self.week,self.settings['playoff_start_week']):
-            self.starters(week)
-            projections = pd.concat([projections,self.players.loc[~self.players.fantasy_team.isnull(),\
-            ['player_id_sr','name','position','fantasy_team','points_avg','points_stdev']].reset_index(drop=True)],ignore_index=True,sort=False)
-            projections.loc[projections.week.isnull(), "week"] = week
+        if projections is None:
+            projections = self.weekly_projections(bestball=True)
         season_sims = pd.concat([projections] * self.num_sims, ignore_index=True)
         season_sims["num_sim"] = season_sims.index // projections.shape[0]
         season_sims["points_sim"] = (
@@ -1513,6 +1577,7 @@ class League:
         postseason: bool = True, 
         payouts: list = [800, 300, 100], 
         fixed_winner: list = None,
+        projections: pd.DataFrame = None,
     ):
         """
         Simulates the remainder of the fantasy season based on current rosters 
@@ -1521,30 +1586,16 @@ class League:
         Args:
             postseason (bool, optional): whether to simulate the postseason in addition to the regular season, defaults to True.  
             payouts (list, optional): list of prize amounts for first, second, and third, defaults to [800, 300, 100].  
-            fixed_winner (list, optional): list containing the week and team name of a fixed winner, defaults to None.
+            fixed_winner (list, optional): list containing the week and team name of a fixed winner, defaults to None.  
+            projections (pd.DataFrame, optional): precomputed weekly projections from weekly_projections, defaults to None (projecting every roster from scratch).
 
         Returns:
             schedule (pd.DataFrame): simulated results for each matchup throughout the season in question  
             standings (pd.DataFrame): simulated results for the final season standings and playoff projections
         """
         self.refresh_oauth()
-        self.players["points_var"] = self.players.points_stdev**2
-        projections = pd.DataFrame(
-            columns=["fantasy_team", "week", "points_avg", "points_var"]
-        )
-        for week in range(17):
-            self.starters(week + 1)
-            projections = pd.concat([projections,
-                self.players.loc[self.players.starter]
-                .groupby("fantasy_team")[["points_avg", "points_var"]]
-                .sum()
-                .reset_index()],
-                ignore_index=True,
-                sort=False,
-            )
-            projections.loc[projections.week.isnull(), "week"] = week + 1
-        projections["points_stdev"] = projections["points_var"] ** 0.5
-        del self.players["points_var"]
+        if projections is None:
+            projections = self.weekly_projections()
         schedule = pd.merge(
             left=self.schedule.copy(),
             right=projections.rename(
@@ -2105,14 +2156,14 @@ class League:
         self.load_stats(as_of - 100, as_of - 1)
         """ Creating histograms across all players in each position """
         pos_hists = {"points": np.arange(-10, 50.1, 0.1)}
-        for pos in self.stats.position.unique():
+        for pos in self.game_logs.positions():
             pos_hists[pos] = np.histogram(
-                self.stats.loc[self.stats.position == pos, "points"],
+                self.game_logs.position_games(pos).points,
                 bins=pos_hists["points"],
             )[0]
             pos_hists[pos] = pos_hists[pos] / sum(pos_hists[pos])
         pos_hists["FLEX"] = np.histogram(
-            self.stats.loc[self.stats.position.isin(["RB", "WR", "TE"]), "points"],
+            np.concatenate([self.game_logs.position_games(pos).points.values for pos in ["RB", "WR", "TE"]]),
             bins=pos_hists["points"],
         )[0]
         pos_hists["FLEX"] = pos_hists["FLEX"] / sum(pos_hists["FLEX"])
@@ -2372,6 +2423,8 @@ class League:
         payouts: list = [800, 300, 100],
         bestball: bool = False,
         min_rostership: float = 0.05,
+        stop=None,
+        projections: pd.DataFrame = None,
     ):
         """
         Simulates the remainder of the season with the current roster and compares it to 
@@ -2385,17 +2438,28 @@ class League:
             postseason (bool, optional): whether to analyze postseason gains or just regular season, defaults to True.  
             verbose (bool, optional): whether to print out a status report as the code runs, defaults to True.  
             payouts (list, optional): list of payout amounts for top three finishers, defaults to [800, 300, 100].  
-            bestball (bool, optional): whether to use best ball settings during simulation, defaults to False.
+            bestball (bool, optional): whether to use best ball settings during simulation, defaults to False.  
+            min_rostership (float, optional): minimum rostership percentage of players to consider, defaults to 0.05.  
+            stop (threading.Event, optional): event signaling that the results are no longer needed, defaults to None.  
+            projections (pd.DataFrame, optional): cached weekly projections for the current rosters, in which case only the team of interest is re-projected for each add, defaults to None.
 
         Returns:
-            pd.DataFrame: dataframe containing the impact and value of every possible add analyzed.
+            pd.DataFrame: dataframe containing the impact and value of every possible add analyzed (None if stopped early).
         """
         as_of = self.season * 100 + self.week
         self.refresh_oauth()
+        if not team_name:
+            team_name = [
+                team["name"]
+                for team in self.teams
+                if team["team_key"] == self.lg.team_key()
+            ][0]
         if bestball:
-            orig_standings = self.bestball_sims(payouts)
+            orig_standings = self.bestball_sims(payouts, projections)
         else:
-            orig_standings = self.season_sims(postseason, payouts)[1]
+            orig_standings = self.season_sims(postseason, payouts, projections=projections)[1]
+        if projections is not None:
+            others = projections.loc[projections.fantasy_team != team_name]
         added_value = pd.DataFrame(
             columns=[
                 "player_to_add",
@@ -2421,12 +2485,6 @@ class League:
                 else []
             )
         )
-        if not team_name:
-            team_name = [
-                team["name"]
-                for team in self.teams
-                if team["team_key"] == self.lg.team_key()
-            ][0]
         available = self.players.loc[self.players.fantasy_team.isnull() \
         & (self.players.until.isnull() | (self.players.until < 17)) \
         & (self.players.pct_rostered >= min_rostership)].reset_index(drop=True)
@@ -2437,15 +2495,20 @@ class League:
             possible = possible.loc[~possible.name.isin(exclude)]
         possible = possible.groupby("position").head(limit_per)
         for free_agent in possible.name:
+            if stop is not None and stop.is_set():
+                return None
             if verbose:
                 print("{}, {}".format(free_agent, datetime.datetime.now()))
             self.players.loc[
                 self.players.name == free_agent, "fantasy_team"
             ] = team_name
+            new_projections = None
+            if projections is not None:
+                new_projections = pd.concat([others,self.weekly_projections([team_name], bestball)],ignore_index=True,sort=False)
             if bestball:
-                new_standings = self.bestball_sims(payouts)
+                new_standings = self.bestball_sims(payouts, new_projections)
             else:
-                new_standings = self.season_sims(postseason, payouts)[1]
+                new_standings = self.season_sims(postseason, payouts, projections=new_projections)[1]
             added_value = pd.concat([added_value,
                 new_standings.loc[new_standings.team == team_name]],
                 ignore_index=True,
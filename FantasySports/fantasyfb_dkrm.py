@@ -5,10 +5,24 @@ import fantasyfb as fb
 import sportsref_nfl as sr
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds
+from scipy import sparse
+import itertools
+import heapq
 import os
 import sys
 import optparse
 
+# INCORPORATE DIFFERENT CONTEST TYPES!!!
+positions = {"QB":1,"WR":2,"RB":2,"TE":1,"K":1,'DEF':1}
+flex = [pos for pos in positions if pos != 'QB']
+slots = ["{}{}".format(pos, num + 1) for pos in positions for num in range(positions[pos])] + ["FLEX1"]
+lineup_columns = ["{}_{}".format(col, slot) for slot in slots for col in ["name","points_avg","price"]] \
++ ['points_avg','price','name','superstars','independent']
+# INCORPORATE DIFFERENT CONTEST TYPES!!!
+core_qb_exceptions = ["J. Herbert","P. Mahomes","J. Allen","J. Hurts","L. Jackson"]
+"""Core QBs that can't be played in Rare contests."""
+
 class Collection:
     def __init__(self, date: str = None, rarity: str = None):
         if date is None:
@@ -81,10 +95,10 @@ class Collection:
         self.cards['my_card'] = True
         if str(rarity).title() == "Rare":
             self.cards.loc[self.cards.Rarity.isin(["Core"]) & self.cards.Position.isin(["QB"]) \
-            & ~self.cards.name.isin(["J. Herbert","P. Mahomes","J. Allen","J. Hurts","L. Jackson"]),"Rarity"] = "Rare"
+            & ~self.cards.name.isin(core_qb_exceptions),"Rarity"] = "Rare"
         if str(rarity).title() in ["Core","Rare","Elite","Legendary","Reignmaker"]:
             self.cards = self.cards.loc[self.cards.Rarity == rarity.title()].reset_index(drop=True)
-        self.players = pd.merge(left=self.players,right=self.cards[['name','Position','my_card','listable','Set']]\
+        self.players = pd.merge(left=self.players,right=self.cards[['name','Position','my_card','listable','Set','Rarity']]\
         .rename(columns={'Position':'pos'}),how='left',on=['name','pos'])
         self.players.listable = self.players.listable.fillna(False)
         self.players.my_card = self.players.my_card.fillna(False)
@@ -161,69 +175,143 @@ class Collection:
         print(self.players.loc[self.players.my_card & self.players.listable].sort_values(by="price_delta").to_string(index=False))
     
     def best_lineups(self, stacks={}, superstars=[], independent=[], limit=1000):
-        self.players['dummy'] = 1
         if 'taken' not in self.players.columns:
             self.players["taken"] = False
-        # INCORPORATE DIFFERENT CONTEST TYPES!!!
-        positions = {"QB":1,"WR":2,"RB":2,"TE":1,"K":1,'DEF':1}
-        # INCORPORATE DIFFERENT CONTEST TYPES!!!
-        lineups = pd.DataFrame({'dummy':[1]})
         uninjured = self.players.until.isnull() | (self.players.until < self.league.current_week)
-        for pos in positions:
-            for ind in range(positions[pos]):
-                lineups = pd.merge(left=lineups,right=self.players.loc[self.players.pos.isin([pos]) \
-                & self.players.my_card & ~self.players.taken & uninjured,['name','points_avg','price','dummy']]\
-                .rename(columns={col:"{}_{}{}".format(col,pos,ind + 1) for col in ["name","points_avg","price"]}),how='inner',on='dummy')
-                lineups['points_avg'] = lineups[[col for col in lineups.columns if col.startswith('points_avg_')]].sum(axis=1)
-                lineups['price'] = lineups[[col for col in lineups.columns if col.startswith('price_')]].sum(axis=1)
-                name_cols = [col for col in lineups.columns if col.startswith('name_')]
-                lineups['name'] = lineups[name_cols].apply(sorted,axis=1).apply(", ".join)
-                lineups = lineups.drop_duplicates(subset=["name"],ignore_index=True)
-                lineups = lineups.loc[lineups[name_cols].nunique(axis=1) == len(name_cols)].reset_index(drop=True)
-                # ACCOUNT FOR STACKS A BIT MORE GENERICALLY!!!
-                # ACCOUNT FOR STACKS A BIT MORE GENERICALLY!!!
-                # ACCOUNT FOR STACKS A BIT MORE GENERICALLY!!!
-            if pos in stacks:
-                for qb in stacks[pos]:
-                    if not lineups['name'].str.contains(qb).any():
-                        continue
-                    for stack in stacks[pos][qb]:
-                        lineups = lineups.loc[~lineups['name'].str.contains(qb) | lineups['name'].str.contains(stack)]
-                        lineups = lineups.loc[lineups['name'].str.contains(qb) | ~lineups['name'].str.contains(stack)]
-            
-            lineups['superstars'] = lineups['name'].apply(lambda x: len([val for val in x.split(', ') if val in superstars]))
-            lineups = lineups.loc[lineups.superstars <= 1].reset_index(drop=True)
-            lineups['independent'] = lineups['name'].apply(lambda x: len([val for val in x.split(', ') if val in independent]))
-            lineups = lineups.loc[lineups.independent <= 1].reset_index(drop=True)
-            lineups = lineups.sort_values(by='points_avg',ascending=False,ignore_index=True)
-            # lineups = lineups.sort_values(by='price',ascending=False,ignore_index=True)
-            lineups = lineups.groupby('name_QB1').head(limit).reset_index(drop=True) # Switch this to CPT for showdowns...
-        lineups = pd.merge(left=lineups,right=self.players.loc[~self.players.pos.isin(['QB']) \
-        & self.players.my_card & ~self.players.taken & uninjured,['name','points_avg','price','dummy']]\
-        .rename(columns={col:"{}_FLEX1".format(col) for col in ["name","points_avg","price"]}),how='inner',on='dummy')
-        lineups['points_avg'] = lineups[[col for col in lineups.columns if col.startswith('points_avg_')]].sum(axis=1)
-        lineups['price'] = lineups[[col for col in lineups.columns if col.startswith('price_')]].sum(axis=1)
-        name_cols = [col for col in lineups.columns if col.startswith('name_')]
-        lineups['name'] = lineups[name_cols].apply(sorted,axis=1).apply(", ".join)
-        lineups = lineups.drop_duplicates(subset=["name"],ignore_index=True)
-        lineups = lineups.loc[lineups[name_cols].nunique(axis=1) == len(name_cols)].reset_index(drop=True)
-        for pos in stacks:
-            for qb in stacks[pos]:
-                if not lineups['name'].str.contains(qb).any():
-                    continue
-                for stack in stacks[pos][qb]:
-                    lineups = lineups.loc[~lineups['name'].str.contains(qb) | lineups['name'].str.contains(stack)]
-                    lineups = lineups.loc[lineups['name'].str.contains(qb) | ~lineups['name'].str.contains(stack)]
-        lineups['superstars'] = lineups['name'].apply(lambda x: len([val for val in x.split(', ') if val in superstars]))
-        lineups = lineups.loc[lineups.superstars <= 1].reset_index(drop=True)
-        lineups['independent'] = lineups['name'].apply(lambda x: len([val for val in x.split(', ') if val in independent]))
-        lineups = lineups.loc[lineups.independent <= 1].reset_index(drop=True)
+        # One entry per player we can still play, extra cards of the same player are interchangeable
+        pool = self.players.loc[self.players.pos.isin(list(positions)) & self.players.my_card & ~self.players.taken \
+        & uninjured,['name','pos','points_avg','price']].drop_duplicates(subset=['name'],ignore_index=True)
+        pool['points_avg'] = pool.points_avg.astype(float).fillna(0.0)
+
+        # Lineup state = non-QB position counts (one extra anywhere for the FLEX), superstars used, independent players used
+        need = np.array([positions[pos] for pos in flex])
+        caps = np.append(need + 1, [1, 1])
+        counts = np.indices(caps + 1).reshape(caps.shape[0], -1).T
+        strides = np.array([int(np.prod(caps[ind + 1:] + 1)) for ind in range(caps.shape[0])])
+        feasible = (counts[:, :len(flex)] >= need).all(axis=1) & (counts[:, :len(flex)].sum(axis=1) == need.sum() + 1)
+
+        ties = stack_ties(stacks, pool.loc[pool.pos == 'QB','name'].values)
+        others = pool.loc[pool.pos != 'QB'].reset_index(drop=True)
+        lineups = []
+        for qb, qb_points, qb_price in pool.loc[pool.pos == 'QB',['name','points_avg','price']].values:
+            mates = ties.get(qb, set())
+            tied_elsewhere = set().union(*[ties[other] for other in ties if other != qb])
+            if not mates.issubset(others.name.values) or len(mates & tied_elsewhere) > 0:
+                continue
+            players = others.loc[~others.name.isin(tied_elsewhere)].sort_values(by='points_avg',ascending=False,ignore_index=True)
+            moves = np.zeros((players.shape[0], caps.shape[0]), dtype=int)
+            moves[np.arange(players.shape[0]), players.pos.map({pos:ind for ind, pos in enumerate(flex)}).values] = 1
+            moves[:, -2] = players.name.isin(superstars)
+            moves[:, -1] = players.name.isin(independent)
+            start = int(qb in superstars)*strides[-2] + int(qb in independent)*strides[-1]
+            members_info = players[['name','pos','points_avg','price']].values.tolist()
+            points = players.points_avg.to_numpy(dtype=float)
+            steps = moves @ strides
+            room = (counts[None, :, :] + moves[:, None, :] <= caps).all(axis=2)
+            required = players.name.isin(mates).values
+            last_required = np.where(required)[0].max() if required.any() else -1
+            best = best_finishes(points, steps, room, feasible, required)
+
+            # Following the best path down from each partial lineup, queueing up every deviation along the way,
+            # pops complete lineups in order of points without ever revisiting one (nothing left to decide once the lineup is full)
+            order = itertools.count()
+            queue = [(-best[0, start], next(order), 0, start, 0.0, None)] if best[0, start] > -np.inf else []
+            found = 0
+            while len(queue) > 0 and found < limit:
+                _, _, ind, state, value, chosen = heapq.heappop(queue)
+                while ind < points.shape[0] and not (feasible[state] and ind > last_required):
+                    skip = -np.inf if required[ind] else best[ind + 1, state]
+                    take = points[ind] + best[ind + 1, state + steps[ind]] if room[ind, state] else -np.inf
+                    if take > skip:
+                        if skip > -np.inf:
+                            heapq.heappush(queue, (-(value + skip), next(order), ind + 1, state, value, chosen))
+                        state, value, chosen = state + steps[ind], value + points[ind], (ind, chosen)
+                    elif take > -np.inf:
+                        heapq.heappush(queue, (-(value + take), next(order), ind + 1, state + steps[ind], value + points[ind], (ind, chosen)))
+                    ind += 1
+                members = []
+                while chosen is not None:
+                    members.append(chosen[0])
+                    chosen = chosen[1]
+                found += 1
+                lineups.append(fill_slots([qb, qb_points, qb_price], [members_info[ind] for ind in members], superstars, independent))
+        if len(lineups) == 0:
+            raise ValueError("No legal lineups left with the remaining cards...")
+        lineups = pd.DataFrame(lineups, columns=lineup_columns)
         lineups = lineups.sort_values(by='points_avg',ascending=False,ignore_index=True)
-        # lineups = lineups.sort_values(by='price',ascending=False,ignore_index=True)
-        lineups = lineups.groupby('name_QB1').head(limit).reset_index(drop=True)
-        lineups['name'] = lineups[name_cols].apply(", ".join,axis=1)
         self.lineups = lineups.copy()
     
+    def best_portfolio(self, tiers={"Core":1.0}, stacks={}, superstars=[], independent=[]):
+        # Splitting the whole collection across contest tiers at once (tiers = value of a projected point in each tier's contests)
+        # so that no card gets suggested for more than one lineup, as a single MILP
+        if 'taken' not in self.players.columns:
+            self.players["taken"] = False
+        uninjured = self.players.until.isnull() | (self.players.until < self.league.current_week)
+        cards = self.players.loc[self.players.pos.isin(list(positions)) & self.players.my_card & ~self.players.taken \
+        & uninjured].reset_index(drop=True)
+        cards['points_avg'] = cards.points_avg.astype(float).fillna(0.0)
+        playable = {tier:(cards.Rarity == tier) | ((tier == "Rare") & (cards.Rarity == "Core") & (cards.pos == "QB") \
+        & ~cards.name.isin(core_qb_exceptions)) for tier in tiers}
+        # Only QBs playable in a tier tie up their stack mates in that tier
+        ties = {tier:stack_ties(stacks, cards.loc[playable[tier] & (cards.pos == 'QB'),'name'].values) for tier in tiers}
+        names, pos_vals, points = cards.name.values, cards.pos.values, cards.points_avg.values
+
+        # One potential lineup per QB card and tier (telling lineups apart by their QB keeps the MILP free of symmetric copies),
+        # a variable for whether it gets entered plus one for each other card that could join it
+        value, constraints, lineups = [], [], []
+        uses = [[] for ind in range(cards.shape[0])]
+        for tier in tiers:
+            for qb_ind in np.where(playable[tier] & (cards.pos == 'QB'))[0]:
+                qb = names[qb_ind]
+                tied_elsewhere = set().union(*[ties[tier][other] for other in ties[tier] if other != qb])
+                others = np.where(playable[tier] & (cards.pos != 'QB') & ~cards.name.isin(tied_elsewhere))[0]
+                entered = len(value)
+                members = np.arange(entered + 1, entered + 1 + others.shape[0])
+                value.extend([tiers[tier]*points[qb_ind]] + list(tiers[tier]*points[others]))
+                uses[qb_ind].append(entered)
+                for ind, var in zip(others, members):
+                    uses[ind].append(var)
+                lineups.append((tier, qb_ind, entered, others, members))
+                for pos in flex:
+                    at_pos = members[pos_vals[others] == pos]
+                    constraints.append((list(at_pos) + [entered], [1.0]*at_pos.shape[0] + [-positions[pos]], 0, np.inf))
+                constraints.append((list(members) + [entered], [1.0]*members.shape[0] + [-float(sum(positions[pos] for pos in flex) + 1)], 0, 0))
+                for group in [superstars, independent]:
+                    in_group = members[np.isin(names[others], group)]
+                    constraints.append((list(in_group) + [entered], [1.0]*in_group.shape[0] + [float(qb in group)], -np.inf, 1))
+                for name in pd.unique(names[others]):
+                    copies = members[names[others] == name]
+                    if name in ties[tier].get(qb, set()):
+                        constraints.append((list(copies) + [entered], [1.0]*copies.shape[0] + [-1.0], 0, 0))
+                    elif copies.shape[0] > 1:
+                        constraints.append((list(copies), [1.0]*copies.shape[0], -np.inf, 1))
+                for mate in ties[tier].get(qb, set()) - set(names[others]):
+                    # Stack mate isn't available for this tier, so neither is the QB
+                    constraints.append(([entered], [1.0], 0, 0))
+        for ind in range(cards.shape[0]):
+            if len(uses[ind]) > 1:
+                constraints.append((uses[ind], [1.0]*len(uses[ind]), -np.inf, 1))
+        if len(lineups) == 0:
+            raise ValueError("No legal lineups with the cards in these tiers...")
+
+        rows = np.concatenate([[num]*len(inds) for num, (inds, coeffs, low, high) in enumerate(constraints)])
+        matrix = sparse.csr_array((np.concatenate([coeffs for inds, coeffs, low, high in constraints]), \
+        (rows, np.concatenate([inds for inds, coeffs, low, high in constraints]))), shape=(len(constraints), len(value)))
+        res = milp(-np.array(value), integrality=np.ones(len(value)), bounds=Bounds(0, 1), \
+        constraints=LinearConstraint(matrix, [low for inds, coeffs, low, high in constraints], [high for inds, coeffs, low, high in constraints]))
+        if res.x is None:
+            raise ValueError("Couldn't find a card portfolio: " + res.message)
+
+        portfolio = []
+        for tier, qb_ind, entered, others, members in lineups:
+            if res.x[entered] > 0.5:
+                chosen = others[res.x[members] > 0.5]
+                portfolio.append([tier] + fill_slots(cards.loc[qb_ind,['name','points_avg','price']].tolist(), \
+                cards.loc[chosen,['name','pos','points_avg','price']].values.tolist(), superstars, independent) \
+                + [cards.proj_price[[qb_ind] + list(chosen)].sum(), tiers[tier]*cards.points_avg[[qb_ind] + list(chosen)].sum()])
+        portfolio = pd.DataFrame(portfolio, columns=['tier'] + lineup_columns + ['proj_price','value'])
+        self.portfolio = portfolio.sort_values(by=['value','points_avg'],ascending=False,ignore_index=True)
+    
     def write_to_spreadsheet(self, filename: str = None):
         """
         Writes final results to an excel spreadsheet in three tabs:
@@ -250,8 +338,79 @@ class Collection:
             [col for col in self.lineups.columns if col.startswith("name_")] + \
             [col for col in self.lineups.columns if col.startswith("points_avg_")] + \
             [col for col in self.lineups.columns if col.startswith("price_")]], "Possible Lineups", writer)
+        if hasattr(self,'portfolio'):
+            writer = excel_autofit(self.portfolio[["tier","name","points_avg","price","proj_price","value"] + \
+            [col for col in self.portfolio.columns if col.startswith("name_")] + \
+            [col for col in self.portfolio.columns if col.startswith("points_avg_")] + \
+            [col for col in self.portfolio.columns if col.startswith("price_")]], "Portfolio", writer)
         writer.close()
 
+def stack_ties(stacks: dict, qbs: list) -> dict:
+    """
+    Ties each QB to its stack mates both ways (all or none), but only for QBs we can actually play.
+
+    Args:
+        stacks (dict): stack mates for each QB, grouped by the stack mates' position.
+        qbs (list): names of the QBs we can play.
+
+    Returns:
+        dict: set of stack mates for each playable QB.
+    """
+    ties = {}
+    for pos in stacks:
+        for qb in stacks[pos]:
+            if qb in qbs:
+                ties.setdefault(qb, set()).update(stacks[pos][qb])
+    return ties
+
+def fill_slots(qb: list, members: list, superstars: list, independent: list) -> list:
+    """
+    Fills out the slots of a lineup, best players at each position get the dedicated slots
+    and the one left over goes to the FLEX.
+
+    Args:
+        qb (list): name, average points, and price of the QB.
+        members (list): name, position, average points, and price of everyone else in the lineup.
+        superstars (list): names of superstar players.
+        independent (list): names of independent players.
+
+    Returns:
+        list: row of the lineup in the same order as lineup_columns.
+    """
+    members = sorted(members, key=lambda member: -member[2])
+    filled = [qb]
+    for pos in flex:
+        starting = [member for member in members if member[1] == pos][:positions[pos]]
+        filled.extend([[member[0], member[2], member[3]] for member in starting])
+        members = [member for member in members if member not in starting]
+    filled.append([members[0][0], members[0][2], members[0][3]])
+    return sum(filled, []) + [sum(val[1] for val in filled), sum(val[2] for val in filled), ", ".join(val[0] for val in filled), \
+    sum(val[0] in superstars for val in filled), sum(val[0] in independent for val in filled)]
+
+def best_finishes(points: np.array, steps: np.array, room: np.array, feasible: np.array, required: np.array) -> np.array:
+    """
+    Most points still available from each player onwards given the lineup state so far,
+    working backwards through the players (-inf if there's no way to finish a legal lineup from there).
+
+    Args:
+        points (np.array): average points of each player.
+        steps (np.array): how far each player moves the lineup state when taken.
+        room (np.array): whether each lineup state has room for each player.
+        feasible (np.array): whether each lineup state is a complete legal lineup.
+        required (np.array): whether each player has to be in the lineup.
+
+    Returns:
+        np.array: most points available for each player index and lineup state.
+    """
+    best = np.full((points.shape[0] + 1, feasible.shape[0]), -np.inf)
+    best[-1][feasible] = 0.0
+    for ind in range(points.shape[0] - 1, -1, -1):
+        take = np.full(feasible.shape[0], -np.inf)
+        fits = np.where(room[ind])[0]
+        take[fits] = points[ind] + best[ind + 1][fits + steps[ind]]
+        best[ind] = take if required[ind] else np.maximum(best[ind + 1], take)
+    return best
+
 def excel_autofit(df: pd.DataFrame, name: str, writer: pd.ExcelWriter, hidden: list = []) -> pd.ExcelWriter:
     """
     Writes the provided dataframe to a new tab in an excel spreadsheet 
@@ -314,11 +473,19 @@ def main():
         type="int",
         dest="limit",
         default=1000,
-        help="number of top lineups to keep during each merge for memory purposes",
+        help="number of top lineups to find for each QB",
+    )
+    parser.add_option(
+        "--tiers",
+        action="store",
+        dest="tiers",
+        default=None,
+        help="comma-separated contest tiers and the value of a projected point in each (e.g. Core:1,Rare:4), "
+        "splits the whole collection across them at once instead of building lineups for one rarity",
     )
     options = parser.parse_args()[0]
 
-    dkrm_tf = Collection(options.date, options.rarity)
+    dkrm_tf = Collection(options.date, None if options.tiers else options.rarity)
     dkrm_tf.print_values()
     # stacks = {}
     stacks = {"WR":{"B. Purdy":["D. Samuel"],\
@@ -331,6 +498,13 @@ def main():
     "T. Etienne Jr.","D. Moore","C. Kupp"]
     independent = []
 
+    if options.tiers:
+        tiers = {tier.split(':')[0].title():float(tier.split(':')[1]) for tier in options.tiers.split(',')}
+        dkrm_tf.best_portfolio(tiers, stacks, superstars, independent)
+        dkrm_tf.write_to_spreadsheet()
+        print(dkrm_tf.portfolio[['tier','name','points_avg','price','proj_price']].to_string(index=False))
+        return
+
     # TNF SCORING UPDATES
     # dkrm_tf.players.loc[dkrm_tf.players.name.isin(['D. Adams']),'points_avg'] = 27.1
     # TNF SCORING UPDATES
@@ -348,7 +522,7 @@ def main():
     dkrm_tf.players.loc[taken_inds,'taken'] = True
     while True:
         try:
-            dkrm_tf.best_lineups(stacks, superstars, independent, options.limit)
+            dkrm_tf.best_lineups(stacks, superstars, independent, 1) # Only need the very best from here on out
         except:
             break
         best = pd.concat([best,dkrm_tf.lineups.iloc[:1][['name','points_avg','price']]],ignore_index=True)
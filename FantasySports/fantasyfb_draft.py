@@ -12,10 +12,13 @@
 import pandas as pd
 import optparse
 import fantasyfb as fb
+import resources
+import crosswalk
 import numpy as np
-from difflib import SequenceMatcher
 import sys
 import os
+import copy
+import threading
 
 def check_pick_value(league, pick):
     pick = str(pick)
@@ -62,22 +65,185 @@ def provide_pick_order(league, customize=False, already=[], sfb=False, superflex
     return league
 
 def check_pick_name(league, pick_name, exceptions=[]):
-    not_picked = league.players.fantasy_team.isnull()
-    available = league.players.loc[not_picked].copy()
-    taken = league.players.loc[~not_picked].copy()
-
-    if pick_name in available.name.tolist() or pick_name.lower() in exceptions:
+    league.name_index = crosswalk.NameIndex.refresh(getattr(league,'name_index',None),league.players.name)
+    not_picked = league.players.fantasy_team.isnull().values
+    matches = league.name_index.exact(pick_name)
+    if not_picked[matches].any() or pick_name.lower() in exceptions:
         return pick_name
     else:
-        if pick_name in taken.name.tolist():
-            team = taken.loc[taken.name == pick_name,'fantasy_team'].values[0]
+        if len(matches) > 0:
+            team = league.players.fantasy_team.values[matches[0]]
             print("Player has already been taken by {}.".format(team))
         else:
-            available['similarity'] = available.name.apply(lambda x: SequenceMatcher(None, x, pick_name).ratio())
+            closest = league.name_index.closest(pick_name,3,not_picked)
             print("Can't find the player you provided. Closest options:")
-            print(available.sort_values(by="similarity",ascending=False).iloc[:3][['name','position','current_team']].to_string(index=False))
+            print(league.players.iloc[closest][['name','position','current_team']].to_string(index=False))
         return None
 
+def draft_order(num_teams, tot_picks, sfb=False):
+    order = []
+    for pick_num in range(tot_picks):
+        round_num = pick_num//num_teams + 1
+        rel_pick = pick_num%num_teams
+        if sfb and ((round_num > 2 and round_num%2 == 1) or round_num == 2): # 3rd round reversal
+            rel_pick = num_teams - rel_pick - 1
+        elif round_num%2 == 0 and not sfb:
+            rel_pick = num_teams - rel_pick - 1
+        order.append(rel_pick)
+    return order
+
+def roster_caps(league, positions):
+    # Most players a team would reasonably roster at each position (starters, eligible flex spots, half the bench),
+    # keeping the mock drafters from hoarding a position just because it's next up in ADP
+    flex = {'Q':'QB','R':'RB','W':'WR','T':'TE'}
+    bench = league.roster_spots.loc[league.roster_spots.position == 'BN','count'].sum()
+    caps = []
+    for pos in positions:
+        starters = league.roster_spots.loc[league.roster_spots.position == pos,'count'].sum()
+        flexes = league.roster_spots.loc[league.roster_spots.position.str.contains('/') & \
+        league.roster_spots.position.apply(lambda spot: pos in [flex.get(val) for val in spot.split('/')]),'count'].sum()
+        caps.append(starters + flexes + (bench//2 if pos not in ['K','DEF'] and starters + flexes > 0 else 0))
+    return np.array(caps)
+
+def mock_drafts(league, order, pick_num, team_name="My Team", num_drafts=5000, num_upcoming=3, spread=0.1, seed=None):
+    # Simulates the rest of the draft thousands of times at once, with every other team taking whoever
+    # falls earliest in a noisy version of ADP (stdev of 1 + spread*ADP) that still fits their roster,
+    # returning the probability each available player is still around at each of our upcoming picks
+    teams = [team['name'] for team in league.teams]
+    upcoming = [pick for pick in range(pick_num, len(order)) if teams[order[pick]] == team_name][:num_upcoming]
+    available = league.players.loc[league.players.fantasy_team.isnull() & \
+    ~league.players.player_id_sr.astype(str).str.startswith('avg_')].reset_index(drop=True)
+    if len(upcoming) == 0 or available.shape[0] == 0:
+        return None
+    positions = available.position.unique().tolist()
+    pos_codes = available.position.map({pos:ind for ind, pos in enumerate(positions)}).values
+    caps = roster_caps(league, positions)
+    drafted = league.players.loc[league.players.fantasy_team.isin(teams)]
+    counts = np.zeros((num_drafts, len(teams), len(positions)), dtype=int)
+    for (team, pos), num_players in drafted.loc[drafted.position.isin(positions)].groupby(['fantasy_team','position']).size().items():
+        counts[:, teams.index(team), positions.index(pos)] = num_players
+
+    # Players without an ADP go after everyone who has one
+    adp = available.avg_pick.astype(float).fillna(len(order) + available.shape[0]).values
+    rng = np.random.default_rng(seed)
+    noisy = adp + rng.normal(size=(num_drafts, adp.shape[0]))*(1 + spread*adp)
+    drafts = np.arange(num_drafts)
+    probs = np.zeros((len(upcoming), adp.shape[0]))
+    for pick in range(pick_num, upcoming[-1] + 1):
+        if pick in upcoming:
+            # Not removing anyone at our own picks, availability is conditional on us passing on them
+            probs[upcoming.index(pick)] = np.isfinite(noisy).mean(axis=0)
+            continue
+        team = order[pick]
+        full = (counts[:, team, :] >= caps)[:, pos_codes]
+        capped = np.where(full, np.inf, noisy)
+        choice = capped.argmin(axis=1)
+        # Falling back on pure ADP for drafts where every remaining position is already filled
+        stuck = ~np.isfinite(capped[drafts, choice])
+        choice[stuck] = noisy[stuck].argmin(axis=1)
+        noisy[drafts, choice] = np.inf
+        counts[drafts, team, pos_codes[choice]] += 1
+    mock = available[['name','position','current_team','avg_pick']].copy()
+    for ind, pick in enumerate(upcoming):
+        mock['pick_{}'.format(pick + 1)] = probs[ind].round(3)
+    return mock.sort_values(by='avg_pick').reset_index(drop=True)
+
+class DraftProjections:
+    # Keeps every team's weekly projections between picks, re-projecting only the rosters that changed
+    # (usually just the team that picked), with full rebuilds saved for going back or simulating the season
+    def __init__(self):
+        self.frames = {}
+        self.rosters = {}
+
+    @staticmethod
+    def signatures(league):
+        rostered = league.players.loc[~league.players.fantasy_team.isnull()]
+        return rostered.groupby('fantasy_team').player_id_sr.apply(lambda ids: tuple(sorted(ids.astype(str)))).to_dict()
+
+    def rebuild(self, league):
+        self.frames = {}
+        self.rosters = self.signatures(league)
+
+    def projections(self, league, bestball=False):
+        rosters = self.signatures(league)
+        changed = [team for team in set(rosters) | set(self.rosters) if rosters.get(team) != self.rosters.get(team)]
+        if len(changed) > 0:
+            for mode in self.frames:
+                frame = self.frames[mode]
+                update = league.weekly_projections([team for team in changed if team in rosters], mode)
+                self.frames[mode] = pd.concat([frame.loc[~frame.fantasy_team.isin(changed)],update],ignore_index=True,sort=False)
+            self.rosters = rosters
+        if bestball not in self.frames:
+            self.frames[bestball] = league.weekly_projections(bestball=bestball)
+        return self.frames[bestball]
+
+def run_command(league, command, pick_num, num_teams, exclude=[], payouts=[800, 300, 100], bestball=False, stop=None, projections=None):
+    orig_sims = league.num_sims
+    if command in ["bestball","nearestbestball"]:
+        league.num_sims = 1000
+        bestball = True
+    if command == "best":
+        focus_on = [command]
+    elif command == "bestball":
+        focus_on = league.players.loc[~league.players.position.isin(['K','DEF']),'name'].tolist()
+    else:
+        nearby = league.players.avg_pick <= pick_num + 2*num_teams
+        if command == "nearestbestball":
+            nearby = nearby & ~league.players.position.isin(['K','DEF'])
+        focus_on = league.players.loc[nearby,'name'].tolist()
+    results = league.possible_adds(focus_on,exclude,limit_per=5,team_name="My Team",\
+    verbose=False,payouts=payouts,bestball=bestball,stop=stop,projections=projections)
+    league.num_sims = orig_sims
+    return results
+
+class Speculator:
+    # Evaluates the most likely commands in the background while waiting on the next pick,
+    # caching results by roster state so they're ready by the time anyone asks for them.
+    def __init__(self, commands=["best","nearest"]):
+        self.commands = commands
+        self.key = None
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.stop = None
+        self.thread = None
+
+    @staticmethod
+    def roster_key(league, pick_num, exclude):
+        return (pick_num, tuple(league.players.fantasy_team.fillna("").tolist()), tuple(exclude))
+
+    def start(self, league, pick_num, num_teams, exclude, payouts, bestball, projections=None):
+        # A new pick (or exclusion) invalidates everything evaluated so far
+        self.cancel()
+        self.key = self.roster_key(league, pick_num, exclude)
+        with self.lock:
+            self.cache = {}
+        snapshot = copy.copy(league)
+        snapshot.players = league.players.copy()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.evaluate,daemon=True,\
+        args=(snapshot,self.key,self.stop,pick_num,num_teams,list(exclude),payouts,bestball,projections))
+        self.thread.start()
+
+    def evaluate(self, snapshot, key, stop, pick_num, num_teams, exclude, payouts, bestball, projections):
+        for command in self.commands:
+            results = run_command(snapshot,command,pick_num,num_teams,exclude,payouts,bestball,stop,projections)
+            if stop.is_set():
+                return
+            with self.lock:
+                self.cache[(key, command)] = results
+
+    def cancel(self):
+        if self.stop is not None:
+            self.stop.set()
+
+    def result(self, command, key):
+        # Waiting on the background evaluation if it's already working on this roster state
+        if key == self.key and command in self.commands:
+            while (key, command) not in self.cache and self.thread.is_alive():
+                self.thread.join(0.1)
+        with self.lock:
+            return self.cache.get((key, command))
+
 def main():
     parser = optparse.OptionParser()
     parser.add_option(
@@ -126,6 +292,20 @@ def main():
         default="",
         help="which platform to use if implementing best ball settings/scoring",
     )
+    parser.add_option(
+        "--nospeculate",
+        action="store_true",
+        dest="nospeculate",
+        help="whether to skip evaluating likely commands in the background between picks",
+    )
+    parser.add_option(
+        "--mocks",
+        action="store",
+        type="int",
+        dest="mocks",
+        default=5000,
+        help="number of mock drafts to simulate when checking who will still be available at upcoming picks",
+    )
     options, args = parser.parse_args()
     league = fb.League(options.teamname,num_sims=10000,sfb=options.sfb,bestball=options.bestball)
     options.bestball = str(options.bestball).lower() in ["dk","draftkings","underdog"]
@@ -184,18 +364,17 @@ def main():
         adp = pd.read_csv("FantasyPros_2024_Overall_ADP_Rankings_Redraft.csv")
         adp = adp.rename(columns={'Player':'name','AVG':'avg_pick','POS':'position'})
         adp.position = adp.position.str[:2]
-    corrections = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/name_corrections.csv")
-    adp = pd.merge(left=adp, right=corrections, how="left", on="name")
-    to_fix = ~adp.new_name.isnull()
-    adp.loc[to_fix, "name"] = adp.loc[to_fix, "new_name"]
-    del adp['new_name']
-    missing = ~adp.name.isin(league.players.name.tolist()) & ~adp.position.isin(['DS']) & ~adp.name.isnull()
+    corrections = resources.read_csv("football/name_corrections.csv")
+    adp['name'] = adp.name.replace(corrections.set_index('name').new_name.to_dict())
+    adp['xwalk_id'] = league.xwalk.resolve(adp.rename(columns={'Team':'team'}),league.players.xwalk_id.dropna())
+    missing = adp.xwalk_id.isnull() & ~adp.position.isin(['DS']) & ~adp.name.isnull()
     if missing.any():
         print("Name mismatches in ADP:")
         print(adp.loc[missing,['name','position','Team']].to_string(index=False))
     adp['avg_round'] = round(1.0 + adp.avg_pick/num_teams,1)
     adp['avg_pick'] = round(adp.avg_pick,1)
-    league.players = pd.merge(left=league.players,right=adp[['name','position','avg_pick','avg_round']],how='left',on=['name','position'])
+    adp = adp.dropna(subset=['xwalk_id']).drop_duplicates(subset=['xwalk_id'])
+    league.players = pd.merge(left=league.players,right=adp[['xwalk_id','avg_pick','avg_round']],how='left',on='xwalk_id')
     league.players['fantasy_team'] = None
     display_cols = ['player_to_add','position','current_team','WAR','wins_avg','points_avg','playoffs','winner','earnings','avg_pick','avg_round']
 
@@ -223,23 +402,27 @@ def main():
         pick_num = 0
         progress = pd.DataFrame()
 
+    speculator = None if options.nospeculate else Speculator()
+    draft_state = DraftProjections()
+    order = draft_order(num_teams, tot_picks, options.sfb)
     while pick_num < tot_picks:
         round_num = pick_num//num_teams + 1
-        rel_pick = pick_num%num_teams
-        if options.sfb and ((round_num > 2 and round_num%2 == 1) or round_num == 2): # 3rd round reversal
-            rel_pick = num_teams - rel_pick - 1
-        elif round_num%2 == 0 and not options.sfb:
-            rel_pick = num_teams - rel_pick - 1
+        rel_pick = order[pick_num]
         
         if round_num > 10 and (options.bestball or options.sfb):
             # Initially keeping average replacements for more realistic simulations,
             # but there's no waiver wire in bestball, eliminating averages half way through
             league.players = league.players.loc[~league.players.player_id_sr.astype(str).str.startswith('avg_')].reset_index(drop=True)
 
+        roster_key = Speculator.roster_key(league, pick_num, exclude)
+        if speculator is not None and speculator.key != roster_key:
+            speculator.start(league, pick_num, num_teams, exclude, options.payouts, options.bestball,\
+            draft_state.projections(league, options.bestball))
+
         pick_deets = 'Round #{}, Pick #{}, {}: '.format(round_num,pick_num + 1,league.teams[rel_pick]['name'])
-        pick_name = check_pick_name(league,input(pick_deets),["best","nearest","bestball","nearestbestball","next","lookup","exclude","go back","sim","roster"])
+        pick_name = check_pick_name(league,input(pick_deets),["best","nearest","bestball","nearestbestball","next","lookup","exclude","go back","sim","roster","mock"])
         while pick_name is None:
-            pick_name = check_pick_name(league,input(pick_deets),["best","nearest","bestball","nearestbestball","next","lookup","exclude","go back","sim","roster"])
+            pick_name = check_pick_name(league,input(pick_deets),["best","nearest","bestball","nearestbestball","next","lookup","exclude","go back","sim","roster","mock"])
         
         if pick_name in league.players.name.tolist():
             # What about players with the same name??? Not worrying about it for now...
@@ -247,57 +430,28 @@ def main():
             progress = pd.concat([progress,league.players.loc[league.players.name == pick_name]],ignore_index=True,sort=False)
             progress.to_csv(options.output,index=False)
             pick_num += 1
-        elif pick_name.lower() == "best":
-            best = league.possible_adds([pick_name],exclude,limit_per=5,team_name="My Team",\
-            verbose=False,payouts=options.payouts,bestball=options.bestball)
+        elif pick_name.lower() in ["best","nearest","bestball","nearestbestball"]:
+            command = pick_name.lower()
+            best = speculator.result(command, roster_key) if speculator is not None else None
+            if best is None:
+                projections = draft_state.projections(league, options.bestball or command in ["bestball","nearestbestball"])
+                best = run_command(league,command,pick_num,num_teams,exclude,options.payouts,options.bestball,projections=projections)
             best = pd.merge(left=best,right=adp[['name','position','avg_pick','avg_round']]\
             .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
             best = pd.merge(left=best,right=league.players[['name','position','WAR']]\
             .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            print("Best players according to the Algorithm:")
-            print(best[display_cols].to_string(index=False))
-        elif pick_name.lower() == "nearest":
-            nearby = league.players.loc[league.players.avg_pick <= pick_num + 2*num_teams,'name'].tolist()
-            nearest = league.possible_adds(nearby,exclude,limit_per=5,team_name="My Team",\
-            verbose=False,payouts=options.payouts,bestball=options.bestball)
-            nearest = pd.merge(left=nearest,right=adp[['name','position','avg_pick','avg_round']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            nearest = pd.merge(left=nearest,right=league.players[['name','position','WAR']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            print("Best players in terms of ADP:")
-            print(nearest[display_cols].to_string(index=False))
-        elif pick_name.lower() == "bestball":
-            league.num_sims = 1000
-            besties = league.players.loc[~league.players.position.isin(['K','DEF']),'name'].tolist()
-            best = league.possible_adds(besties,exclude,limit_per=5,team_name="My Team",\
-            verbose=False,payouts=options.payouts,bestball=True)
-            best = pd.merge(left=best,right=adp[['name','position','avg_pick','avg_round']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            best = pd.merge(left=best,right=league.players[['name','position','WAR']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            print("Best players according to the Algorithm:")
+            if command.startswith("nearest"):
+                print("Best players in terms of ADP:")
+            else:
+                print("Best players according to the Algorithm:")
             print(best[display_cols].to_string(index=False))
-            league.num_sims = 10000
-        elif pick_name.lower() == "nearestbestball":
-            league.num_sims = 1000
-            nearby = league.players.loc[(league.players.avg_pick <= pick_num + 2*num_teams) \
-            & ~league.players.position.isin(['K','DEF']),'name'].tolist()
-            nearest = league.possible_adds(nearby,exclude,limit_per=5,team_name="My Team",\
-            verbose=False,payouts=options.payouts,bestball=True)
-            nearest = pd.merge(left=nearest,right=adp[['name','position','avg_pick','avg_round']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            nearest = pd.merge(left=nearest,right=league.players[['name','position','WAR']]\
-            .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
-            print("Best players in terms of ADP:")
-            print(nearest[display_cols].to_string(index=False))
-            league.num_sims = 10000
         elif pick_name.lower() == "lookup":
             focus = check_pick_name(league,input("Which player would you like to check? "),["nevermind"])
             while focus is None:
                 focus = check_pick_name(league,input("Which player would you like to check? "),["nevermind"])
             if focus != "nevermind":
-                lookup = league.possible_adds([focus],exclude,team_name="My Team",\
-                verbose=False,payouts=options.payouts,bestball=options.bestball)
+                lookup = league.possible_adds([focus],exclude,team_name="My Team",verbose=False,payouts=options.payouts,\
+                bestball=options.bestball,projections=draft_state.projections(league, options.bestball))
                 lookup = pd.merge(left=lookup,right=adp[['name','position','avg_pick','avg_round']]\
                 .rename(columns={'name':'player_to_add'}),how='left',on=['player_to_add','position'])
                 lookup = pd.merge(left=lookup,right=league.players[['name','position','WAR']]\
@@ -315,12 +469,22 @@ def main():
             progress = progress.iloc[:-1].reset_index(drop=True)
             progress.to_csv(options.output,index=False)
             pick_num -= 1
+            draft_state.rebuild(league)
         elif pick_name.lower() == "sim":
+            draft_state.rebuild(league)
+            projections = draft_state.projections(league, options.bestball)
             if options.bestball:
-                standings_sim = league.bestball_sims(payouts=options.payouts)
+                standings_sim = league.bestball_sims(payouts=options.payouts,projections=projections)
             else:
-                standings_sim = league.season_sims(payouts=options.payouts)[1]
+                standings_sim = league.season_sims(payouts=options.payouts,projections=projections)[1]
             print(standings_sim[['team','points_avg','wins_avg','playoffs','winner','earnings']].to_string(index=False))
+        elif pick_name.lower() == "mock":
+            mock = mock_drafts(league, order, pick_num, num_drafts=options.mocks)
+            if mock is None:
+                print("No upcoming picks left to mock...")
+            else:
+                print("Chances of each player still being available at your upcoming picks:")
+                print(mock.iloc[:3*num_teams].to_string(index=False))
         elif pick_name.lower() == "roster":
             print(league.players.loc[league.players.fantasy_team == "My Team",\
             ['name','position','current_team','points_avg','points_stdev','WAR']].to_string(index=False))
@@ -12,67 +12,243 @@
 import os
 import pandas as pd
 import numpy as np
+import itertools
+import heapq
+import math
 import optparse
 import fantasyfb as fb
-from difflib import SequenceMatcher
+import resources
+import crosswalk
 
-def best_combos(positions, budget, league, limit=500, fixed="", exclude=[]):
-    teams = pd.DataFrame({'dummy':[1]})
-    tot = 0
-    for pos in positions: # Sorting by relevancy...
-        for num in range(positions[pos]):
-            # print(pos + str(num + 1))
-            if pos == "W/T":
-                teams = pd.merge(left=teams,right=league.players.loc[league.players.position.isin(["WR","TE"]) & league.players.fantasy_team.isnull(),\
-                ['dummy','name','WAR','avg_salary']].rename(columns={'name':'Name_' + pos + str(num + 1),\
-                'WAR':'WAR_' + pos + str(num + 1),'avg_salary':'Salary_' + pos + str(num + 1)}),how='inner',on='dummy')
-            elif pos == "W/R/T":
-                teams = pd.merge(left=teams,right=league.players.loc[league.players.position.isin(["WR","RB","TE"]) & league.players.fantasy_team.isnull(),\
-                ['dummy','name','WAR','avg_salary']].rename(columns={'name':'Name_' + pos + str(num + 1),\
-                'WAR':'WAR_' + pos + str(num + 1),'avg_salary':'Salary_' + pos + str(num + 1)}),how='inner',on='dummy')
-            elif pos == "Q/W/R/T":
-                teams = pd.merge(left=teams,right=league.players.loc[league.players.position.isin(["WR","RB","TE","QB"]) & league.players.fantasy_team.isnull(),\
-                ['dummy','name','WAR','avg_salary']].rename(columns={'name':'Name_' + pos + str(num + 1),\
-                'WAR':'WAR_' + pos + str(num + 1),'avg_salary':'Salary_' + pos + str(num + 1)}),how='inner',on='dummy')
+flex_pos = {"W/T":['WR','TE'],"W/R/T":['WR','RB','TE'],"Q/W/R/T":['WR','RB','TE','QB']}
+
+def slot_eligibility(player_positions, slots):
+    return {slot:[pos for pos in player_positions if (pos in flex_pos[slot] if slot in flex_pos else pos in slot)] for slot in slots}
+
+def legal_counts(counts, base, eligible, positions):
+    # Which combinations of position counts fill every slot, i.e. every group of slots has enough eligible players (Hall's theorem)
+    slots = list(eligible)
+    feasible = counts.sum(axis=1) == sum(positions[slot] for slot in slots)
+    for combo in range(1, 2**len(slots)):
+        group = [slot for ind, slot in enumerate(slots) if combo & (1 << ind)]
+        covered = [ind for ind, pos in enumerate(base) if any(pos in eligible[slot] for slot in group)]
+        feasible &= counts[:, covered].sum(axis=1) >= sum(positions[slot] for slot in group)
+    return feasible
+
+def salary_units(salaries):
+    # Smallest power of ten (down to cents) that turns every salary into a whole number of units
+    for scale in [1, 10]:
+        if np.allclose(salaries*scale, np.round(salaries*scale)):
+            return scale
+    return 100
+
+def best_finishes(war, cost, pos_ind, counts, strides, most, feasible, cap, required):
+    # best[ind, state, spent] = most WAR still available from players ind onwards given the position counts (state)
+    # and whole dollars spent so far (salaries rounded down), -inf if there's no way to finish a legal lineup under the cap from there.
+    # Rounding down means it never underestimates, so it's an upper bound on what's left when using actual salaries.
+    best = np.full((war.shape[0] + 1, counts.shape[0], cap + 1), -np.inf)
+    best[-1][feasible] = 0.0
+    for ind in range(war.shape[0] - 1, -1, -1):
+        take = np.full(best.shape[1:], -np.inf)
+        room = np.where(counts[:, pos_ind[ind]] < most[pos_ind[ind]])[0]
+        if cost[ind] <= cap:
+            take[room, :cap + 1 - cost[ind]] = war[ind] + best[ind + 1][room + strides[pos_ind[ind]], cost[ind]:]
+        best[ind] = take if required[ind] else np.maximum(best[ind + 1], take)
+    return best
+
+def walk_lineups(war, salary, pos_ind, counts, strides, most, best, required, budget, limit):
+    # Following the best path down from each partial lineup, queueing up every deviation along the way,
+    # pops complete lineups in order of total WAR without ever revisiting one. The DP above is only an upper bound
+    # since it rounds salaries down, so actual salaries are tracked along the way and a path is set aside
+    # whenever another partial lineup in the queue looks better.
+    cap = best.shape[2] - 1
+    def remaining(ind, state, spent):
+        return best[ind, state, cap - math.floor(budget - spent + 1e-9)]
+    room = (counts[:, pos_ind] < most[pos_ind]).tolist()
+    war, salary, required, step_of = war.tolist(), salary.tolist(), required.tolist(), strides[pos_ind].tolist()
+    lineups = []
+    order = itertools.count()
+    queue = [(-best[0, 0, 0], next(order), 0, 0, 0.0, 0.0, None)] if best[0, 0, 0] > -np.inf else []
+    while len(queue) > 0 and len(lineups) < limit:
+        _, _, ind, state, spent, value, chosen = heapq.heappop(queue)
+        while ind < len(war):
+            skip = -np.inf if required[ind] else value + remaining(ind + 1, state, spent)
+            take = -np.inf
+            if room[state][ind] and spent + salary[ind] <= budget + 1e-9:
+                take = value + war[ind] + remaining(ind + 1, state + step_of[ind], spent + salary[ind])
+            if take == skip == -np.inf:
+                break
+            if take > skip:
+                if skip > -np.inf:
+                    heapq.heappush(queue, (-skip, next(order), ind + 1, state, spent, value, chosen))
+                step = (take, ind + 1, state + step_of[ind], spent + salary[ind], value + war[ind], (ind, chosen))
             else:
-                teams = pd.merge(left=teams,right=league.players.loc[league.players.position.apply(lambda x: x in pos) & league.players.fantasy_team.isnull(),\
-                ['dummy','name','WAR','avg_salary']].rename(columns={'name':'Name_' + pos + str(num + 1),\
-                'WAR':'WAR_' + pos + str(num + 1),'avg_salary':'Salary_' + pos + str(num + 1)}),how='inner',on='dummy')
-            teams['Total_Names'] = teams[[col for col in teams.columns if col.startswith('Name_')]].apply("_".join,axis=1)
-            # Feels like this could be sped up...
-            teams['Total_Names'] = teams['Total_Names'].str.split('_').apply(lambda x: '_'.join(sorted(np.unique(x))))
-            # Feels like this could be sped up...
-            teams = teams.loc[teams.Total_Names.str.count('_') == tot].drop_duplicates(subset=['Total_Names'])
-            if fixed in league.players.name.tolist() and teams.Total_Names.str.contains(fixed).any():
-                teams = teams.loc[teams.Total_Names.apply(lambda x: fixed in x.split('_'))].reset_index(drop=True)
-            for player in exclude:
-                if player in league.players.name.tolist():
-                    teams = teams.loc[teams.Total_Names.apply(lambda x: player not in x.split('_'))].reset_index(drop=True)
-            teams['Total_Salary'] = teams[[col for col in teams.columns if col.startswith('Salary_')]].sum(axis=1)
-            teams = teams.loc[teams.Total_Salary <= budget]
-            teams['Total_WAR'] = teams[[col for col in teams.columns if col.startswith('WAR_')]].sum(axis=1)
-            teams = teams.sort_values(by='Total_WAR',ascending=False).iloc[:limit]
-            tot += 1
+                if take > -np.inf:
+                    heapq.heappush(queue, (-take, next(order), ind + 1, state + step_of[ind], \
+                    spent + salary[ind], value + war[ind], (ind, chosen)))
+                step = (skip, ind + 1, state, spent, value, chosen)
+            if len(queue) > 0 and step[0] < -queue[0][0]:
+                heapq.heappush(queue, (-step[0], next(order)) + step[1:])
+                break
+            _, ind, state, spent, value, chosen = step
+        if ind < len(war):
+            continue
+        members = []
+        while chosen is not None:
+            members.append(chosen[0])
+            chosen = chosen[1]
+        lineups.append(members)
+    return lineups
+
+def best_combos(positions, budget, league, limit=500, fixed="", exclude=[]):
+    # Exact top lineups by WAR under the budget, enumerated best-first using the DP above
+    slots = [pos for pos in positions if positions[pos] > 0]
+    players = league.players.loc[league.players.fantasy_team.isnull() & ~league.players.name.isin(exclude)]
+    eligible = slot_eligibility(players.position.dropna().unique(), slots)
+    base = sorted(set(sum(eligible.values(), [])))
+    players = players.loc[players.position.isin(base)].reset_index(drop=True)
+    war = players.WAR.astype(float).fillna(0.0).values
+    salary = players.avg_salary.astype(float).fillna(0.0).clip(lower=0).values
+    cost = np.floor(salary).astype(int)
+    pos_ind = players.position.map({pos:ind for ind, pos in enumerate(base)}).values
+
+    # Every combination of position counts that could fill the slots
+    most = np.array([sum(positions[slot] for slot in slots if pos in eligible[slot]) for pos in base])
+    counts = np.indices(most + 1).reshape(len(base), -1).T
+    strides = np.array([int(np.prod(most[ind + 1:] + 1)) for ind in range(len(base))])
+    feasible = legal_counts(counts, base, eligible, positions)
+
+    cap = int(np.floor(budget))
+    required = (players.name == fixed).values
+    best = best_finishes(war, cost, pos_ind, counts, strides, most, feasible, cap, required)
+    lineups = walk_lineups(war, salary, pos_ind, counts, strides, most, best, required, budget, limit)
+    if required.any() and len(lineups) == 0:
+        # Player in question can't fit under the budget, ignoring them like before
+        required = np.zeros(players.shape[0], dtype=bool)
+        best = best_finishes(war, cost, pos_ind, counts, strides, most, feasible, cap, required)
+        lineups = walk_lineups(war, salary, pos_ind, counts, strides, most, best, required, budget, limit)
+
+    teams = []
+    names, salaries, positions_of = players.name.values, players.avg_salary.values, players.position.values
+    for members in lineups:
+        # Filling the most restrictive slots first, best players first
+        remaining = sorted(members, key=lambda ind: -war[ind])
+        team = {}
+        for slot in sorted(slots, key=lambda slot: len(eligible[slot])):
+            filled = [ind for ind in remaining if positions_of[ind] in eligible[slot]][:positions[slot]]
+            remaining = [ind for ind in remaining if ind not in filled]
+            for num, ind in enumerate(filled):
+                team['Name_' + slot + str(num + 1)] = names[ind]
+                team['WAR_' + slot + str(num + 1)] = players.WAR.values[ind]
+                team['Salary_' + slot + str(num + 1)] = salaries[ind]
+        team['Total_Names'] = '_'.join(sorted(names[members]))
+        team['Total_Salary'] = salaries[members].sum()
+        team['Total_WAR'] = war[members].sum()
+        teams.append(team)
+    teams = pd.DataFrame(teams, columns=[col + '_' + slot + str(num + 1) for slot in slots for num in range(positions[slot]) \
+    for col in ['Name','WAR','Salary']] + ['Total_Names','Total_Salary','Total_WAR'])
+    teams = teams.sort_values(by='Total_WAR',ascending=False,ignore_index=True)
     # Expanding salaries to fit budget
-    for pos in positions:
-        for num in range(positions[pos]):
-            teams['Salary_' + pos + str(num + 1)] *= budget/teams['Total_Salary']
+    for slot in slots:
+        for num in range(positions[slot]):
+            teams['Salary_' + slot + str(num + 1)] *= budget/teams['Total_Salary']
     return teams
 
+class AuctionValues:
+    # Best WAR from c players of each position for every amount of money (knapsack curves in whole salary units, e.g. dimes), combined across positions
+    # on demand. A sale only means re-running the curve for that player's position, and a nomination only means
+    # combining the curves without the player in question, so max bids come back instantly.
+    def __init__(self, players, positions, budget):
+        self.slots = [pos for pos in positions if positions[pos] > 0]
+        self.base = sorted(set(sum(slot_eligibility(players.position.dropna().unique(), self.slots).values(), [])))
+        self.pool = players.loc[players.position.isin(self.base),['name','position','WAR','avg_salary']].reset_index(drop=True)
+        salaries = self.pool.avg_salary.astype(float).fillna(0.0).clip(lower=0)
+        self.scale = salary_units(salaries.values)
+        self.pool['cost'] = np.round(salaries*self.scale).astype(int)
+        self.pool['WAR'] = self.pool.WAR.astype(float).fillna(0.0)
+        self.cap = int(np.floor(budget*self.scale + 1e-9))
+        eligible = slot_eligibility(self.base, self.slots)
+        self.most = np.array([sum(positions[slot] for slot in self.slots if pos in eligible[slot]) for pos in self.base])
+        self.counts = np.indices(self.most + 1).reshape(len(self.base), -1).T
+        self.strides = np.array([int(np.prod(self.most[ind + 1:] + 1)) for ind in range(len(self.base))])
+        self.curves = {pos:self.position_curve(pos) for pos in self.base}
+        self.combined = None
+
+    def position_curve(self, pos, skip=None):
+        # curve[c, m] = most WAR from c available players at this position costing m units or less
+        most = self.most[self.base.index(pos)]
+        curve = np.full((most + 1, self.cap + 1), -np.inf)
+        curve[0] = 0.0
+        for war, cost in self.pool.loc[(self.pool.position == pos) & (self.pool.name != skip),['WAR','cost']].values:
+            cost = int(cost)
+            if cost <= self.cap:
+                curve[1:, cost:] = np.maximum(curve[1:, cost:], curve[:-1, :self.cap + 1 - cost] + war)
+        return curve
+
+    def combine(self, curves):
+        # combined[state, m] = most WAR from exactly the position counts in state costing m units or less.
+        # Curves only change at a handful of amounts, and spending more for the same WAR never helps, so those are all that's checked.
+        combined = curves[self.base[0]]
+        for pos in self.base[1:]:
+            merged = np.full(combined.shape[:-1] + curves[pos].shape, -np.inf)
+            changes = np.flatnonzero((curves[pos][:, 1:] != curves[pos][:, :-1]).any(axis=0)) + 1
+            for spent in np.concatenate([[0], changes]):
+                merged[..., spent:] = np.maximum(merged[..., spent:], \
+                combined[..., None, :self.cap + 1 - spent] + curves[pos][:, spent, None])
+            combined = merged
+        return combined.reshape(-1, self.cap + 1)
+
+    def sold(self, name):
+        sold = self.pool.name == name
+        if sold.any():
+            pos = self.pool.loc[sold,'position'].values[0]
+            self.pool = self.pool.loc[~sold].reset_index(drop=True)
+            self.curves[pos] = self.position_curve(pos)
+            self.combined = None
+
+    def lineup_war(self, positions, budget):
+        if self.combined is None:
+            self.combined = self.combine(self.curves)
+        feasible = legal_counts(self.counts, self.base, slot_eligibility(self.base, [pos for pos in positions if positions[pos] > 0]), positions)
+        return self.combined[feasible, min(int(np.floor(budget*self.scale + 1e-9)), self.cap)].max(initial=-np.inf)
+
+    def max_bid(self, name, positions, budget):
+        # Most we can pay for the player while still matching the best lineup we could build without them
+        budget = min(int(np.floor(budget*self.scale + 1e-9)), self.cap)
+        player = self.pool.loc[self.pool.name == name]
+        if player.shape[0] == 0:
+            return pd.Series({'max_bid':0,'lineup_war':self.lineup_war(positions, budget),'lineup_war_with':np.nan})
+        pos, war, cost = player[['position','WAR','cost']].values[0]
+        ind = self.base.index(pos)
+        curves = dict(self.curves)
+        curves[pos] = self.position_curve(pos, skip=name)
+        without = self.combine(curves)
+        feasible = legal_counts(self.counts, self.base, slot_eligibility(self.base, [slot for slot in positions if positions[slot] > 0]), positions)
+        lineup_war = without[feasible, budget].max(initial=-np.inf)
+        with_player = feasible & (self.counts[:, ind] > 0)
+        if not with_player.any():
+            return pd.Series({'max_bid':0,'lineup_war':lineup_war,'lineup_war_with':np.nan})
+        rest = war + without[np.where(with_player)[0] - self.strides[ind]].max(axis=0)
+        bids = np.arange(budget//self.scale + 1)
+        # Bids that still leave room for a legal lineup (anything does if there's no legal lineup without them)
+        worth_it = (rest[budget - bids*self.scale] >= lineup_war) & (rest[budget - bids*self.scale] > -np.inf)
+        return pd.Series({'max_bid':bids[worth_it].max() if worth_it.any() else 0,'lineup_war':lineup_war,\
+        'lineup_war_with':rest[budget - int(cost)] if cost <= budget else -np.inf})
+
 def check_pick_name(league, pick_name, exceptions=[]):
-    not_picked = league.players.fantasy_team.isnull()
-    available = league.players.loc[not_picked].copy()
-    taken = league.players.loc[~not_picked].copy()
-    if pick_name in available.name.tolist() or pick_name.lower() in exceptions:
+    league.name_index = crosswalk.NameIndex.refresh(getattr(league,'name_index',None),league.players.name)
+    not_picked = league.players.fantasy_team.isnull().values
+    matches = league.name_index.exact(pick_name)
+    if not_picked[matches].any() or pick_name.lower() in exceptions:
         return pick_name
     else:
-        if pick_name in taken.name.tolist():
-            team = taken.loc[taken.name == pick_name,'fantasy_team'].values[0]
+        if len(matches) > 0:
+            team = league.players.fantasy_team.values[matches[0]]
             print("Player has already been taken by {}.".format(team))
         else:
-            available['similarity'] = available.name.apply(lambda x: SequenceMatcher(None, x, pick_name).ratio())
+            closest = league.name_index.closest(pick_name,3,not_picked)
             print("Can't find the player you provided. Closest options:")
-            print(available.sort_values(by="similarity",ascending=False).iloc[:3][['name','position','current_team']].to_string(index=False))
+            print(league.players.iloc[closest][['name','position','current_team']].to_string(index=False))
         return None
 
 def main():
@@ -102,7 +278,7 @@ def main():
         type="int",
         dest="limit",
         default=500,
-        help="maximum number of top lineups to consider each draft pick",
+        help="number of top lineups to list when asking for the best available players",
     )
     parser.add_option(
         "--keepers",
@@ -136,17 +312,15 @@ def main():
     # adp = pd.read_csv("Yahoo_2023_Overall_SalaryCap_Rankings_Redraft.csv")
     # Redraft Prices Source: https://football.fantasysports.yahoo.com/f1/draftanalysis?type=salcap
     adp = pd.read_csv("Yahoo_2024_Overall_SalaryCap_Rankings_Redraft.csv")
-    corrections = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/name_corrections.csv")
-    adp = pd.merge(left=adp, right=corrections, how="left", on="name")
-    to_fix = ~adp.new_name.isnull()
-    adp.loc[to_fix, "name"] = adp.loc[to_fix, "new_name"]
-    del adp['new_name']
-    missing = ~adp.name.isin(league.players.name.tolist()) & ~adp.position.isin(['DEF']) & ~adp.name.isnull()
+    corrections = resources.read_csv("football/name_corrections.csv")
+    adp['name'] = adp.name.replace(corrections.set_index('name').new_name.to_dict())
+    adp['xwalk_id'] = league.xwalk.resolve(adp.rename(columns={'yahoo_team':'team'}),league.players.xwalk_id.dropna())
+    missing = adp.xwalk_id.isnull() & ~adp.position.isin(['DEF']) & ~adp.name.isnull()
     if missing.any():
         print("Name mismatches in ADP:")
         print(adp.loc[missing,['name','position','yahoo_team']].to_string(index=False))
-    league.players = pd.merge(left=league.players,right=adp[['name','position','avg_salary','proj_salary']],how='left',on=['name','position'])
-    league.players['dummy'] = 1
+    adp = adp.dropna(subset=['xwalk_id']).drop_duplicates(subset=['xwalk_id'])
+    league.players = pd.merge(left=league.players,right=adp[['xwalk_id','avg_salary','proj_salary']],how='left',on='xwalk_id')
 
     budget = options.budget*options.starterpct # ~90% of total draft salary cap, autodraft after that...
     positions = league.roster_spots.loc[~league.roster_spots.position.isin(["DEF", "K", "BN", "IR"])].set_index('position').to_dict()['count']
@@ -156,13 +330,16 @@ def main():
     # Asking for keepers
     if os.path.exists(str(options.keepers) and options.keepers.endswith('.csv')):
         keepers = pd.read_csv(options.keepers).rename(columns={'fantasy_team':'keeper_team','salary':'actual_salary'})
-        missing = ~keepers.name.isin(league.players.name.tolist())
+        # Keepers csv only lists names, so exact name matches are all that's required
+        keepers['xwalk_id'] = league.xwalk.resolve(keepers,league.players.xwalk_id.dropna(),threshold=0.7)
+        missing = keepers.xwalk_id.isnull()
         if missing.any():
             print("Player misspellings in keepers csv: " + ', '.join(keepers.loc[missing,'name'].tolist()))
         bad_teams = ~keepers.keeper_team.isin([team['name'] for team in league.teams])
         if bad_teams.any():
             print("Team misspellings in keepers csv: " + ', '.join(keepers.loc[bad_teams,'keeper_team'].tolist()))
-        league.players = pd.merge(left=league.players,right=keepers,how='left',on='name')
+        keepers = keepers.dropna(subset=['xwalk_id']).drop_duplicates(subset=['xwalk_id'])
+        league.players = pd.merge(left=league.players,right=keepers[['xwalk_id','keeper_team','actual_salary']],how='left',on='xwalk_id')
         kept = ~league.players.keeper_team.isnull()
         league.players.loc[kept,'fantasy_team'] = league.players.loc[kept,'keeper_team']
         del league.players['keeper_team']
@@ -215,18 +392,18 @@ def main():
     league_pace = league.players.loc[~league.players.fantasy_team.isnull() & ~league.players.fantasy_team.isin([league.name]),'delta'].mean()
     my_pace = league.players.loc[league.players.fantasy_team.isin([league.name]),'delta'].mean()
 
-    remerge = True
+    values = AuctionValues(league.players.loc[league.players.fantasy_team.isnull() & ~league.players.name.isin(excluded)], positions, budget)
+    # Max bids come straight from the valuation curves, top lineups are only enumerated when asked for
+    teams = None
     while all([sum(positions.values()) > 0,league.players.shape[0] > 0,budget > 0]):
-        if remerge:
-            teams = best_combos(positions, budget, league, limit=options.limit, exclude=excluded)
-            remerge = False
-
         # Identifying nominated player
         print("")
         draft_pick = check_pick_name(league,input("Player Up For Grabs: "),["best","lookup","sim","roster"])
         while draft_pick is None:
             draft_pick = check_pick_name(league,input("Player Up For Grabs: "),["best","lookup","sim","roster"])
         if draft_pick == "best":
+            if teams is None:
+                teams = best_combos(positions, budget, league, limit=options.limit, exclude=excluded)
             best = pd.DataFrame({'Player':'_'.join(teams.Total_Names.tolist()).split('_')})
             best = best.groupby('Player').size().sort_values(ascending=False).to_frame('% of Teams').iloc[:20].reset_index()
             best['% of Teams'] = 100*best['% of Teams']/options.limit
@@ -251,10 +428,10 @@ def main():
                 print('Player WAR: ' + str(round(league.players.loc[league.players.name == focus,'WAR'].values[0],2)))
                 print('Avg Yahoo Salary: $' + "{:.2f}".format(league.players.loc[league.players.name == focus,'avg_salary'].values[0]))
                 print('Proj Yahoo Salary: $' + "{:.2f}".format(league.players.loc[league.players.name == focus,'proj_salary'].values[0]))
-                lookup_teams = best_combos(positions, budget, league, limit=options.limit, fixed=focus, exclude=excluded)
-                print("Avg Team WAR = {}".format(round(lookup_teams.Total_WAR.mean(),3)))
-                print("Current Best WAR = {}".format(round(teams.Total_WAR.mean(),3)))
-                print("Delta WAR = {}".format(round(teams.Total_WAR.mean() - lookup_teams.Total_WAR.mean(),3)))
+                bid = values.max_bid(focus, positions, budget)
+                print("Best WAR Without Them = {}".format(round(bid.lineup_war,3)))
+                print("Best WAR With Them at Avg Salary = {}".format(round(bid.lineup_war_with,3)))
+                print("Max Bid = ${}".format(int(bid.max_bid)))
         elif draft_pick.lower() == "sim":
             standings_sim = league.season_sims()[1]
             print(standings_sim[['team','points_avg','wins_avg','playoffs','winner','earnings']].to_string(index=False))
@@ -265,26 +442,11 @@ def main():
             print('Player WAR: ' + str(round(league.players.loc[league.players.name == draft_pick,'WAR'].values[0],2)))
             print('Avg Yahoo Salary: $' + "{:.2f}".format(league.players.loc[league.players.name == draft_pick,'avg_salary'].values[0]))
             print('Proj Yahoo Salary: $' + "{:.2f}".format(league.players.loc[league.players.name == draft_pick,'proj_salary'].values[0]))
-            pick_teams = best_combos(positions, budget, league, limit=options.limit, fixed=draft_pick, exclude=excluded)
-            print("Avg Team WAR = {}".format(round(pick_teams.Total_WAR.mean(),3)))
-            print("Current Best WAR = {}".format(round(teams.Total_WAR.mean(),3)))
-            print("Delta WAR = {}".format(round(teams.Total_WAR.mean() - pick_teams.Total_WAR.mean(),3)))
-
-            # For player in question, find max spending in top teams
-            salaries = []
-            present = 0
-            for pos in positions:
-                for num in range(positions[pos]):
-                    salaries += teams.loc[teams['Name_' + pos + str(num + 1)] == draft_pick,'Salary_' + pos + str(num + 1)].tolist()
-                    present += teams.loc[teams['Name_' + pos + str(num + 1)] == draft_pick].shape[0]
-            if len(salaries) == 0:
-                print('Not present in top ' + str(options.limit) + ' teams...')
-            else:
-                print('Present in ' + "{:.1f}".format(100*present/options.limit) + '% of top ' + str(options.limit) + ' teams')
-                print('Avg Salary in Best Teams: $' + "{:.2f}".format(np.average(salaries)) + ' +/- ' + "{:.2f}".format(np.std(salaries)))
-                print('Max Salary in Best Teams: $' + "{:.2f}".format(max(salaries)))
-                remerge = True
-            
+            bid = values.max_bid(draft_pick, positions, budget)
+            print("Best WAR Without Them = {}".format(round(bid.lineup_war,3)))
+            print("Best WAR With Them at Avg Salary = {}".format(round(bid.lineup_war_with,3)))
+            print("Max Bid = ${}".format(int(bid.max_bid)))
+
             print("League Spending Pace: " + str(round(league_pace,2)))
             print("My Spending Pace: " + str(round(my_pace,2)))
 
@@ -301,6 +463,8 @@ def main():
                 print("Salary must be an integer, try again...")
                 salary_val = input("How much did they pay? ")
             league.players.loc[league.players.name == draft_pick,'actual_salary'] = int(salary_val)
+            values.sold(draft_pick)
+            teams = None
             league.players.loc[~league.players.fantasy_team.isnull() & ~league.players.name.str.startswith('Average_'),\
             ['name','fantasy_team','actual_salary']].rename(columns={"actual_salary":"salary"}).to_csv("DraftProgressSalaryCap.csv",index=False)
             league.players['delta'] = league.players['actual_salary'] - league.players['avg_salary']
@@ -317,7 +481,6 @@ def main():
                 elif positions['Q/W/R/T'] > 0 and pos in ['QB','WR','RB','TE']:
                     positions['Q/W/R/T'] -= 1
                 budget -= int(salary_val)
-                remerge = True
 
     # Using possible_adds and assuming you'll be spending $1 or $2 from here out...
     league.num_sims = 1000
@@ -15,6 +15,7 @@ from bs4 import BeautifulSoup
 from math import factorial
 import optparse
 import sys
+import resources
 
 
 def n_choose_k(n: int, k: int) -> float:
@@ -31,6 +32,60 @@ def n_choose_k(n: int, k: int) -> float:
     return factorial(n) / (factorial(n - k) * factorial(k))
 
 
+set_scores = pd.DataFrame({"games_won":[6,6,6,6,6,7,6,0,1,2,3,4,5,6],
+                           "games_lost":[0,1,2,3,4,5,6,6,6,6,6,6,7,6],
+                           "sets_won":[1]*7 + [0]*7,
+                           "sets_lost":[0]*7 + [1]*7})
+set_scores["combos"] = [n_choose_k(6 + lost, lost) for lost in range(5)] + [n_choose_k(10, 5)]*2 \
++ [n_choose_k(6 + won, won) for won in range(5)] + [n_choose_k(10, 5)]*2
+"""Every possible set score (the 6-6 rows being tiebreaks) and the number of game orderings used to weigh each one."""
+
+game_probs = np.linspace(0.0, 1.0, 10001)
+"""Grid of game win probabilities the lookup tables below are computed on."""
+
+set_score_table = set_scores.combos.values * game_probs[:, None]**set_scores.games_won.values \
+* (1 - game_probs[:, None])**set_scores.games_lost.values
+set_score_table /= set_score_table.sum(axis=1, keepdims=True)
+"""Probability of each set score for every game win probability in the grid (grid x set scores)."""
+
+set_win_probs = np.polyval([-252, 1386, -3080, 3465, -1980, 462, 0, 0, 0, 0, 0, 0], game_probs)
+"""Probability of winning a set for every game win probability in the grid."""
+
+match3_probs = 3*set_win_probs**2 - 2*set_win_probs**3
+"""Probability of winning a best-of-3 match for every game win probability in the grid."""
+
+
+def match_outcomes(best_of: int) -> tuple:
+    """
+    Lists every distinct collection of set scores a match can finish with, along with the number of set orders
+    that produce each one (the winner always taking the last set).
+
+    Args:
+        best_of (int): maximum number of sets in the match (3 or 5).
+
+    Returns:
+        tuple: set score indices of each outcome (-1 for sets not played), number of set orders for each outcome.
+    """
+    needed = best_of // 2 + 1
+    finished = []
+    orders = np.zeros((1, 0), dtype=int)
+    for num_sets in range(1, best_of + 1):
+        orders = np.concatenate([np.repeat(orders, set_scores.shape[0], axis=0),
+                                 np.tile(np.arange(set_scores.shape[0]), orders.shape[0])[:, None]], axis=1)
+        won = set_scores.sets_won.values[orders].sum(axis=1)
+        done = (won == needed) | (num_sets - won == needed)
+        finished.append(np.pad(orders[done], ((0, 0), (0, best_of - num_sets)), constant_values=-1))
+        orders = orders[~done]
+    # Order doesn't matter for points, so count the orders behind each sorted collection (one integer key per collection)
+    base = set_scores.shape[0] + 1
+    keys, counts = np.unique((np.sort(np.concatenate(finished), axis=1) + 1) @ base**np.arange(best_of)[::-1], return_counts=True)
+    return keys[:, None] // base**np.arange(best_of)[::-1] % base - 1, counts
+
+
+match_outcome_table = {3: match_outcomes(3), 5: match_outcomes(5)}
+"""Distinct set score collections and their number of set orders for best-of-3 and best-of-5 matches."""
+
+
 def pull_elo_rankings() -> pd.DataFrame:
     """
     Pull the latest men's and women's elo rankings from "Tennis Abstract" and formats them into a dataframe.
@@ -114,10 +169,7 @@ def load_elos(elo_loc: str = "TennisElo.csv") -> pd.DataFrame:
     else:
         elo = pull_elo_rankings()
         elo.to_csv(elo_loc, index=False)
-    corrections = pd.read_csv(
-        "https://raw.githubusercontent.com/tefirman/FantasySports/main/res/tennis/name_corrections.csv"
-    )
-    # corrections = pd.read_csv("res/tennis/name_corrections.csv")
+    corrections = resources.read_csv("tennis/name_corrections.csv")
     elo = pd.merge(left=elo, right=corrections, how="left", on="Player")
     elo.loc[~elo.NewPlayer.isnull(), "Player"] = elo.loc[
         ~elo.NewPlayer.isnull(), "NewPlayer"
@@ -199,416 +251,281 @@ def add_match_details(elo: pd.DataFrame, salary_loc: str = "DKSalaries.csv", cou
     )
     matchups["elo_diff"] = matchups["Elo"] - matchups["OppElo"]
     matchups["match3_prob"] = 1 - (1 / (1 + 10 ** (matchups["elo_diff"] / 400)))
-    matchups["set_prob"] = matchups["match3_prob"].apply(
-        lambda x: np.roots([-2, 3, 0, -1 * x])[1]
-    )
-    # matchups['game_prob'] = matchups['set_prob'].apply(lambda x: np.roots([-252+252, 
-    # 1260-1512, 126-2520+3780, -56-504+2520-5040, 21+168+756-1260+3780, -6-42-168-504+252-1512, 
-    # 1+6+21+56+126+252, 0, 0, 0, 0, 0, -1*x])[1])
-    matchups["game_prob"] = matchups["set_prob"].apply(
-        lambda x: np.roots(
-            [-252, 1386, -3080, 3465, -1980, 462, 0, 0, 0, 0, 0, -1 * x]
-        )[5].real
-    )
+    # Table lookups rather than solving the set and game polynomials for every player
+    matchups["set_prob"] = np.interp(matchups["match3_prob"], match3_probs, set_win_probs)
+    matchups["game_prob"] = np.interp(matchups["match3_prob"], match3_probs, game_probs)
     matchups["match5_prob"] = matchups["set_prob"].apply(
         lambda x: (x**3) * (4 - 3 * x + 6 * (1 - x) * (1 - x))
     )
     return matchups
 
 
-def set_probabilities(matchup, scoring, pts_per_game=6.4):
-    set_probs = pd.DataFrame(
-        columns=["games_won", "games_lost", "sets_won", "sets_lost", "probability"]
-    )
-    for lost in range(5):
-        set_probs = pd.concat(
-            [
-                set_probs,
-                pd.DataFrame(
-                    {
-                        "games_won": [6],
-                        "games_lost": [lost],
-                        "sets_won": [1],
-                        "sets_lost": [0],
-                        "prob": [
-                            n_choose_k(6 + lost, lost) * (matchup['game_prob']**6) * ((1 - matchup['game_prob']) ** lost)
-                        ],
-                    }
-                ),
-            ],
-            ignore_index=True,
-        )
-    set_probs = pd.concat(
-        [
-            set_probs,
-            pd.DataFrame(
-                {
-                    "games_won": [7],
-                    "games_lost": [5],
-                    "sets_won": [1],
-                    "sets_lost": [0],
-                    "prob": [n_choose_k(10, 5) * (matchup['game_prob']**7) * ((1 - matchup['game_prob']) ** 5)],
-                }
-            ),
-        ],
-        ignore_index=True,
-    )
-    set_probs = pd.concat(
-        [
-            set_probs,
-            pd.DataFrame(
-                {
-                    "games_won": [6],
-                    "games_lost": [6],
-                    "sets_won": [1],
-                    "sets_lost": [0],
-                    "prob": [n_choose_k(10, 5) * (matchup['game_prob']**6) * ((1 - matchup['game_prob']) ** 6)],
-                }
-            ),
-        ],
-        ignore_index=True,
-    )
-    for won in range(5):
-        set_probs = pd.concat(
-            [
-                set_probs,
-                pd.DataFrame(
-                    {
-                        "games_won": [won],
-                        "games_lost": [6],
-                        "sets_won": [0],
-                        "sets_lost": [1],
-                        "prob": [
-                            n_choose_k(6 + won, won) * (matchup['game_prob']**won) * ((1 - matchup['game_prob']) ** 6)
-                        ],
-                    }
-                ),
-            ],
-            ignore_index=True,
-        )
-    set_probs = pd.concat(
-        [
-            set_probs,
-            pd.DataFrame(
-                {
-                    "games_won": [5],
-                    "games_lost": [7],
-                    "sets_won": [0],
-                    "sets_lost": [1],
-                    "prob": [n_choose_k(10, 5) * (matchup['game_prob']**5) * ((1 - matchup['game_prob']) ** 7)],
-                }
-            ),
-        ],
-        ignore_index=True,
-    )
-    set_probs = pd.concat(
-        [
-            set_probs,
-            pd.DataFrame(
-                {
-                    "games_won": [6],
-                    "games_lost": [6],
-                    "sets_won": [0],
-                    "sets_lost": [1],
-                    "prob": [n_choose_k(10, 5) * (matchup['game_prob']**6) * ((1 - matchup['game_prob']) ** 6)],
-                }
-            ),
-        ],
-        ignore_index=True,
-    )
-    set_probs.prob = set_probs.prob / set_probs.prob.sum()
-    set_probs["DKFP"] = (
-        set_probs.games_won * scoring["game_won"]
-        + set_probs.games_lost * scoring["game_lost"]
-        + (set_probs.games_lost < 6).astype(float)*set_probs.apply(lambda x: max(x["games_won"] - x["games_lost"],0.0)/2.0,axis=1)*scoring["break_point"]
-        + (set_probs.games_won + set_probs.games_lost)/2.0*pts_per_game*(matchup["AcePct"]*scoring["ace"] + matchup["DfPct"]*scoring["double_fault"])
-        + set_probs.sets_won * scoring["set_won"]
-        + set_probs.sets_lost * scoring["set_lost"]
-    )
-    set_probs["DKFP_opp"] = (
-        set_probs.games_lost * scoring["game_won"]
-        + set_probs.games_won * scoring["game_lost"]
-        + (set_probs.games_won < 6).astype(float)*set_probs.apply(lambda x: max(x["games_lost"] - x["games_won"],0.0)/2.0,axis=1)*scoring["break_point"]
-        + (set_probs.games_won + set_probs.games_lost)/2.0*pts_per_game*(matchup["OppAcePct"]*scoring["ace"] + matchup["OppDfPct"]*scoring["double_fault"])
-        + set_probs.sets_lost * scoring["set_won"]
-        + set_probs.sets_won * scoring["set_lost"]
-    )
-    set_probs.loc[
-        (set_probs.games_won == 6) & (set_probs.games_lost == 0), "DKFP"
-    ] += scoring["clean_set"]
-    set_probs.loc[
-        (set_probs.games_won == 0) & (set_probs.games_lost == 6), "DKFP_opp"
-    ] += scoring["clean_set"]
-    return set_probs
-
-
-def match_probabilities(matchup, scoring, major=False):
-    wins = pd.DataFrame()
-    losses = pd.DataFrame()
-    set_probs = set_probabilities(matchup, scoring)
-    set_probs["dummy"] = 1
-    match_combos = pd.merge(
-        left=set_probs.rename(
-            columns={col: col + "_1" for col in set_probs.columns if col != "dummy"}
-        ),
-        right=set_probs.rename(
-            columns={col: col + "_2" for col in set_probs.columns if col != "dummy"}
-        ),
-        how="inner",
-        on="dummy",
-    )
-    match_combos["DKFP"] = scoring["match_played"] + match_combos["DKFP_1"] + match_combos["DKFP_2"]
-    match_combos["DKFP_opp"] = scoring["match_played"] + match_combos["DKFP_opp_1"] + match_combos["DKFP_opp_2"]
-    match_combos["prob"] = match_combos["prob_1"] * match_combos["prob_2"]
-    if not major:
-        match_combos["sets_won"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_won_")]
-        ].sum(axis=1)
-        match_combos["sets_lost"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_lost_")]
-        ].sum(axis=1)
-        match_combos.loc[match_combos.sets_won == 2, "DKFP"] += (
-            scoring["straight_sets"] + scoring["match_won"]
-        )
-        match_combos.loc[match_combos.sets_lost == 2, "DKFP_opp"] += (
-            scoring["straight_sets"] + scoring["match_won"]
-        )
-        wins = pd.concat(
-            [wins, match_combos.loc[match_combos.sets_won == 2]], ignore_index=True
-        )
-        losses = pd.concat(
-            [losses, match_combos.loc[match_combos.sets_lost == 2]], ignore_index=True
-        )
-        match_combos = match_combos.loc[match_combos.sets_won == 1].reset_index(
-            drop=True
-        )
-    match_combos = pd.merge(
-        left=match_combos,
-        right=set_probs.rename(
-            columns={col: col + "_3" for col in set_probs.columns if col != "dummy"}
-        ),
-        how="inner",
-        on="dummy",
-    )
-    match_combos["DKFP"] += match_combos["DKFP_3"]
-    match_combos["DKFP_opp"] += match_combos["DKFP_opp_3"]
-    match_combos["prob"] *= match_combos["prob_3"]
-    match_combos["sets_won"] = match_combos[
-        [col for col in match_combos.columns if col.startswith("sets_won_")]
-    ].sum(axis=1)
-    match_combos["sets_lost"] = match_combos[
-        [col for col in match_combos.columns if col.startswith("sets_lost_")]
-    ].sum(axis=1)
-    winner = 3 if major else 2
-    match_combos.loc[match_combos.sets_won == winner, "DKFP"] += scoring[
-        "match_won"
-    ] + (scoring["straight_sets"] if major else 0)
-    match_combos.loc[match_combos.sets_lost == winner, "DKFP_opp"] += scoring[
-        "match_won"
-    ] + (scoring["straight_sets"] if major else 0)
-    wins = pd.concat(
-        [wins, match_combos.loc[match_combos.sets_won == winner]], ignore_index=True
-    )
-    losses = pd.concat(
-        [losses, match_combos.loc[match_combos.sets_lost == winner]],
-        ignore_index=True,
-    )
-    match_combos = match_combos.loc[
-        ~match_combos.sets_won.isin([winner]) & ~match_combos.sets_lost.isin([winner])
-    ].reset_index(drop=True)
-    if major:
-        match_combos = pd.merge(
-            left=match_combos.loc[match_combos.sets_won.isin([1, 2])],
-            right=set_probs.rename(
-                columns={col: col + "_4" for col in set_probs.columns if col != "dummy"}
-            ),
-            how="inner",
-            on="dummy",
-        )
-        match_combos["DKFP"] += match_combos["DKFP_4"]
-        match_combos["DKFP_opp"] += match_combos["DKFP_opp_4"]
-        match_combos["prob"] *= match_combos["prob_4"]
-        match_combos["sets_won"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_won_")]
-        ].sum(axis=1)
-        match_combos["sets_lost"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_lost_")]
-        ].sum(axis=1)
-        match_combos.loc[match_combos.sets_won == 3, "DKFP"] += scoring["match_won"]
-        match_combos.loc[match_combos.sets_lost == 3, "DKFP_opp"] += scoring["match_won"]
-        wins = pd.concat(
-            [wins, match_combos.loc[match_combos.sets_won == 3]], ignore_index=True
-        )
-        losses = pd.concat(
-            [losses, match_combos.loc[match_combos.sets_lost == 3]], ignore_index=True
-        )
-        match_combos = pd.merge(
-            left=match_combos.loc[match_combos.sets_won == 2],
-            right=set_probs.rename(
-                columns={col: col + "_5" for col in set_probs.columns if col != "dummy"}
-            ),
-            how="inner",
-            on="dummy",
-        )
-        match_combos["DKFP"] += match_combos["DKFP_5"]
-        match_combos["DKFP_opp"] += match_combos["DKFP_opp_5"]
-        match_combos["prob"] *= match_combos["prob_5"]
-        match_combos["sets_won"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_won_")]
-        ].sum(axis=1)
-        match_combos["sets_lost"] = match_combos[
-            [col for col in match_combos.columns if col.startswith("sets_lost_")]
-        ].sum(axis=1)
-        match_combos.loc[match_combos.sets_won == 3, "DKFP"] += scoring["match_won"]
-        match_combos.loc[match_combos.sets_lost == 3, "DKFP_opp"] += scoring["match_won"]
-    outcomes = pd.concat(
-        [
-            match_combos[["DKFP", "DKFP_opp", "prob"]],
-            wins[["DKFP", "DKFP_opp", "prob"]],
-            losses[["DKFP", "DKFP_opp", "prob"]],
-        ],
-        ignore_index=True,
-    )
-    return outcomes
+def set_score_probs(game_prob: np.ndarray) -> np.ndarray:
+    """
+    Looks up the probability of each set score for any number of game win probabilities,
+    interpolating linearly between points of the precomputed grid.
+
+    Args:
+        game_prob (np.ndarray): probability of winning each game.
+
+    Returns:
+        np.ndarray: probability of each set score (game win probabilities x set scores).
+    """
+    spot = np.clip(np.asarray(game_prob, dtype=float), 0.0, 1.0) * (game_probs.shape[0] - 1)
+    low = np.minimum(spot.astype(int), game_probs.shape[0] - 2)
+    weight = (spot - low)[:, None]
+    return set_score_table[low] * (1 - weight) + set_score_table[low + 1] * weight
+
+
+def set_points(scoring: dict, pts_per_game: float = 6.4) -> tuple:
+    """
+    Calculates the fantasy points earned by each player for every set score, leaving aces and double faults
+    as a number of service points to be scaled by each player's rates.
+
+    Args:
+        scoring (dict): fantasy points for each stat.
+        pts_per_game (float, optional): average number of points per game. Defaults to 6.4.
+
+    Returns:
+        tuple: points for the player, points for the opponent, service points played by each player.
+    """
+    won, lost = set_scores.games_won.values, set_scores.games_lost.values
+    points = won * scoring["game_won"] + lost * scoring["game_lost"] \
+    + (lost < 6) * np.maximum(won - lost, 0) / 2.0 * scoring["break_point"] \
+    + set_scores.sets_won.values * scoring["set_won"] + set_scores.sets_lost.values * scoring["set_lost"] \
+    + ((won == 6) & (lost == 0)) * scoring["clean_set"]
+    opp_points = lost * scoring["game_won"] + won * scoring["game_lost"] \
+    + (won < 6) * np.maximum(lost - won, 0) / 2.0 * scoring["break_point"] \
+    + set_scores.sets_lost.values * scoring["set_won"] + set_scores.sets_won.values * scoring["set_lost"] \
+    + ((won == 0) & (lost == 6)) * scoring["clean_set"]
+    return points, opp_points, (won + lost) / 2.0 * pts_per_game
+
+
+def set_probabilities(matchups, scoring, pts_per_game=6.4):
+    single = isinstance(matchups, pd.Series)
+    if single:
+        matchups = matchups.to_frame().T
+    probs = set_score_probs(matchups.game_prob.astype(float).values)
+    points, opp_points, served = set_points(scoring, pts_per_game)
+    serve = (matchups.AcePct*scoring["ace"] + matchups.DfPct*scoring["double_fault"]).astype(float).values
+    opp_serve = (matchups.OppAcePct*scoring["ace"] + matchups.OppDfPct*scoring["double_fault"]).astype(float).values
+    num_scores = set_scores.shape[0]
+    set_probs = pd.DataFrame({"match":np.repeat(matchups.index.values, num_scores),
+                              "games_won":np.tile(set_scores.games_won.values, matchups.shape[0]),
+                              "games_lost":np.tile(set_scores.games_lost.values, matchups.shape[0]),
+                              "sets_won":np.tile(set_scores.sets_won.values, matchups.shape[0]),
+                              "sets_lost":np.tile(set_scores.sets_lost.values, matchups.shape[0]),
+                              "prob":probs.ravel(),
+                              "DKFP":(points + np.outer(serve, served)).ravel(),
+                              "DKFP_opp":(opp_points + np.outer(opp_serve, served)).ravel()})
+    return set_probs.drop(columns="match") if single else set_probs
+
+
+def match_probabilities(matchups, scoring, major=False):
+    single = isinstance(matchups, pd.Series)
+    if single:
+        matchups = matchups.to_frame().T
+    best_of = 5 if major else 3
+    sets, counts = match_outcome_table[best_of]
+    # Extra zero/one on the end for sets not played (index -1)
+    probs = np.concatenate([set_score_probs(matchups.game_prob.astype(float).values), np.ones((matchups.shape[0], 1))], axis=1)
+    points, opp_points, served = [np.append(vals, 0.0)[sets].sum(axis=1) for vals in set_points(scoring)]
+    won = np.append(set_scores.sets_won.values, 0)[sets].sum(axis=1)
+    lost = np.append(set_scores.sets_lost.values, 0)[sets].sum(axis=1)
+    points += scoring["match_played"] + (won > best_of // 2) * scoring["match_won"] \
+    + ((won > best_of // 2) & (lost == 0)) * scoring["straight_sets"]
+    opp_points += scoring["match_played"] + (lost > best_of // 2) * scoring["match_won"] \
+    + ((lost > best_of // 2) & (won == 0)) * scoring["straight_sets"]
+    serve = (matchups.AcePct*scoring["ace"] + matchups.DfPct*scoring["double_fault"]).astype(float).values
+    opp_serve = (matchups.OppAcePct*scoring["ace"] + matchups.OppDfPct*scoring["double_fault"]).astype(float).values
+    outcomes = pd.DataFrame({"match":np.repeat(matchups.index.values, sets.shape[0]),
+                             "DKFP":(points + np.outer(serve, served)).ravel(),
+                             "DKFP_opp":(opp_points + np.outer(opp_serve, served)).ravel(),
+                             "prob":(counts * probs[:, sets].prod(axis=2)).ravel()})
+    return outcomes.drop(columns="match") if single else outcomes
 
 
 def project_points(matchups, major=False, underdog=False, verbose=False):
     scoring = (
-        pd.read_csv(
-            "https://raw.githubusercontent.com/tefirman/FantasySports/main/res/tennis/scoring.csv"
-        )
+        resources.read_csv("tennis/scoring.csv")
         .set_index("stat")
         .to_dict()
     )
-    # scoring = pd.read_csv("res/tennis/scoring.csv").set_index("stat").to_dict()
-    for ind in range(matchups.shape[0]):
-        if verbose:
+    num_sets = pd.Series("underdog" if underdog else "three_set", index=matchups.index)
+    if not underdog and major:
+        num_sets.loc[matchups.Tour != "WTA"] = "five_set"
+    outcomes = pd.concat([match_probabilities(matchups.loc[num_sets == scores], scoring[scores], major) \
+    for scores in num_sets.unique()], ignore_index=True)
+    outcomes["DKFP_avg"] = outcomes.prob * outcomes.DKFP
+    outcomes["DKFP_sq"] = outcomes.prob * outcomes.DKFP**2.0
+    totals = outcomes.groupby("match")[["DKFP_avg","DKFP_sq"]].sum()
+    matchups["DKFP"] = totals.DKFP_avg
+    if verbose:
+        for ind in matchups.index:
             print(matchups.loc[ind, "Name"])
-        num_sets = "underdog" if underdog else (
-            "three_set"
-            if matchups.loc[ind, "Tour"] == "WTA" or not major
-            else "five_set"
-        )
-        outcomes = match_probabilities(matchups.iloc[ind], scoring[num_sets], major)
-        avg = (outcomes.prob * outcomes.DKFP).sum()
-        sq_avg = (outcomes.prob * (outcomes.DKFP**2.0)).sum()
-        stdev = (sq_avg - avg**2.0)**0.5
-        matchups.loc[ind, "DKFP"] = avg
-        if verbose:
-            print("{} +/- {}".format(round(avg,2),round(stdev,2)))
+            stdev = (totals.loc[ind, "DKFP_sq"] - totals.loc[ind, "DKFP_avg"]**2.0)**0.5
+            print("{} +/- {}".format(round(totals.loc[ind, "DKFP_avg"],2),round(stdev,2)))
     players = matchups[["Name", "Salary", "DKFP", "OppName"]]
     return players
 
 
 def simulate_points(matchups, num_sims=1000, major=False, verbose=False):
     scoring = (
-        pd.read_csv(
-            "https://raw.githubusercontent.com/tefirman/FantasySports/main/res/tennis/scoring.csv"
-        )
+        resources.read_csv("tennis/scoring.csv")
         .set_index("stat")
         .to_dict()
     )
-    # scoring = pd.read_csv("res/tennis/scoring.csv").set_index("stat").to_dict()
-    sim_matches = pd.DataFrame(columns=['Name','OppName'])
-    for ind in range(matchups.shape[0]):
-        if matchups.iloc[ind]["Name"] in matchups.iloc[:ind]["OppName"].unique():
-            continue
-        if verbose:
-            print(matchups.iloc[ind]["Name"] + ' vs. ' + matchups.iloc[ind]["OppName"])
-        num_sets = (
-            "three_set"
-            if matchups.iloc[ind]["Tour"] == "WTA" or not major
-            else "five_set"
-        )
-        outcomes = match_probabilities(matchups.iloc[ind], scoring[num_sets], major)
-        outcomes['Name'] = matchups.iloc[ind]['Name']
-        outcomes['OppName'] = matchups.iloc[ind]['OppName']
-        sim_matches = pd.concat([sim_matches,outcomes.sample(n=num_sims,weights='prob',replace=True)],ignore_index=True,sort=False)
-    sim_matches = pd.concat([sim_matches[['Name','DKFP']],sim_matches[['OppName','DKFP_opp']]\
-    .rename(columns={'OppName':'Name','DKFP_opp':'DKFP'})],ignore_index=True)
-    sim_matches = sim_matches.rename(columns={'DKFP':'DKFP_sim'})
+    # One row per match (skipping the opponent's copy of each matchup)
+    seen = set()
+    first = []
+    for name, opp in zip(matchups["Name"], matchups["OppName"]):
+        first.append(name not in seen)
+        seen.add(opp)
+    matches = matchups.loc[first].reset_index(drop=True)
+    if verbose:
+        for ind in range(matches.shape[0]):
+            print(matches.loc[ind, "Name"] + ' vs. ' + matches.loc[ind, "OppName"])
+    num_sets = pd.Series("three_set", index=matches.index)
+    if major:
+        num_sets.loc[matches.Tour != "WTA"] = "five_set"
+
+    # Outcome probabilities and points as one row per match
+    num_outcomes = match_outcome_table[5 if major else 3][0].shape[0]
+    probs = np.zeros((matches.shape[0], num_outcomes))
+    points = np.zeros((matches.shape[0], num_outcomes))
+    opp_points = np.zeros((matches.shape[0], num_outcomes))
+    for scores in num_sets.unique():
+        inds = num_sets.index[num_sets == scores]
+        outcomes = match_probabilities(matches.loc[inds], scoring[scores], major)
+        probs[inds] = outcomes.prob.values.reshape(-1, num_outcomes)
+        points[inds] = outcomes.DKFP.values.reshape(-1, num_outcomes)
+        opp_points[inds] = outcomes.DKFP_opp.values.reshape(-1, num_outcomes)
+
+    # Every match and sim drawn at once, each match's cumulative probabilities offset by its row number
+    cumulative = np.cumsum(probs, axis=1)
+    cumulative = cumulative / cumulative[:, -1:] + np.arange(matches.shape[0])[:, None]
+    draws = np.random.random((matches.shape[0], num_sims)) + np.arange(matches.shape[0])[:, None]
+    picks = np.searchsorted(cumulative.ravel(), draws, side='right') - np.arange(matches.shape[0])[:, None]*num_outcomes
+    picks = np.minimum(picks, num_outcomes - 1)
+    sim_matches = pd.DataFrame({'Name':np.repeat(np.concatenate([matches.Name.values, matches.OppName.values]), num_sims),
+                                'DKFP_sim':np.concatenate([np.take_along_axis(points, picks, axis=1).ravel(),
+                                                           np.take_along_axis(opp_points, picks, axis=1).ravel()])})
     sim_matches['num_sim'] = sim_matches.index%num_sims
     return sim_matches
 
 
+def team_combinations(salary: np.ndarray, points: np.ndarray, player_ids: np.ndarray, slots: list, multipliers: list, \
+salary_cap: float, min_salary: float, opp_ids: np.ndarray = None, chunk_size: int = 4000000) -> tuple:
+    """
+    Builds every combination of salary rows (one per lineup spot) that stays under the salary cap,
+    working with integer row indices and pruning partial combinations that can't be finished under the cap.
+    Consecutive spots drawing from the same rows only take rows in increasing order, so each team comes up exactly once.
+
+    Args:
+        salary (np.ndarray): salary of each row.
+        points (np.ndarray): projected points of each row.
+        player_ids (np.ndarray): integer id of the player in each row.
+        slots (list): row indices eligible for each lineup spot.
+        multipliers (list): points multiplier for each lineup spot.
+        salary_cap (float): total salary has to stay under this.
+        min_salary (float): cheapest salary on the slate, reserved for each spot still to be filled.
+        opp_ids (np.ndarray, optional): integer id of the opponent in each row, leaving out teams with both sides of a match. Defaults to None.
+        chunk_size (int, optional): most partial combination/candidate pairs to check at once. Defaults to 4000000.
+
+    Returns:
+        tuple: matrix of row indices for each team, total salary of each team, total projected points of each team.
+    """
+    combos = np.zeros((1, 0), dtype=np.int32)
+    totals = np.zeros(1)
+    projs = np.zeros(1)
+    for ind, rows in enumerate(slots):
+        ordered = ind > 0 and np.array_equal(rows, slots[ind - 1])
+        room = salary_cap - min_salary * (len(slots) - ind - 1)
+        new_combos, new_totals, new_projs = [], [], []
+        step = max(1, chunk_size // max(1, rows.shape[0]))
+        for start in range(0, combos.shape[0], step):
+            partial = combos[start:start + step]
+            valid = totals[start:start + step, None] + salary[rows][None, :] < room
+            if ordered:
+                valid &= partial[:, -1:] < rows[None, :]
+            for col in range(partial.shape[1]):
+                valid &= player_ids[partial[:, col]][:, None] != player_ids[rows][None, :]
+                if opp_ids is not None:
+                    valid &= player_ids[partial[:, col]][:, None] != opp_ids[rows][None, :]
+            team, cand = np.nonzero(valid)
+            new_combos.append(np.column_stack([partial[team], rows[cand]]).astype(np.int32))
+            new_totals.append(totals[start + team] + salary[rows[cand]])
+            new_projs.append(projs[start + team] + points[rows[cand]] * multipliers[ind])
+        if len(new_combos) == 0:
+            return np.zeros((0, len(slots)), dtype=np.int32), np.zeros(0), np.zeros(0)
+        combos, totals, projs = np.concatenate(new_combos), np.concatenate(new_totals), np.concatenate(new_projs)
+    return combos, totals, projs
+
+
 def compile_teams(salaries, salary_cap=50000, same_match=False, fixed=None, \
 verbose=False, shortslate=False, salary_rate=-0.003125):
-    salaries["dummy"] = 1
-    teams = pd.DataFrame({"dummy": [1], "Name": [""], "DKFP": [0], "Salary": [0]})
     spots = 3 if shortslate else 6
-    for ind in range(spots):
-        pos = ['CPT','A-CPT','P'][ind] if shortslate else 'P'
-        multiplier = [1.5,1.25,1.0][ind] if shortslate else 1.0
-        teams = pd.merge(
-            left=teams,
-            right=salaries.loc[salaries['Roster Position'] == pos,\
-            ["dummy", "Name", "DKFP", "Salary", "OppName"]].rename(
-                columns={
-                    "Name": "Name_" + str(ind + 1),
-                    "DKFP": "DKFP_" + str(ind + 1),
-                    "Salary": "Salary_" + str(ind + 1),
-                }
-            ),
-            how="inner",
-            on="dummy",
-        )
-        teams = teams.loc[
-            teams.apply(lambda x: x["Name_" + str(ind + 1)] not in x["Name"], axis=1)
-        ]
-        teams = teams.loc[
-            teams["Salary"] + teams["Salary_" + str(ind + 1)]
-            < salary_cap - salaries.Salary.min() * (spots - ind - 1)
-        ]
-        teams.Name += "_" + teams["Name_" + str(ind + 1)] + '-' + pos
-        teams.DKFP += teams["DKFP_" + str(ind + 1)]*multiplier
-        teams.Salary += teams["Salary_" + str(ind + 1)]
-        teams.Name = teams.Name.apply(lambda x: "_".join(sorted(x.split("_"))))
-        """ Eliminating lineups with match opponents """
-        if not same_match:
-            teams = teams.loc[
-                teams.apply(lambda x: x["OppName"] not in x["Name"], axis=1)
-            ]
-        del (
-            teams["Name_" + str(ind + 1)],
-            teams["DKFP_" + str(ind + 1)],
-            teams["Salary_" + str(ind + 1)],
-            teams["OppName"],
-        )
-        """ Forcing lineup spots """
-        if fixed:
-            teams["valid"] = True
-            for fixed in fixed.split(","):
-                teams.valid = teams.valid & teams.Name.str.contains(fixed)
-            if teams.valid.any():
-                teams = teams.loc[teams.valid]
-        if verbose:
-            print(teams.shape)
-        teams = (
-            teams.drop_duplicates(subset=["Name"])
-            .sort_values(by="DKFP", ascending=False)
-            .reset_index(drop=True)#.iloc[:100000]
-        )
-    del teams["dummy"]
-    teams.Name = teams.Name.str[1:].str.replace("_", ", ")
-    teams.DKFP = round(teams.DKFP, 2)
-    teams = teams[["Name", "DKFP", "Salary"]]
+    positions = ['CPT','A-CPT','P'] if shortslate else spots*['P']
+    multipliers = [1.5,1.25,1.0] if shortslate else spots*[1.0]
+    # Sorting rows by their label so teams listed in row order read alphabetically
+    rows = salaries.loc[salaries['Roster Position'].isin(positions),["Name","DKFP","Salary","OppName","Roster Position"]].copy()
+    rows["label"] = rows.Name + "-" + rows["Roster Position"]
+    rows = rows.sort_values(by="label", ignore_index=True)
+    ids = {name: ind for ind, name in enumerate(pd.unique(pd.concat([rows.Name, rows.OppName])))}
+    player_ids = rows.Name.map(ids).values
+    combos, total_salary, total_points = team_combinations(
+        rows.Salary.values.astype(float),
+        rows.DKFP.values.astype(float),
+        player_ids,
+        [np.where(rows["Roster Position"] == pos)[0] for pos in positions],
+        multipliers,
+        salary_cap,
+        salaries.Salary.min(),
+        None if same_match else rows.OppName.map(ids).values,
+    )
+    """ Forcing lineup spots """
+    if fixed:
+        valid = np.ones(combos.shape[0], dtype=bool)
+        for name in fixed.split(","):
+            valid &= (player_ids[combos] == ids.get(name.strip(), -1)).any(axis=1)
+        if valid.any():
+            combos, total_salary, total_points = combos[valid], total_salary[valid], total_points[valid]
+    if verbose:
+        print(combos.shape)
+    combos = np.sort(combos, axis=1)
+    order = np.argsort(-total_points, kind="stable")
+    combos, total_salary, total_points = combos[order], total_salary[order].round().astype(int), total_points[order]
+    names = pd.Series(rows.label.values[combos[:, 0]])
+    for col in range(1, spots):
+        names = names + ", " + rows.label.values[combos[:, col]]
+    teams = pd.DataFrame({"Name": names, "DKFP": total_points.round(2), "Salary": total_salary})
     q = sum(np.exp(salary_rate*(50000 - np.arange(0,50001,100))))
-    for salary in range(10000,50001,100):
-        sal_teams = teams.Salary == salary
-        if sal_teams.any():
-            teams.loc[sal_teams,'Probability'] = np.exp(salary_rate*(50000 - salary))/(q*sal_teams.sum())
+    sal_teams = teams.Salary.map(teams.Salary.value_counts())
+    listed = (teams.Salary >= 10000) & (teams.Salary <= 50000) & (teams.Salary % 100 == 0)
+    teams.loc[listed,'Probability'] = np.exp(salary_rate*(50000 - teams.loc[listed,'Salary']))/(q*sal_teams[listed])
     if shortslate:
-        teams['captain'] = teams.Name.str.replace('-A-CPT','-ACPT').str.split('-CPT').str[0].str.split(', ').str[-1]
+        teams['captain'] = rows.Name.values[combos[np.arange(combos.shape[0]), \
+        np.argmax((rows["Roster Position"] == 'CPT').values[combos], axis=1)]]
     else:
-        teams['captain'] = teams['Name']
-        teams.captain = teams.captain.str[:-2].str.split('-P, ')
-        teams = teams.explode('captain',ignore_index=True)
-        teams = pd.merge(left=teams,right=salaries[['Name','Salary']].rename(columns={'Name':'captain','Salary':'cpt_salary'}),how='inner',on='captain')
-        teams = teams.sort_values(by=['DKFP','cpt_salary'],ascending=False).drop_duplicates(subset=['Name'],keep='first',ignore_index=True)
+        # Most expensive player in each team (alphabetically first among ties)
+        cpt_salary = salaries.drop_duplicates(subset=['Name']).set_index('Name').Salary
+        team_salaries = rows.Name.map(cpt_salary).to_numpy()[combos]
+        teams['captain'] = rows.Name.values[combos[np.arange(combos.shape[0]), np.argmax(team_salaries, axis=1)]]
+        teams['cpt_salary'] = team_salaries.max(axis=1)
+        teams = teams.sort_values(by=['DKFP','cpt_salary'],ascending=False,kind="mergesort",ignore_index=True)
     return teams
 
 
-def simulate_contest(teams, matchups, contest_type, num_sims=1000, major=False, verbose=False):
+def contest_details(contest_type: str) -> tuple:
+    """
+    Looks up the size, entry limit, entry fee, and payout table of the specified contest type.
+
+    Args:
+        contest_type (str): type of contest (QuarterJukebox50, QuarterJukebox200, QuarterJukebox400, DoubleUp, or Satellite).
+
+    Returns:
+        tuple: number of entries, max entries per user, entry fee, payout for each finishing spot.
+    """
     if contest_type == 'QuarterJukebox50':
         num_entries = 237
         max_entries = 7
@@ -638,74 +555,314 @@ def simulate_contest(teams, matchups, contest_type, num_sims=1000, major=False,
         print("Don't recognize the contest type provided, assuming Quarter Jukebox...")
         num_entries = 1400
         max_entries = 20
+        entry_fee = 0.25
         payouts = [25,10,5,4,3,2,1]
-    payouts = payouts + [0]*(num_entries - len(payouts))
+    payouts = np.array(payouts + [0]*(num_entries - len(payouts)), dtype=float)
+    return num_entries, max_entries, entry_fee, payouts
+
+
+def player_sims(matchups: pd.DataFrame, num_sims: int = 1000, major: bool = False, verbose: bool = False) -> pd.DataFrame:
+    """
+    Simulates fantasy points for every player on the slate as a matrix.
+
+    Args:
+        matchups (pd.DataFrame): matchup details for each player in the current slate.
+        num_sims (int, optional): number of simulations. Defaults to 1000.
+        major (bool, optional): whether the current event is a major tournament. Defaults to False.
+        verbose (bool, optional): whether to print out each match as it's simulated. Defaults to False.
+
+    Returns:
+        pd.DataFrame: simulated fantasy points with a row for each player and a column for each simulation.
+    """
+    sim_matches = simulate_points(matchups, num_sims, major, verbose)
+    sim_matches.DKFP_sim = sim_matches.DKFP_sim.astype(float)
+    return sim_matches.groupby(['Name','num_sim']).DKFP_sim.sum().unstack(fill_value=0.0)
+
+
+def lineup_matrix(names: pd.Series, players: pd.Index) -> np.ndarray:
+    """
+    Converts lineup names into an incidence matrix of which players are in each lineup
+    (captain spots score like everyone else in the sims, players without sims are left out).
+
+    Args:
+        names (pd.Series): lineup names (e.g. "Player A-P, Player B-P, ...").
+        players (pd.Index): players making up the columns of the matrix.
+
+    Returns:
+        np.ndarray: incidence matrix with a row for each lineup and a column for each player.
+    """
+    members = names.str.replace('-A-CPT','-P').str.replace('-CPT','-P').str[:-2].str.split('-P, ')
+    members = members.explode()
+    cols = players.get_indexer(members.values)
+    found = cols >= 0
+    incidence = np.zeros((names.shape[0], players.shape[0]))
+    rows = np.repeat(np.arange(names.shape[0]), names.str.count(', ').values + 1)
+    incidence[rows[found], cols[found]] = 1.0
+    return incidence
+
+
+def lineup_scores(names: pd.Series, sims: pd.DataFrame) -> np.ndarray:
+    """
+    Simulated points of each lineup in every simulation (lineup incidence x player sims).
+
+    Args:
+        names (pd.Series): lineup names (e.g. "Player A-P, Player B-P, ...").
+        sims (pd.DataFrame): simulated fantasy points for each player (players x sims).
+
+    Returns:
+        np.ndarray: simulated points of each lineup (lineups x sims).
+    """
+    scores = lineup_matrix(names.reset_index(drop=True), sims.index) @ sims.values
+    return scores.round(6) # Keeping floating point noise from breaking up ties
+
+
+def field_scores(names: pd.Series, draws: np.ndarray, sims: pd.DataFrame, chunk_size: int = 20000000) -> np.ndarray:
+    """
+    Simulated points of a sampled field, where each entry can be a different lineup in every simulation
+    (the same incidence x player sims product, only for the lineup actually drawn in each simulation).
+
+    Args:
+        names (pd.Series): names of every possible lineup.
+        draws (np.ndarray): positional index of the lineup drawn for each entry in each simulation (entries x sims).
+        sims (pd.DataFrame): simulated fantasy points for each player (players x sims).
+        chunk_size (int, optional): most entry/simulation/player cells to work on at once. Defaults to 20000000.
+
+    Returns:
+        np.ndarray: simulated points of each field entry (entries x sims).
+    """
+    points = sims.values.T
+    drawn, draws = np.unique(draws, return_inverse=True)
+    draws = draws.reshape(-1, points.shape[0])
+    incidence = lineup_matrix(names.iloc[drawn].reset_index(drop=True), sims.index)
+    scores = np.zeros(draws.shape)
+    step = max(1, chunk_size // max(1, draws.shape[0] * points.shape[1]))
+    for start in range(0, points.shape[0], step):
+        scores[:, start:start + step] = np.einsum('esp,sp->es', incidence[draws[:, start:start + step]], points[start:start + step])
+    return scores.round(6)
+
+
+def count_ranks(contest: np.ndarray, scores: np.ndarray) -> tuple:
+    """
+    Counts how many contest entries finish ahead of and level with each score in every simulation at once,
+    searching each simulation's sorted contest scores (simulations laid end to end in one sorted vector).
+
+    Args:
+        contest (np.ndarray): simulated points of the contest entries (entries x sims).
+        scores (np.ndarray): simulated points to place against them (any number of leading dimensions x sims).
+
+    Returns:
+        tuple: number of contest entries with more points, number of contest entries with the same points.
+    """
+    num_entries, num_sims = contest.shape
+    low = min(contest.min(), scores.min()) if contest.size > 0 and scores.size > 0 else 0.0
+    high = max(contest.max(), scores.max()) if contest.size > 0 and scores.size > 0 else 0.0
+    offsets = np.arange(num_sims) * (high - low + 1.0)
+    flat = (np.sort(contest, axis=0) - low + offsets[None, :]).T.ravel()
+    queries = scores - low + offsets
+    base = np.arange(num_sims) * num_entries
+    above = np.searchsorted(flat, queries, side='right') - base
+    below = np.searchsorted(flat, queries, side='left') - base
+    return num_entries - above, above - below
+
+
+def split_payouts(ahead: np.ndarray, tied: np.ndarray, payouts: np.ndarray) -> np.ndarray:
+    """
+    Pays each entry the average of the finishing spots it shares with any ties.
+
+    Args:
+        ahead (np.ndarray): number of entries finishing ahead.
+        tied (np.ndarray): number of entries tied, including itself.
+        payouts (np.ndarray): payout for each finishing spot.
+
+    Returns:
+        np.ndarray: payout of each entry.
+    """
+    cumulative = np.concatenate([[0.0], np.cumsum(payouts)])
+    first = np.clip(ahead, 0, payouts.shape[0])
+    last = np.clip(ahead + tied, 0, payouts.shape[0])
+    return (cumulative[last] - cumulative[first]) / np.maximum(tied, 1)
+
+
+def simulate_contest(teams, matchups, contest_type, num_sims=1000, major=False, verbose=False):
+    num_entries, max_entries, entry_fee, payouts = contest_details(contest_type)
     if 'my_entries' not in teams.columns:
         teams['my_entries'] = 0.0
-    sims = teams.sample(n=int((num_entries - teams.my_entries.sum())*num_sims),replace=True,weights="Probability",ignore_index=True)
     my_entries = teams.loc[teams.my_entries > 0].reset_index(drop=True)
+    num_field = int(num_entries - teams.my_entries.sum())
     if my_entries.my_entries.sum() > max_entries:
         print("Too many entries for this contest!!! Only using the first {}...".format(max_entries))
         while my_entries.my_entries.sum() > max_entries:
             my_entries.loc[my_entries.shape[0] - 1,'my_entries'] -= 1
             my_entries = my_entries.loc[my_entries.my_entries > 0].reset_index(drop=True)
-    for ind in range(my_entries.shape[0]):
-        this_entry = pd.concat(int(my_entries.iloc[ind]['my_entries']*num_sims)*[my_entries.iloc[ind:ind + 1]],ignore_index=True)
-        sims = pd.concat([sims,this_entry],ignore_index=True)
-    sims['num_sim'] = sims.index%num_sims
-    sims['num_entry'] = sims.index//num_sims
-    sims.Name = sims.Name.str.replace('-A-CPT','-P').str.replace('-CPT','-P')
-    sims.Name = sims.Name.str[:-2].str.split('-P, ')
-    sims = sims.explode('Name',ignore_index=True)
-    sim_matches = simulate_points(matchups, num_sims, major, verbose)
-    sims = pd.merge(left=sims,right=sim_matches[['num_sim','Name','DKFP_sim']],how='inner',on=['num_sim','Name'])
-    sims = sims.groupby(['num_sim','num_entry']).DKFP_sim.sum().reset_index()
+    weights = teams.Probability.astype(float).fillna(0.0).values
+    field = np.random.choice(teams.shape[0], size=(num_field, num_sims), p=weights/weights.sum())
+    mine = my_entries.index.repeat(my_entries.my_entries.astype(int))
+
+    sims = player_sims(matchups, num_sims, major, verbose)
+    scores = np.concatenate([field_scores(teams.Name, field, sims), lineup_scores(my_entries.Name.iloc[mine], sims)])
+
+    ahead, tied = count_ranks(scores, scores)
+    spots = np.empty(scores.shape, dtype=int)
+    np.put_along_axis(spots, np.argsort(-scores, axis=0, kind='stable'), np.arange(scores.shape[0])[:, None], axis=0)
+    sims = pd.DataFrame({'num_sim':np.tile(np.arange(num_sims), scores.shape[0]),
+                         'num_entry':np.repeat(np.arange(scores.shape[0]), num_sims),
+                         'DKFP_sim':scores.ravel(),
+                         'ranking':(ahead + 1).ravel().astype(float),
+                         'projected_payout':payouts[spots].ravel(),
+                         'actual_payout':split_payouts(ahead, tied, payouts).ravel()})
     sims = sims.sort_values(by=['num_sim','DKFP_sim'],ascending=[True,False],ignore_index=True)
-    sims['ranking'] = sims.groupby(['num_sim']).DKFP_sim.rank(ascending=False,method='min')
-    sims['projected_payout'] = payouts*num_sims
-    payouts = sims.groupby(['num_sim','DKFP_sim']).projected_payout.mean()\
-    .reset_index().rename(columns={'projected_payout':'actual_payout'})
-    sims = pd.merge(left=sims,right=payouts,how='inner',on=['num_sim','DKFP_sim'])
-    sims['my_entry'] = sims.num_entry >= num_entries - teams.my_entries.sum()
+    sims['my_entry'] = sims.num_entry >= num_field
     sims['entry_fee'] = entry_fee
     return sims
 
 
-def best_lineups(teams, matchups, contest_type, limit=5, num_sims=1000, major=False, verbose=False, shortslate=False):
+def marginal_payouts(candidates: np.ndarray, cand_ahead: np.ndarray, cand_tied: np.ndarray, existing: np.ndarray, \
+ahead: np.ndarray, tied: np.ndarray, payouts: np.ndarray) -> tuple:
+    """
+    Extra payout my entries collect in every simulation from adding each candidate lineup, including what the candidate
+    costs my existing entries when it passes or ties them.
+
+    Args:
+        candidates (np.ndarray): simulated points of each candidate lineup (candidates x sims).
+        cand_ahead (np.ndarray): number of field entries finishing ahead of each candidate (candidates x sims).
+        cand_tied (np.ndarray): number of field entries tied with each candidate (candidates x sims).
+        existing (np.ndarray): simulated points of my existing entries (entries x sims).
+        ahead (np.ndarray): number of contest entries finishing ahead of each existing entry (entries x sims).
+        tied (np.ndarray): number of contest entries tied with each existing entry, including itself (entries x sims).
+        payouts (np.ndarray): payout for each finishing spot.
+
+    Returns:
+        tuple: extra payout from each candidate, number of contest entries finishing ahead of each candidate (both candidates x sims).
+    """
+    num_sims = candidates.shape[1]
+    above, level = count_ranks(existing, candidates)
+    own = split_payouts(cand_ahead + above, cand_tied + level + 1, payouts)
+    if existing.shape[0] == 0:
+        return own, cand_ahead + above
+    # What each existing entry loses by dropping a spot or sharing one, summed from the bottom up in every simulation
+    current = split_payouts(ahead, tied, payouts)
+    order = np.argsort(existing, axis=0)
+    passed = np.take_along_axis(split_payouts(ahead + 1, tied, payouts) - current, order, axis=0)
+    shared = np.take_along_axis(split_payouts(ahead, tied + 1, payouts) - current, order, axis=0)
+    passed = np.concatenate([np.zeros((1, num_sims)), np.cumsum(passed, axis=0)])
+    shared = np.concatenate([np.zeros((1, num_sims)), np.cumsum(shared, axis=0)])
+    below = existing.shape[0] - above - level
+    sims = np.arange(num_sims)
+    return own + passed[below, sims] + shared[below + level, sims] - shared[below, sims], cand_ahead + above
+
+
+def profit_stats(total: np.ndarray, first: np.ndarray, cost: float) -> dict:
+    """
+    Summarizes simulated portfolio payouts into the profit columns reported for each lineup.
+
+    Args:
+        total (np.ndarray): total payout of my entries in every simulation (sims in the last dimension).
+        first (np.ndarray): whether one of my entries finished first in every simulation.
+        cost (float): total entry fees paid.
+
+    Returns:
+        dict: profit, profit_stdev, profit_fano, gain_prob, push_prob, loss_prob, zero_prob, and win_prob.
+    """
+    profit = total - cost
+    return {'profit':profit.mean(axis=-1),
+            'profit_stdev':profit.std(axis=-1, ddof=1),
+            'profit_fano':profit.std(axis=-1, ddof=1)/profit.mean(axis=-1),
+            'gain_prob':(profit > 0.0).mean(axis=-1),
+            'push_prob':(profit == 0.0).mean(axis=-1),
+            'loss_prob':(profit < 0.0).mean(axis=-1),
+            'zero_prob':(total == 0).mean(axis=-1),
+            'win_prob':first.mean(axis=-1)}
+
+
+def best_lineups(teams, matchups, contest_type, limit=5, num_sims=1000, major=False, verbose=False, shortslate=False, \
+num_candidates=1000, seed=None):
     if 'my_entries' not in teams.columns:
         teams['my_entries'] = 0.0
     teams[['profit','profit_stdev','profit_fano','gain_prob','push_prob','loss_prob','zero_prob','win_prob']] = None
-    cpt_inds = teams.groupby('captain').head(limit).index.tolist()[:50]
-    for ind in cpt_inds:
-        teams.loc[ind,'my_entries'] += 1.0
-        contest_sims = simulate_contest(teams, matchups, contest_type, num_sims=num_sims, major=False)
-        payouts = contest_sims.loc[contest_sims.my_entry].groupby('num_sim')[['actual_payout','entry_fee']].sum().reset_index()
-        payouts['profit'] = payouts['actual_payout'] - payouts['entry_fee']
-        teams.loc[ind,'profit'] = payouts.profit.mean()
-        teams.loc[ind,'profit_stdev'] = payouts.profit.std()
-        teams.loc[ind,'profit_fano'] = payouts.profit.std()/payouts.profit.mean()
-        teams.loc[ind,'gain_prob'] = payouts.loc[payouts.profit > 0.0].shape[0]/num_sims
-        teams.loc[ind,'push_prob'] = payouts.loc[payouts.profit == 0.0].shape[0]/num_sims
-        teams.loc[ind,'loss_prob'] = payouts.loc[payouts.profit < 0.0].shape[0]/num_sims
-        teams.loc[ind,'zero_prob'] = payouts.loc[payouts.actual_payout == 0].shape[0]/num_sims
-        teams.loc[ind,'win_prob'] = contest_sims.loc[(contest_sims.ranking == 1) & contest_sims.my_entry,'num_sim'].nunique()/num_sims
-        teams.loc[ind,'my_entries'] -= 1.0
-        if verbose:
-            print("{} out of {}, {}".format((~teams.win_prob.isnull()).sum(),len(cpt_inds),datetime.datetime.now()))
+    num_entries, max_entries, entry_fee, payouts = contest_details(contest_type)
+    cpt_inds = teams.groupby('captain').head(limit).index.tolist()[:num_candidates]
+    mine = teams.loc[teams.my_entries > 0].index.repeat(teams.loc[teams.my_entries > 0,'my_entries'].astype(int))
+    num_field = int(num_entries - teams.my_entries.sum() - 1)
+    if mine.shape[0] + 1 > max_entries:
+        print("Too many entries for this contest!!! Only using the first {}...".format(max_entries))
+        mine = mine[:max_entries - 1]
+
+    # Same seed = same player sims and field (common random numbers) from one call to the next
+    if seed is not None:
+        np.random.seed(seed)
+    sims = player_sims(matchups, num_sims, major, verbose)
+    weights = teams.Probability.astype(float).fillna(0.0).values
+    field = field_scores(teams.Name, np.random.choice(teams.shape[0], size=(num_field, num_sims), p=weights/weights.sum()), sims)
+    candidates = lineup_scores(teams.Name.loc[cpt_inds], sims)
+    existing = lineup_scores(teams.Name.loc[mine], sims)
+    ahead, tied = count_ranks(np.concatenate([field, existing]), existing)
+    gain, cand_ahead = marginal_payouts(candidates, *count_ranks(field, candidates), existing, ahead, tied, payouts)
+    total = split_payouts(ahead, tied, payouts).sum(axis=0) + gain
+    first = (cand_ahead == 0) | (ahead == 0).any(axis=0)
+    for col, vals in profit_stats(total, first, entry_fee*(mine.shape[0] + 1)).items():
+        teams.loc[cpt_inds,col] = vals
+    if verbose:
+        print("{} candidates scored, {}".format(len(cpt_inds),datetime.datetime.now()))
     return teams
 
 
-def best_combos(teams, matchups, contest_type, limit=5, num_sims=1000, major=False, verbose=False):
+def best_combos(teams, matchups, contest_type, limit=5, num_sims=1000, major=False, verbose=False, \
+num_candidates=1000, seed=None):
+    if 'my_entries' not in teams.columns:
+        teams['my_entries'] = 0.0
+    num_entries, max_entries, entry_fee, payouts = contest_details(contest_type)
+    cpt_inds = teams.groupby('captain').head(5).index.tolist()[:num_candidates]
+    mine = teams.loc[teams.my_entries > 0].index.repeat(teams.loc[teams.my_entries > 0,'my_entries'].astype(int))
+    if mine.shape[0] + limit > max_entries:
+        print("Too many entries for this contest!!! Only using the first {}...".format(max_entries))
+        mine = mine[:max_entries]
+        limit = max_entries - mine.shape[0]
+
+    # One set of sims for the whole portfolio, largest field up front and trimmed as entries are added
+    if seed is not None:
+        np.random.seed(seed)
+    sims = player_sims(matchups, num_sims, major, verbose)
+    weights = teams.Probability.astype(float).fillna(0.0).values
+    num_field = int(num_entries - mine.shape[0] - 1)
+    field = field_scores(teams.Name, np.random.choice(teams.shape[0], size=(num_field, num_sims), p=weights/weights.sum()), sims)
+    candidates = lineup_scores(teams.Name.loc[cpt_inds], sims)
+    existing = lineup_scores(teams.Name.loc[mine], sims)
+    ahead, tied = count_ranks(np.concatenate([field, existing]), existing)
+    cand_ahead, cand_tied = count_ranks(field, candidates)
+    first = (ahead == 0).any(axis=0)
+    counts = teams.my_entries.copy()
     best = pd.DataFrame()
     for num_entry in range(limit):
         print('Simulating {} entr'.format(num_entry + 1) + ('ies' if num_entry > 0 else 'y'))
-        teams = best_lineups(teams, matchups, contest_type, num_sims=num_sims, major=major, verbose=verbose)
-        teams = teams.sort_values(by='profit',ascending=False).reset_index(drop=True)
+        if num_entry > 0:
+            # Each added entry takes a spot away from the field
+            num_field -= 1
+            ahead -= field[num_field] > existing
+            tied -= field[num_field] == existing
+            cand_ahead -= field[num_field] > candidates
+            cand_tied -= field[num_field] == candidates
+        gain, new_ahead = marginal_payouts(candidates, cand_ahead, cand_tied, existing, ahead, tied, payouts)
+        gain += split_payouts(ahead, tied, payouts).sum(axis=0)
+        pick = (gain.mean(axis=1) - entry_fee*(existing.shape[0] + 1)).argmax()
+        choice = candidates[pick]
+        first |= new_ahead[pick] == 0
+        entry = teams.loc[[cpt_inds[pick]]].copy()
+        entry['my_entries'] = counts[cpt_inds[pick]]
+        for col, vals in profit_stats(gain[pick], first, entry_fee*(existing.shape[0] + 1)).items():
+            entry[col] = vals
         if verbose:
-            print(teams.iloc[0].Name)
-            print(teams.iloc[0])
-        best = pd.concat([best,teams.iloc[:1]],ignore_index=True,sort=False)
-        teams.loc[0,'my_entries'] += 1
+            print(entry.iloc[0].Name)
+            print(entry.iloc[0])
+        best = pd.concat([best,entry],ignore_index=True,sort=False)
+        counts[cpt_inds[pick]] += 1
+
+        # Fold the pick into the portfolio state
+        new_tied = cand_tied[pick] + (existing == choice).sum(axis=0) + 1
+        ahead += choice > existing
+        tied += choice == existing
+        ahead = np.concatenate([ahead, new_ahead[pick][None, :]])
+        tied = np.concatenate([tied, new_tied[None, :]])
+        existing = np.concatenate([existing, choice[None, :]])
     return best
 
 
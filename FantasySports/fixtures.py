@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*-coding:utf-8 -*-
+"""
+@File    :   fixtures.py
+@Time    :   2026/10/19 14:10:00
+@Author  :   Taylor Firman
+@Version :   1.0
+@Contact :   tefirman@gmail.com
+@Desc    :   Recording and replaying of scraped pages (Sports Reference, ESPN, Wikipedia)
+so that crawls and parser benchmarks can run offline without rate limits.
+"""
+
+import os
+import requests
+import optparse
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from functools import partial
+
+fixture_url = os.environ.get("FANTASYSPORTS_FIXTURE_URL")
+"""Root URL of a fixture server standing in for the live sites (set via the FANTASYSPORTS_FIXTURE_URL environment variable, e.g. http://localhost:8000/)."""
+
+record_dir = os.environ.get("FANTASYSPORTS_RECORD")
+"""Fixture corpus to record every live response into (set via the FANTASYSPORTS_RECORD environment variable)."""
+
+
+def fixture_path(url: str, corpus: str = "fixtures"):
+    """
+    Identifies where the specified page lives in a fixture corpus,
+    which mirrors the original host and URL path (e.g. fixtures/www.pro-football-reference.com/years/2023/games.htm).
+
+    Args:
+        url (str): original URL of the page.  
+        corpus (str, optional): directory of the fixture corpus, defaults to "fixtures".
+
+    Returns:
+        str: location of the page within the fixture corpus.
+    """
+    parts = urlsplit(url)
+    path = parts.path.lstrip("/")
+    if path == "" or path.endswith("/"):
+        path += "index.html"
+    if parts.query:
+        path += "?" + parts.query
+    return os.path.join(corpus, parts.netloc, *path.split("/"))
+
+
+def resolve_url(url: str):
+    """
+    Points the specified URL at the fixture server when one is configured.
+
+    Args:
+        url (str): original URL of the page.
+
+    Returns:
+        str: URL to actually request.
+    """
+    if not fixture_url:
+        return url
+    parts = urlsplit(url)
+    return fixture_url.rstrip("/") + "/" + parts.netloc + parts.path + ("?" + parts.query if parts.query else "")
+
+
+def record(url: str, content: bytes, corpus: str = None):
+    """
+    Saves a live response into the fixture corpus.
+
+    Args:
+        url (str): original URL of the page.  
+        content (bytes): raw body of the response.  
+        corpus (str, optional): directory of the fixture corpus, defaults to None (record_dir).
+    """
+    path = fixture_path(url, corpus if corpus else record_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as out_file:
+        out_file.write(content)
+    os.replace(path + ".tmp", path)
+
+
+def get(url: str, session: requests.Session = None, **kwargs):
+    """
+    Requests the specified URL, routing through the fixture server when one is configured
+    and recording the response when recording is enabled.
+
+    Args:
+        url (str): original URL of the page.  
+        session (requests.Session, optional): session to make the request with, defaults to None (plain requests).  
+        kwargs: additional arguments passed along to the request.
+
+    Returns:
+        requests.Response: response from the live site or fixture server.
+    """
+    response = (session if session else requests).get(resolve_url(url), **kwargs)
+    if record_dir and not fixture_url and response.ok:
+        record(url, response.content)
+    return response
+
+
+def offline():
+    """
+    Whether requests are being served by the fixture server, in which case rate limit delays can be skipped.
+
+    Returns:
+        bool: whether a fixture server is configured.
+    """
+    return bool(fixture_url)
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    Request handler that serves recorded pages at their original URL paths
+    (prefixed by the original host) and keeps quiet about each request.
+    """
+
+    def translate_path(self, path: str):
+        """
+        Maps the requested path onto the fixture corpus, query string included.
+
+        Args:
+            path (str): requested path (e.g. /www.pro-football-reference.com/years/2023/games.htm).
+
+        Returns:
+            str: location of the recorded page within the fixture corpus.
+        """
+        host, _, rest = path.lstrip("/").partition("/")
+        return fixture_path("http://" + host + "/" + rest, self.directory)
+
+    def guess_type(self, path: str):
+        """
+        Serves every recorded page as html unless its extension says otherwise.
+        """
+        content_type = super().guess_type(path)
+        return "text/html" if content_type == "application/octet-stream" else content_type
+
+    def log_message(self, format: str, *args):
+        pass
+
+
+def serve(corpus: str = "fixtures", port: int = 8000):
+    """
+    Serves the fixture corpus over HTTP until interrupted.
+
+    Args:
+        corpus (str, optional): directory of the fixture corpus, defaults to "fixtures".  
+        port (int, optional): port to serve on, defaults to 8000.
+    """
+    server = ThreadingHTTPServer(("localhost", port), partial(FixtureHandler, directory=corpus))
+    print("Serving {} at http://localhost:{}/".format(corpus, port))
+    print("export FANTASYSPORTS_FIXTURE_URL=http://localhost:{}/".format(port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option(
+        "--corpus",
+        action="store",
+        dest="corpus",
+        default="fixtures",
+        help="directory of the fixture corpus to serve",
+    )
+    parser.add_option(
+        "--port",
+        action="store",
+        type="int",
+        dest="port",
+        default=8000,
+        help="port to serve the fixture corpus on",
+    )
+    options = parser.parse_args()[0]
+    serve(options.corpus, options.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*-coding:utf-8 -*-
+"""
+@File    :   resources.py
+@Time    :   2026/10/19 13:30:00
+@Author  :   Taylor Firman
+@Version :   1.0
+@Contact :   tefirman@gmail.com
+@Desc    :   Resolver for the reference files in res/ (name corrections, team abbreviations, scoring, etc.),
+serving local copies instead of pulling them from GitHub on every run.
+"""
+
+import os
+import importlib.resources
+import requests
+import pandas as pd
+
+res_url = "https://raw.githubusercontent.com/tefirman/FantasySports/main/res/"
+"""Remote location of the res/ directory, used when refreshing files or when no local copy exists."""
+
+override_dir = os.environ.get("FANTASYSPORTS_RES")
+"""Local directory whose files take precedence over the packaged ones (set via the FANTASYSPORTS_RES environment variable)."""
+
+refresh_remote = os.environ.get("FANTASYSPORTS_RES_REFRESH", "").lower() in ["1", "true", "yes"]
+"""Whether to pull the latest version of each file from GitHub before using it (set via the FANTASYSPORTS_RES_REFRESH environment variable)."""
+
+repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "res")
+"""Location of res/ when running from a checkout of the repository."""
+
+
+def search_dirs():
+    """
+    Lists the directories searched for reference files, in order of precedence:
+    the override directory, res/ in the current directory, res/ in the repository checkout,
+    and res/ as installed alongside the package.
+
+    Returns:
+        list: directories to search for reference files.
+    """
+    dirs = [override_dir, "res", repo_dir]
+    try:
+        dirs.append(os.fspath(importlib.resources.files("FantasySports") / "res"))
+    except (ModuleNotFoundError, TypeError):
+        pass
+    return [res_dir for res_dir in dirs if res_dir]
+
+
+def resource_path(name: str):
+    """
+    Identifies the local copy of the specified reference file.
+
+    Args:
+        name (str): location of the file relative to res/ (e.g. "football/team_abbrevs.csv").
+
+    Returns:
+        str: path to the local copy of the file, None if there isn't one.
+    """
+    for res_dir in search_dirs():
+        path = os.path.join(res_dir, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def refresh_resource(name: str, directory: str = None):
+    """
+    Pulls the latest version of the specified reference file from GitHub and saves it locally.
+
+    Args:
+        name (str): location of the file relative to res/ (e.g. "football/team_abbrevs.csv").  
+        directory (str, optional): where to save the file, defaults to None (override directory if set, otherwise res/ in the current directory).
+
+    Returns:
+        str: path to the refreshed local copy of the file.
+    """
+    if directory is None:
+        directory = override_dir if override_dir else "res"
+    response = requests.get(res_url + name)
+    response.raise_for_status()
+    path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as out_file:
+        out_file.write(response.content)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def read_csv(name: str, refresh: bool = None, **kwargs):
+    """
+    Loads the specified reference csv from its local copy,
+    only reaching out to GitHub when asked to refresh or when no local copy exists.
+
+    Args:
+        name (str): location of the file relative to res/ (e.g. "football/team_abbrevs.csv").  
+        refresh (bool, optional): whether to pull the latest version from GitHub first, defaults to None (refresh_remote).  
+        kwargs: additional arguments passed along to pd.read_csv.
+
+    Returns:
+        pd.DataFrame: dataframe containing the contents of the reference csv.
+    """
+    if refresh is None:
+        refresh = refresh_remote
+    path = None if refresh else resource_path(name)
+    if path is None:
+        path = refresh_resource(name)
+    return pd.read_csv(path, **kwargs)
@@ -13,6 +13,7 @@ import requests
 from bs4 import BeautifulSoup
 import time
 import pandas as pd
+import fixtures
 
 base_url = "https://www.baseball-reference.com/"
 
@@ -29,8 +30,9 @@ def get_page(endpoint: str):
     Returns:
         str: raw html of the specified endpoint.
     """
-    time.sleep(4)
-    response = requests.get(base_url + endpoint).text
+    if not fixtures.offline():
+        time.sleep(4)
+    response = fixtures.get(base_url + endpoint).text
     uncommented = response.replace("<!--", "").replace("-->", "")
     soup = BeautifulSoup(uncommented, "html.parser")
     return soup
@@ -16,36 +16,72 @@ import numpy as np
 import pandas as pd
 import os
 import datetime
-from geopy.distance import geodesic
 from io import StringIO
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import shutil
 import gzip
 import sys
+import uuid
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import resources
+import fixtures
 
 base_url = "https://www.pro-football-reference.com/"
 """Base URL for Pro Football Reference used in all page requests."""
 
-def get_page(endpoint: str):
+request_interval = 4.0
+"""Minimum number of seconds between requests to Pro Football Reference (exceeding 20 requests per minute triggers a 1hr jailtime)."""
+
+request_lock = threading.Lock()
+"""Lock shared by every thread making requests to Pro Football Reference so that request_interval is respected globally."""
+
+last_request = [0.0]
+"""Monotonic timestamp of the most recent request to Pro Football Reference."""
+
+
+def get_html(endpoint: str):
     """
     Pulls down the raw html for the specified endpoint of Pro Football Reference
-    and adds an additional four second delay to avoid triggering the 1hr jailtime
-    for exceeding 20 requests per minute.
+    and waits until at least four seconds have passed since the previous request 
+    (across all threads) to avoid triggering the 1hr jailtime for exceeding 20 requests per minute. 
+    Commented-out tables are uncommented so they can be parsed like any other table.
 
     Args:
         endpoint (str): relative location of the page to pull down.
 
     Returns:
-        bs4.BeautifulSoup: parsed html of the specified endpoint.
+        str: raw html of the specified endpoint.
     """
-    time.sleep(4)
+    if not fixtures.offline():
+        with request_lock:
+            time.sleep(max(last_request[0] + request_interval - time.monotonic(), 0))
+            last_request[0] = time.monotonic()
     try:
-        response = requests.get(base_url + endpoint).text
+        response = fixtures.get(base_url + endpoint).text
     except requests.exceptions.ConnectionError as e:
         print('GETTING CONNECTION ERROR AGAIN!!!')
         print(endpoint)
         sys.exit(1)
     uncommented = response.replace("<!--", "").replace("-->", "")
-    soup = BeautifulSoup(uncommented, "html.parser")
+    return uncommented
+
+
+def get_page(endpoint: str):
+    """
+    Pulls down the raw html for the specified endpoint of Pro Football Reference
+    (see get_html) and parses it into a BeautifulSoup object.
+
+    Args:
+        endpoint (str): relative location of the page to pull down.
+
+    Returns:
+        bs4.BeautifulSoup: parsed html of the specified endpoint.
+    """
+    soup = BeautifulSoup(get_html(endpoint), "html.parser")
     return soup
 
 
@@ -98,7 +134,7 @@ def get_intl_games():
     Returns:
         pd.DataFrame: dataframe containing dates, teams, and scores for each matchup.
     """
-    response = requests.get(
+    response = fixtures.get(
         "https://en.wikipedia.org/wiki/NFL_International_Series"
     ).text
     soup = BeautifulSoup(response, "html.parser")
@@ -113,68 +149,126 @@ def get_intl_games():
     return intl_games[["game_date", "team1", "team2", "Stadium"]]
 
 
-def get_depth_chart(team_abbrev: str):
+espn_session = requests.Session()
+espn_session.headers.update({"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"})
+"""Shared HTTP session for ESPN requests (a browser user agent keeps CloudFront from rejecting them)."""
+
+
+def get_depth_chart_html(team_abbrev: str, cache: str = "DepthChartCache"):
     """
-    Pulls the team depth chart directly from ESPN based on the team abbreviation provided.
+    Pulls down the raw html of the team depth chart from ESPN, 
+    reusing the copy pulled earlier in the day if there is one.
 
     Args:
-        team_abbrev (str): ESPN abbreviation for the team of interest.
+        team_abbrev (str): ESPN abbreviation for the team of interest.  
+        cache (str, optional): directory of daily depth chart pages, defaults to "DepthChartCache" (None disables caching).
 
     Returns:
-        pd.DataFrame: dataframe containing the depth chart ranking for each player on the team of interest.
+        str: raw html of the team depth chart.
+    """
+    if cache:
+        day = os.path.join(cache, datetime.date.today().isoformat())
+        html_path = os.path.join(day, team_abbrev + ".html.gz")
+        if os.path.exists(html_path):
+            with gzip.open(html_path, "rt", encoding="utf-8") as f:
+                return f.read()
+    response = fixtures.get("https://www.espn.com/nfl/team/depth/_/name/{}".format(team_abbrev), espn_session, timeout=30)
+    response.raise_for_status()
+    if cache:
+        os.makedirs(day, exist_ok=True)
+        with gzip.open(html_path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write(response.text)
+        os.replace(html_path + ".tmp", html_path)
+    return response.text
+
+
+def parse_depth_chart(response: str, corrections: pd.DataFrame = None):
+    """
+    Parses the raw html of an ESPN team depth chart into depth chart rankings for each player.
+
+    Args:
+        response (str): raw html of the team depth chart.  
+        corrections (pd.DataFrame, optional): name corrections to apply, defaults to None (loads res/football/name_corrections.csv).
+
+    Returns:
+        pd.DataFrame: dataframe containing the depth chart ranking for each player on the team.
     """
-    os.system("wget https://www.espn.com/nfl/team/depth/_/name/{} -q -O {}.html".format(team_abbrev,team_abbrev))
-    tempData = open(team_abbrev + ".html","r")
-    response = tempData.read()
-    tempData.close()
-    os.remove(team_abbrev + ".html")
-    # Not working for some reason, some sort of CloudFront traffic error
-    # response = requests.get("https://www.espn.com/nfl/team/depth/_/name/{}".format(team_abbrev)).text
     soup = BeautifulSoup(response, "html.parser")
     tables = soup.find_all('table')
-    depth = pd.DataFrame()
+    rows = []
     for table_ind in range(len(tables)//2):
         positions = [pos.text.strip() for pos in tables[table_ind*2].find_all('td')]
         players = [player.text.strip() for player in tables[table_ind*2 + 1].find_all('td')]
         num_strings = len(players)//len(positions)
         for pos in range(len(positions)):
             for string in range(num_strings):
-                depth = pd.concat([depth,pd.DataFrame({'player':[players[pos*num_strings + string]],\
-                'pos':[positions[pos]],'string':[string + 1]})],ignore_index=True)
-    depth.loc[depth.pos.isin(['PK']),'pos'] = 'K'
-    depth = depth.loc[depth.player != '-'].reset_index(drop=True)
-    for status in ['P','Q','O','PUP','SUSP','IR']:
-        injured = depth.player.str.endswith(' ' + status)
-        depth.loc[injured,'status'] = status
-        depth.loc[injured,'player'] = depth.loc[injured,'player'].str.split(' ').str[:-1].apply(' '.join)
-    injured = depth.loc[depth.status.isin(['O','PUP','SUSP','IR'])].reset_index(drop=True)
-    injured.string = float('inf')
-    depth = pd.concat([depth.loc[~depth.status.isin(['O','PUP','SUSP','IR'])],injured],ignore_index=True)
+                player = players[pos*num_strings + string]
+                if player == '-':
+                    continue
+                status = None
+                for injury in ['P','Q','O','PUP','SUSP','IR']:
+                    if player.endswith(' ' + injury):
+                        status = injury
+                        player = ' '.join(player.split(' ')[:-1])
+                        break
+                # Players who are out get pushed to the bottom of the depth chart
+                out = status in ['O','PUP','SUSP','IR']
+                rows.append({'player':player,'pos':'K' if positions[pos] == 'PK' else positions[pos],\
+                'string':float('inf') if out else string + 1,'out':out})
+    depth = pd.DataFrame(rows,columns=['player','pos','string','out'])
+    depth = depth.sort_values(by='out',kind='stable',ignore_index=True)
     depth['string'] = depth.groupby('pos').string.rank(method='first')
     wrs = depth.pos == 'WR'
     depth.loc[wrs,'string'] = 1 + (depth.loc[wrs,'string'] - 1)/3
-    corrections = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/name_corrections.csv")
+    if corrections is None:
+        corrections = resources.read_csv("football/name_corrections.csv")
     depth = pd.merge(left=depth, right=corrections.rename(columns={'name':'player'}), how="left", on="player")
     to_fix = ~depth.new_name.isnull()
     depth.loc[to_fix, "player"] = depth.loc[to_fix, "new_name"]
-    del depth['new_name'], depth['status']
+    del depth['new_name'], depth['out']
     depth = depth.sort_values(by=["pos","string"],ignore_index=True)
     return depth
 
 
-def get_all_depth_charts():
+def get_depth_chart(team_abbrev: str, cache: str = "DepthChartCache", corrections: pd.DataFrame = None):
+    """
+    Pulls the team depth chart directly from ESPN based on the team abbreviation provided.
+
+    Args:
+        team_abbrev (str): ESPN abbreviation for the team of interest.  
+        cache (str, optional): directory of daily depth chart pages, defaults to "DepthChartCache" (None disables caching).  
+        corrections (pd.DataFrame, optional): name corrections to apply, defaults to None (loads res/football/name_corrections.csv).
+
+    Returns:
+        pd.DataFrame: dataframe containing the depth chart ranking for each player on the team of interest.
+    """
+    return parse_depth_chart(get_depth_chart_html(team_abbrev, cache), corrections)
+
+
+def get_all_depth_charts(cache: str = "DepthChartCache", workers: int = 4):
     """
-    Pulls all ESPN depth charts across the NFL.
+    Pulls all ESPN depth charts across the NFL, a handful of teams at a time.
+    Pages pulled earlier in the day are reused and older pages are cleared out.
+
+    Args:
+        cache (str, optional): directory of daily depth chart pages, defaults to "DepthChartCache" (None disables caching).  
+        workers (int, optional): maximum number of depth charts to pull at once, defaults to 4.
 
     Returns:
         pd.DataFrame: dataframe containing the depth chart ranking for each player in the NFL.
     """
-    teams = pd.read_csv("https://raw.githubusercontent.com/tefirman/FantasySports/main/res/football/team_abbrevs.csv")
+    teams = resources.read_csv("football/team_abbrevs.csv")
     teams['espn'] = teams.fivethirtyeight.str.replace('OAK','LV')
-    depths = pd.DataFrame(columns=['team'])
-    for ind in range(teams.shape[0]):
-        depths = pd.concat([depths,get_depth_chart(teams.loc[ind,'espn'])],ignore_index=True)
-        depths.team = depths.team.fillna(teams.loc[ind,'real_abbrev'])
+    corrections = resources.read_csv("football/name_corrections.csv")
+    if cache and os.path.exists(cache):
+        for day in os.listdir(cache):
+            if day != datetime.date.today().isoformat():
+                shutil.rmtree(os.path.join(cache, day), ignore_errors=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        depths = list(pool.map(lambda abbrev: get_depth_chart(abbrev, cache, corrections), teams.espn))
+    for depth, team in zip(depths, teams.real_abbrev):
+        depth.insert(0, 'team', team)
+    depths = pd.concat(depths, ignore_index=True)
     return depths
 
 
@@ -268,59 +362,256 @@ def get_address(stadium_id: str):
     return address
 
 
-def download_zip_codes(url: str = "https://nominatim.org/data/us_postcodes.csv.gz"):
+def download_zip_codes(url: str = "https://nominatim.org/data/us_postcodes.csv.gz", path: str = None):
     """
     Downloads a csv from Nominatim containing the GPS coordinates of every zip code in the US
     and returns it in the form of a pandas dataframe (used when accounting for team travel).
+    The download only happens once, after which the local copy is used.
 
     Args:
-        url (str, optional): URL location of the zipcode csv, defaults to "https://nominatim.org/data/us_postcodes.csv.gz".
+        url (str, optional): URL location of the zipcode csv, defaults to "https://nominatim.org/data/us_postcodes.csv.gz".  
+        path (str, optional): where to store the local copy of the zipcode csv, defaults to None (file name of the url in the current directory).
 
     Returns:
         pd.DataFrame: dataframe containing the GPS coordinates of every US zip code.
     """
-    response = requests.get(url,stream=True)
-    with open(url.split('/')[-1],'wb') as out_file:
-        shutil.copyfileobj(response.raw,out_file)
-    with gzip.open(url.split('/')[-1], 'rb') as f_in:
-        with open(url.split('/')[-1][:-3], 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
-    zips = pd.read_csv(url.split('/')[-1][:-3],dtype={'postcode':str})
+    if path is None:
+        path = url.split('/')[-1]
+    if not os.path.exists(path):
+        response = requests.get(url,stream=True)
+        with open(path + ".tmp",'wb') as out_file:
+            shutil.copyfileobj(response.raw,out_file)
+        os.replace(path + ".tmp", path)
+    zips = pd.read_csv(path,dtype={'postcode':str},compression="gzip")
     return zips
 
 
-def get_coordinates(address: str, zips: pd.DataFrame):
+def zip_code_index(zips: pd.DataFrame):
+    """
+    Indexes the zip code table by postcode for constant time coordinate lookups.
+
+    Args:
+        zips (pd.DataFrame): dataframe containing the GPS coordinates of every US zip code.
+
+    Returns:
+        dict: latitude and longitude of each zip code keyed by postcode.
+    """
+    return dict(zip(zips.postcode, zip(zips.lat, zips.lon)))
+
+
+country_coords = {
+    "Mexico": (19.3029, -99.1505),
+    "UK": (51.5072, -0.1276),
+    "Bavaria": (48.2188, 11.6248),
+    "Hesse": (50.0686, 8.6455),
+    "Canada": (43.6414, -79.3892),
+    "Brazil": (-23.5453, -46.4742),
+}
+"""Approximate coordinates of international stadiums whose addresses don't end in a US zip code."""
+
+us_center_coords = (37.0902, -95.7129)
+"""Centerpoint of the US, used as a last resort when a location can't be identified."""
+
+intl_stadium_ids = {
+    "Wembley Stadium": "LON00",
+    "Tottenham Hotspur Stadium": "LON02",
+    "Deutsche Bank Park": "FRA00",
+    "Arena Corinthians": "BRA00",
+    "Allianz Arena": "MUN01",
+}
+"""Pro Football Reference stadium identifiers for international venues missing from some boxscores."""
+
+
+def get_coordinates(address: str, zips: dict):
     """
     Provides the coordinates of the specified address. If no exact coordinates are available,
     city, state, and zip code are used for an approximate position.
 
     Args:
-        address (str): physical address of interest.
+        address (str): physical address of interest.  
+        zips (dict): zip code coordinates keyed by postcode (see zip_code_index).
 
     Returns:
         str: latitudinal and longitudinal coordinates separated by a comma.
     """
+    if isinstance(zips, pd.DataFrame):
+        zips = zip_code_index(zips)
     stad_zip = address.split(' ')[-1]
-    stad_coords = zips.loc[zips.postcode == stad_zip,['lat','lon']].astype(str)
-    if stad_coords.shape[0] > 0:
-        coords = ",".join(stad_coords.values[0])
-    elif stad_zip == "Mexico":
-        coords = "19.3029,-99.1505"
-    elif stad_zip == "UK":
-        coords = "51.5072,-0.1276"
-    elif stad_zip == "Bavaria":
-        coords = "48.2188,11.6248"
-    elif stad_zip == "Hesse":
-        coords = "50.0686,8.6455"
-    elif stad_zip == "Canada":
-        coords = "43.6414,-79.3892"
-    elif stad_zip == "Brazil":
-        coords = "-23.5453,-46.4742"
+    if stad_zip in zips:
+        coords = zips[stad_zip]
+    elif stad_zip in country_coords:
+        coords = country_coords[stad_zip]
     else:
         print("Can't find zip code provided: " + str(stad_zip))
         print("Using centerpoint of US...")
-        coords = "37.0902,-95.7129"
-    return coords
+        coords = us_center_coords
+    return ",".join([str(val) for val in coords])
+
+
+class Geodata:
+    """
+    Geodata class that keeps a local index of where every team and game is located (used when accounting for team travel).
+    The zip code table is downloaded once and indexed by postcode, while the home stadium of each team-season, 
+    the stadium of each neutral site game, and the coordinates of each stadium are persisted locally 
+    so that only new team-seasons and games ever require a page request.
+
+    Attributes:
+        path: directory where the geodata tables are persisted.
+        stadiums: dataframe containing the address and coordinates of each stadium.
+        team_stadiums: dataframe containing the home stadium of each team in each season.
+        game_stadiums: dataframe containing the stadium of each neutral site game.
+    """
+
+    def __init__(self, path: str = "NFLGeodata"):
+        """
+        Loads the persisted geodata tables.
+
+        Args:
+            path (str, optional): directory where the geodata tables are persisted, defaults to "NFLGeodata".
+        """
+        self.path = path
+        self.zips = None
+        self.stadiums = self.load_table("stadiums", ["stadium_id", "address", "coords"])
+        self.team_stadiums = self.load_table("team_stadiums", ["season", "abbrev", "stadium_id"])
+        self.game_stadiums = self.load_table("game_stadiums", ["boxscore_abbrev", "stadium_id"])
+        self.game_stadiums = self.game_stadiums.loc[~self.game_stadiums.stadium_id.isin(["", "attendance"]) \
+        & ~self.game_stadiums.stadium_id.isnull()].reset_index(drop=True)
+
+    def load_table(self, name: str, columns: list):
+        """
+        Loads the specified geodata table if it has been persisted before.
+
+        Args:
+            name (str): name of the geodata table.  
+            columns (list): columns of the geodata table.
+
+        Returns:
+            pd.DataFrame: dataframe containing the persisted geodata table (empty if it doesn't exist yet).
+        """
+        table_path = os.path.join(self.path, name + ".csv")
+        if os.path.exists(table_path):
+            return pd.read_csv(table_path, dtype={col: str for col in columns if col != "season"})
+        return pd.DataFrame(columns=columns)
+
+    def save_table(self, name: str):
+        """
+        Persists the specified geodata table.
+
+        Args:
+            name (str): name of the geodata table.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        getattr(self, name).to_csv(os.path.join(self.path, name + ".csv"), index=False)
+
+    def zip_index(self):
+        """
+        Provides the zip code index, downloading the zip code table the first time around.
+
+        Returns:
+            dict: latitude and longitude of each zip code keyed by postcode.
+        """
+        if self.zips is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.zips = zip_code_index(download_zip_codes(path=os.path.join(self.path, "us_postcodes.csv.gz")))
+        return self.zips
+
+    def stadium_coords(self, stadium_ids: list):
+        """
+        Provides the coordinates of the specified stadiums, looking up any stadiums that aren't indexed yet.
+
+        Args:
+            stadium_ids (list): stadium identifiers according to Pro Football Reference.
+
+        Returns:
+            pd.Series: latitudinal and longitudinal coordinates of each stadium separated by a comma, indexed by stadium identifier.
+        """
+        missing = pd.Series(stadium_ids).dropna().drop_duplicates()
+        missing = missing.loc[~missing.isin(self.stadiums.stadium_id)]
+        if missing.shape[0] > 0:
+            new_stadiums = pd.DataFrame({"stadium_id": missing.tolist()})
+            new_stadiums["address"] = [get_address(stadium_id) for stadium_id in new_stadiums.stadium_id]
+            new_stadiums["coords"] = [get_coordinates(address, self.zip_index()) for address in new_stadiums.address]
+            self.stadiums = pd.concat([self.stadiums, new_stadiums], ignore_index=True)
+            self.save_table("stadiums")
+        return self.stadiums.set_index("stadium_id").coords
+
+    def team_coords(self, teams: pd.DataFrame):
+        """
+        Provides the home coordinates of each team-season provided, 
+        looking up the home stadium of any team-seasons that aren't indexed yet.
+
+        Args:
+            teams (pd.DataFrame): dataframe containing the season and abbreviation of each team of interest.
+
+        Returns:
+            pd.DataFrame: dataframe containing the season, abbreviation, and home coordinates of each team.
+        """
+        teams = teams[["season", "abbrev"]].drop_duplicates(ignore_index=True)
+        teams.season = teams.season.astype(int)
+        self.team_stadiums.season = self.team_stadiums.season.astype(int)
+        missing = pd.merge(left=teams, right=self.team_stadiums, how="left", on=["season", "abbrev"], indicator=True)
+        missing = missing.loc[missing._merge == "left_only", ["season", "abbrev"]].reset_index(drop=True)
+        if missing.shape[0] > 0:
+            missing["stadium_id"] = [get_team_stadium(abbrev, season) for season, abbrev in missing.values]
+            self.team_stadiums = pd.concat([self.team_stadiums, missing], ignore_index=True)
+            self.save_table("team_stadiums")
+        teams = pd.merge(left=teams, right=self.team_stadiums, how="left", on=["season", "abbrev"])
+        teams["coords"] = teams.stadium_id.map(self.stadium_coords(teams.stadium_id))
+        teams.coords = teams.coords.fillna(",".join([str(val) for val in us_center_coords]))
+        return teams[["season", "abbrev", "coords"]]
+
+    def game_coords(self, games: pd.DataFrame):
+        """
+        Provides the coordinates of each neutral site game provided, 
+        looking up the stadium of any games that aren't indexed yet.
+
+        Args:
+            games (pd.DataFrame): dataframe containing the boxscore identifier and stadium name (if known) of each game.
+
+        Returns:
+            pd.DataFrame: dataframe containing the boxscore identifier and coordinates of each game.
+        """
+        games = games.drop_duplicates(subset=["boxscore_abbrev"], ignore_index=True)
+        missing = games.loc[~games.boxscore_abbrev.isin(self.game_stadiums.boxscore_abbrev)].reset_index(drop=True)
+        if missing.shape[0] > 0:
+            stadium_ids = []
+            for box, stad_name in missing[["boxscore_abbrev", "Stadium"]].values:
+                stadium_id = get_game_stadium(box)
+                if stadium_id in ["","attendance"]:
+                    stadium_id = intl_stadium_ids.get(stad_name, stadium_id)
+                stadium_ids.append(stadium_id)
+            missing["stadium_id"] = stadium_ids
+            # Only lookups that landed on an actual stadium are kept, anything else gets another try next time
+            resolved = ~missing.stadium_id.isin(["", "attendance"]) & ~missing.stadium_id.isnull()
+            if resolved.any():
+                self.game_stadiums = pd.concat([self.game_stadiums, missing.loc[resolved, ["boxscore_abbrev", "stadium_id"]]], ignore_index=True)
+                self.save_table("game_stadiums")
+        games = pd.merge(left=games[["boxscore_abbrev"]], right=self.game_stadiums, how="left", on="boxscore_abbrev")
+        games["coords"] = games.stadium_id.map(self.stadium_coords(games.stadium_id))
+        return games[["boxscore_abbrev", "coords"]]
+
+
+def haversine(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray):
+    """
+    Calculates the great-circle distance between two sets of coordinates
+    (vectorized across arrays, used when accounting for team travel).
+
+    Args:
+        lat1 (np.ndarray): latitudes of the starting points in degrees.  
+        lon1 (np.ndarray): longitudes of the starting points in degrees.  
+        lat2 (np.ndarray): latitudes of the destinations in degrees.  
+        lon2 (np.ndarray): longitudes of the destinations in degrees.  
+
+    Returns:
+        np.ndarray: distances between each pair of points in miles.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 3958.8 * np.arcsin(np.sqrt(a))
+
+
+schedule_cache_version = 3
+"""Version of the cached schedule artifacts, bump whenever the Schedule pipeline changes what it produces."""
 
 
 class Schedule:
@@ -332,9 +623,11 @@ class Schedule:
         schedule: dataframe containing matchup details for the seasons of interest.
     """
 
-    def __init__(self, start: int, finish: int, playoffs: bool = True, elo: bool = False, qbelo: bool = False):
+    def __init__(self, start: int, finish: int, playoffs: bool = True, elo: bool = False, qbelo: bool = False, cache: str = "ScheduleCache"):
         """
         Initializes a Schedule object using the parameters provided and class functions defined below.
+        Completed seasons are frozen in the cache after they're built once, so only seasons 
+        that are missing or still in progress are pulled and processed again.
 
         Args:
             start (int): first NFL season of interest
@@ -342,6 +635,27 @@ class Schedule:
             playoffs (bool, optional): whether to include playoff games, defaults to True.
             elo (bool, optional): whether to include elo rating considerations, defaults to False.
             qbelo (bool, optional): whether to include QB elo rating considerations, defaults to False.
+            cache (str, optional): directory of cached schedule artifacts, defaults to "ScheduleCache" (None skips the cache).
+        """
+        if cache and not qbelo:
+            self.load_seasons(int(start), int(finish), elo, cache)
+        else:
+            self.build_seasons(start, finish, elo, qbelo)
+        if not playoffs:
+            self.schedule = self.schedule.loc[
+                self.schedule.week_num.str.isnumeric()
+            ].reset_index(drop=True)
+
+    def build_seasons(self, start: int, finish: int, elo: bool = False, qbelo: bool = False, seed: pd.DataFrame = None):
+        """
+        Pulls and processes the schedules for the seasons provided from scratch.
+
+        Args:
+            start (int): first NFL season of interest
+            finish (int): last NFL season of interest
+            elo (bool, optional): whether to include elo rating considerations, defaults to False.
+            qbelo (bool, optional): whether to include QB elo rating considerations, defaults to False.
+            seed (pd.DataFrame, optional): completed schedule with elo ratings for the preceding season(s), defaults to None (initializes elo ratings from scratch).
         """
         self.get_schedules(start, finish)
         self.add_weeks()
@@ -353,14 +667,67 @@ class Schedule:
             self.add_game_coords()
             self.add_travel()
             self.add_elo_columns(qbelo)
-            while self.schedule.elo1_pre.isnull().any():
-                self.next_init_elo()
-                self.next_elo_prob()
-                self.next_elo_delta()
-        if not playoffs:
-            self.schedule = self.schedule.loc[
-                self.schedule.week_num.str.isnumeric()
-            ].reset_index(drop=True)
+            self.add_elos(seed)
+
+    def add_elos(self, seed: pd.DataFrame = None):
+        """
+        Calculates elo ratings for every matchup in the schedule that doesn't have them yet.
+        When provided, a previous schedule with final elo ratings is used as a starting point 
+        (e.g. the end of the previous season) instead of initializing every team from scratch.
+
+        Args:
+            seed (pd.DataFrame, optional): completed schedule with elo ratings preceding the current schedule, defaults to None.
+        """
+        num_seed = 0
+        if seed is not None and seed.shape[0] > 0:
+            num_seed = seed.shape[0]
+            self.schedule = pd.concat([seed, self.schedule], ignore_index=True)
+        while self.schedule.elo1_pre.isnull().any():
+            self.next_init_elo()
+            self.next_elo_prob()
+            self.next_elo_delta()
+        self.schedule = self.schedule.iloc[num_seed:].reset_index(drop=True)
+
+    def load_seasons(self, start: int, finish: int, elo: bool = False, cache: str = "ScheduleCache"):
+        """
+        Assembles the schedules for the seasons provided from the cache of completed seasons, 
+        building any missing or in-progress seasons from scratch. Elo ratings start from scratch in the 
+        first season requested, so elo artifacts are keyed by that season too, and newly built seasons 
+        pick up from the cached final ratings of the previous season in the same chain rather than replaying history. 
+        Newly completed seasons are frozen in the cache for next time.
+
+        Args:
+            start (int): first NFL season of interest
+            finish (int): last NFL season of interest
+            elo (bool, optional): whether to include elo rating considerations, defaults to False.
+            cache (str, optional): directory of cached schedule artifacts, defaults to "ScheduleCache".
+        """
+        cache = os.path.join(cache, "v{}".format(schedule_cache_version))
+        os.makedirs(cache, exist_ok=True)
+        artifact = lambda season: os.path.join(cache, "{}{}.parquet".format(season, "_elo_from{}".format(start) if elo else ""))
+        seasons = []
+        prev = None
+        season = start
+        while season <= finish:
+            if os.path.exists(artifact(season)):
+                prev = pd.read_parquet(artifact(season))
+                seasons.append(prev)
+                season += 1
+                continue
+            # Building every consecutive season that isn't cached in one go
+            last = season
+            while last < finish and not os.path.exists(artifact(last + 1)):
+                last += 1
+            self.build_seasons(season, last, elo, False, prev)
+            for new_season in range(season, last + 1):
+                prev = self.schedule.loc[self.schedule.season == new_season].reset_index(drop=True)
+                seasons.append(prev)
+                completed = datetime.datetime.now() > datetime.datetime(new_season + 1, 3, 1) \
+                and prev.shape[0] > 0 and not (prev.score1.isnull() | prev.score2.isnull()).any()
+                if completed:
+                    prev.to_parquet(artifact(new_season), index=False)
+            season = last + 1
+        self.schedule = pd.concat(seasons, ignore_index=True)
 
     def get_schedules(self, start: int, finish: int):
         """
@@ -451,9 +818,12 @@ class Schedule:
             bad = bad.loc[bad.boxscore_abbrev.isnull()]
             print(bad)
 
-    def add_team_coords(self):
+    def add_team_coords(self, geodata: str = "NFLGeodata"):
         """
         Adds the home coordinates for each team in each matchup of the schedule.
+
+        Args:
+            geodata (str, optional): directory where the geodata tables are persisted, defaults to "NFLGeodata".
         """
         teams = pd.concat(
             [
@@ -465,50 +835,31 @@ class Schedule:
                 ),
             ]
         ).drop_duplicates(ignore_index=True)
-        zips = download_zip_codes()
-        for ind in range(teams.shape[0]):
-            team = teams.iloc[ind]
-            # print(team["abbrev"])
-            stadium_id = get_team_stadium(team["abbrev"], team["season"])
-            address = get_address(stadium_id)
-            coords = get_coordinates(address, zips)
-            self.schedule.loc[
-                self.schedule.team1_abbrev == team["abbrev"], "coords1"
-            ] = coords
-            self.schedule.loc[
-                self.schedule.team2_abbrev == team["abbrev"], "coords2"
-            ] = coords
-
-    def add_game_coords(self):
+        coords = Geodata(geodata).team_coords(teams)
+        self.schedule.season = self.schedule.season.astype(int)
+        for team in ["1", "2"]:
+            self.schedule = pd.merge(
+                left=self.schedule,
+                right=coords.rename(columns={"abbrev": "team" + team + "_abbrev", "coords": "coords" + team}),
+                how="left",
+                on=["season", "team" + team + "_abbrev"],
+            )
+
+    def add_game_coords(self, geodata: str = "NFLGeodata"):
         """
         Adds game coordinates for each of the matchups in the schedule.
         If the game is international, the location is pulled directly from Pro Football Reference.
+
+        Args:
+            geodata (str, optional): directory where the geodata tables are persisted, defaults to "NFLGeodata".
         """
         neutral = self.schedule.game_location == "N"
-        self.schedule.loc[~neutral, "game_coords"] = self.schedule.loc[
-            ~neutral, "coords1"
-        ]
-        zips = download_zip_codes()
-        for box in self.schedule.loc[neutral, "boxscore_abbrev"]:
-            # print(box)
-            stadium_id = get_game_stadium(box)
-            if stadium_id in ["","attendance"]:
-                stad_name = self.schedule.loc[self.schedule.boxscore_abbrev == box,"Stadium"].values[0]
-                if stad_name == "Wembley Stadium":
-                    stadium_id = "LON00"
-                elif stad_name == "Tottenham Hotspur Stadium":
-                    stadium_id = "LON02"
-                elif stad_name == "Deutsche Bank Park":
-                    stadium_id = "FRA00"
-                elif stad_name == "Arena Corinthians":
-                    stadium_id = "BRA00"
-                elif stad_name == "Allianz Arena":
-                    stadium_id = "MUN01"
-            address = get_address(stadium_id)
-            coords = get_coordinates(address, zips)
-            self.schedule.loc[
-                self.schedule.boxscore_abbrev == box, "game_coords"
-            ] = coords
+        self.schedule["game_coords"] = self.schedule.coords1
+        if neutral.any():
+            coords = Geodata(geodata).game_coords(self.schedule.loc[neutral, ["boxscore_abbrev", "Stadium"]])
+            self.schedule.loc[neutral, "game_coords"] = self.schedule.loc[neutral, "boxscore_abbrev"]\
+            .map(coords.set_index("boxscore_abbrev").coords).values
+            self.schedule.game_coords = self.schedule.game_coords.fillna(self.schedule.coords1)
         del self.schedule["Stadium"]
         self.schedule.game_coords = self.schedule.game_coords.str.split(",")
 
@@ -516,41 +867,38 @@ class Schedule:
         """
         Adds the distance traveled for each team in each matchup of the schedule.
         """
+        game_coords = np.array(self.schedule.game_coords.tolist(), dtype=float).reshape(-1, 2)
         for team in [1, 2]:
             self.schedule["coords" + str(team)] = self.schedule[
                 "coords" + str(team)
             ].str.split(",")
-            self.schedule["travel" + str(team)] = self.schedule.apply(
-                lambda x: geodesic(x["coords" + str(team)], x["game_coords"]).mi, axis=1
+            team_coords = np.array(self.schedule["coords" + str(team)].tolist(), dtype=float).reshape(-1, 2)
+            self.schedule["travel" + str(team)] = haversine(
+                team_coords[:, 0], team_coords[:, 1], game_coords[:, 0], game_coords[:, 1]
             )
 
-    def add_rest(self):
+    def add_rest(self, bye_days: int = 11):
         """
-        Identifies teams that had a bye week before the matchup in question.
+        Identifies teams that had a bye week before the matchup in question 
+        based on the number of days since each team's previous game that season.
+
+        Args:
+            bye_days (int, optional): minimum number of days between games that counts as coming off a bye, defaults to 11 (Sunday game, bye, then Thursday game).
         """
-        for week in range(2, self.schedule.week.max() + 1):
-            prev = (
-                self.schedule.loc[self.schedule.week == week - 1, ["team1", "team2"]]
-                .values.flatten()
-                .tolist()
-            )
-            now = (
-                self.schedule.loc[self.schedule.week == week, ["team1", "team2"]]
-                .values.flatten()
-                .tolist()
-            )
-            rested = [team for team in now if team not in prev]
-            self.schedule.loc[
-                (self.schedule.week == week) & self.schedule.team1.isin(rested),
-                "rested1",
-            ] = True
-            self.schedule.loc[
-                (self.schedule.week == week) & self.schedule.team2.isin(rested),
-                "rested2",
-            ] = True
-        self.schedule.rested1 = self.schedule.rested1.astype(bool).fillna(False)
-        self.schedule.rested2 = self.schedule.rested2.astype(bool).fillna(False)
-    
+        games = pd.concat(
+            [
+                self.schedule[["season", "game_date", "team" + str(team)]]
+                .rename(columns={"team" + str(team): "team"})
+                .assign(team_num=team)
+                for team in [1, 2]
+            ]
+        )
+        games = games.sort_values(by=["season", "team", "game_date"], kind="stable")
+        games["rest_days"] = games.groupby(["season", "team"]).game_date.diff().dt.days
+        games["rested"] = games.rest_days.ge(bye_days)
+        for team in [1, 2]:
+            self.schedule["rested" + str(team)] = games.loc[games.team_num == team, "rested"]
+
     def add_elo_columns(self, qbelo: bool = False):
         """
         Adds the necessary columns for elo projections throughout the schedule.
@@ -682,16 +1030,17 @@ class Boxscore:
         snaps: dataframe containing the number of snaps played by every player on both teams.
     """
 
-    def __init__(self, game_id: str):
+    def __init__(self, game_id: str, raw_html: str = None):
         """
         Initializes a Boxscore object using the parameters provided and class functions defined below.
 
         Args:
-            game_id (str): unique SportsRef identifier for the game in question.
+            game_id (str): unique SportsRef identifier for the game in question.  
+            raw_html (str, optional): previously downloaded html for the game in question, defaults to None (pulls it from Pro Football Reference).
         """
         self.game_id = game_id
         """Pro Football Reference identifier for the game in question."""
-        self.get_raw_text()
+        self.get_raw_text(raw_html)
         self.get_details()
         self.get_stats()
         self.get_advanced_stats()
@@ -701,11 +1050,17 @@ class Boxscore:
         self.add_qb_value()
         self.normalize_team_names()
 
-    def get_raw_text(self):
+    def get_raw_text(self, raw_html: str = None):
         """
         Pulls down the raw html from Pro Football Reference containing the statistics for the game in question.
+
+        Args:
+            raw_html (str, optional): previously downloaded html for the game in question, defaults to None (pulls it from Pro Football Reference).
         """
-        self.raw_text = get_page("boxscores/{}.htm".format(self.game_id))
+        if raw_html is None:
+            self.raw_text = get_page("boxscores/{}.htm".format(self.game_id))
+        else:
+            self.raw_text = BeautifulSoup(raw_html, "html.parser")
 
     def get_details(self):
         """
@@ -870,6 +1225,345 @@ class Boxscore:
             self.team2_abbrev = abbrevs[self.team2_abbrev]
 
 
+stats_partitioning = ds.partitioning(pa.schema([("season", pa.int16()), ("week", pa.int8())]), flavor="hive")
+"""Hive-style partitioning (season=YYYY/week=WW) used by the columnar stats store."""
+
+stats_categories = ["team", "opponent", "pos", "player_id"]
+"""Columns stored as dictionary-encoded categoricals in the stats store."""
+
+
+def stats_schema(path: str):
+    """
+    Loads the unified schema of the columnar stats store (including partition columns).
+
+    Args:
+        path (str): location of the stats store.
+
+    Returns:
+        pa.Schema: schema of every column in the stats store, None if the store doesn't exist yet.
+    """
+    if not os.path.exists(os.path.join(path, "_common_metadata")):
+        return None
+    schema = pq.read_schema(os.path.join(path, "_common_metadata"))
+    for field in stats_partitioning.schema:
+        schema = schema.append(field)
+    return schema
+
+
+def write_stats(stats: pd.DataFrame, path: str, name: str = None):
+    """
+    Appends per-game player statistics to the columnar stats store, partitioned by season and week.
+    Only the partitions being written are touched, so previous weeks are never rewritten.
+    Writing the same name twice (e.g. a game_id) replaces that file instead of duplicating it.
+
+    Args:
+        stats (pd.DataFrame): per-game player statistics, including season, week, and game_id columns.  
+        path (str): location of the stats store.  
+        name (str, optional): identifier used when naming the new files, defaults to None (random identifier).
+    """
+    stats = stats.copy()
+    stats.season = stats.season.astype(int)
+    stats.week = stats.week.astype(int)
+    # Every column gets one of a few fixed types (numbers as doubles, everything else as strings)
+    for col in stats.columns:
+        if col in stats_categories:
+            stats[col] = stats[col].astype(str).astype("category")
+        elif col in ["season", "week"]:
+            continue
+        elif pd.api.types.is_numeric_dtype(stats[col]):
+            stats[col] = stats[col].astype(float)
+        elif stats[col].notnull().any():
+            stats[col] = stats[col].astype(object).where(stats[col].isnull(), stats[col].astype(str))
+    table = pa.Table.from_pandas(stats, preserve_index=False)
+    fixed_types = {field.name: field.type for field in stats_partitioning.schema}
+    fixed_types.update({col: pa.dictionary(pa.int32(), pa.string()) for col in stats_categories})
+    table = table.cast(pa.schema([field.with_type(fixed_types[field.name]) \
+    if field.name in fixed_types else field for field in table.schema]))
+    existing = stats_schema(path)
+    if existing is not None:
+        # Columns stored as numbers in one write and text in another fall back to text
+        conflicts = [field.name for field in table.schema if field.name in existing.names \
+        and not pa.types.is_null(field.type) and not pa.types.is_null(existing.field(field.name).type) \
+        and field.type != existing.field(field.name).type]
+        existing = pa.schema([field.with_type(pa.string()) if field.name in conflicts else field for field in existing])
+        table = table.cast(pa.schema([field.with_type(pa.string()) if field.name in conflicts else field for field in table.schema]))
+        schema = pa.unify_schemas([existing, table.schema], promote_options="permissive")
+        table = table.cast(pa.schema([schema.field(col) for col in table.column_names]))
+    else:
+        schema = table.schema
+    ds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=stats_partitioning,
+        basename_template=(name if name else uuid.uuid4().hex) + "-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    pq.write_metadata(pa.schema([field for field in schema if field.name not in ["season", "week"]]),\
+    os.path.join(path, "_common_metadata"))
+
+
+def read_stats(start: int, finish: int, columns: list = None, path: str = "GameByGameFantasyFootballStats", categorical: bool = True):
+    """
+    Reads per-game player statistics from the columnar stats store for the specified timeframe.
+    Only the season/week partitions in the timeframe are opened and only the requested columns are read.
+
+    Args:
+        start (int): year and number of the first week of interest (YYYYWW, e.g. 202102 = week 2 of 2021).  
+        finish (int): year and number of the last week of interest (YYYYWW, e.g. 202307 = week 7 of 2023).  
+        columns (list, optional): columns to read, defaults to None (all columns).  
+        path (str, optional): location of the stats store, defaults to "GameByGameFantasyFootballStats".  
+        categorical (bool, optional): whether to return team, position, and player ID columns as categoricals, defaults to True.
+
+    Returns:
+        pd.DataFrame: dataframe containing the requested player statistics for games during the timespan of interest.
+    """
+    schema = stats_schema(path)
+    if schema is None:
+        return pd.DataFrame(columns=columns if columns else ["season", "week", "game_id"])
+    if columns:
+        columns = [col for col in columns if col in schema.names]
+        to_read = columns + [col for col in ["season", "week", "game_id"] if col not in columns]
+    else:
+        to_read = None
+    dataset = ds.dataset(path, schema=schema, format="parquet", partitioning=stats_partitioning)
+    season, week = ds.field("season"), ds.field("week")
+    in_range = ((season > start // 100) | ((season == start // 100) & (week >= start % 100))) \
+    & ((season < finish // 100) | ((season == finish // 100) & (week <= finish % 100)))
+    # Keeping games in chronological order, same as they were pulled
+    stats = dataset.to_table(columns=to_read, filter=in_range)\
+    .sort_by([("season", "ascending"), ("week", "ascending"), ("game_id", "ascending")]).to_pandas()
+    if columns:
+        stats = stats[columns]
+    for col in ["season", "week"]:
+        if col in stats.columns:
+            stats[col] = stats[col].astype(int)
+    if not categorical:
+        for col in stats.columns:
+            if isinstance(stats[col].dtype, pd.CategoricalDtype):
+                stats[col] = stats[col].astype(object)
+    return stats
+
+
+class GameLogIndex:
+    """
+    Query layer over per-game player statistics. Game logs are sorted by player, team, and position 
+    (each ordered by season and week) alongside offset tables marking where each key's block starts, 
+    so every lookup is a binary search that returns a contiguous slice (a view) instead of a full-frame boolean mask.
+    The team and position orderings are only built the first time a team or position is looked up.
+
+    Attributes:
+        by_player: game logs sorted by player, season, and week.  
+        by_team: game logs sorted by team, season, and week (None until first needed).  
+        by_position: game logs sorted by position, season, and week (None until first needed).
+    """
+
+    def __init__(self, stats: pd.DataFrame, player: str = "player_id", team: str = "team", position: str = "pos"):
+        """
+        Initializes a GameLogIndex object by sorting the provided game logs by player and building the offset tables.
+
+        Args:
+            stats (pd.DataFrame): per-game player statistics, including season and week columns.  
+            player (str, optional): column identifying each player, defaults to "player_id".  
+            team (str, optional): column identifying each team, defaults to "team".  
+            position (str, optional): column identifying each position, defaults to "pos".
+        """
+        self.yyyyww = stats.season.astype(int).values * 100 + stats.week.astype(int).values
+        self.by_player, self.player_keys, self.player_offsets, self.player_weeks = self.sort_logs(stats, player, self.yyyyww)
+        self.stats, self.team, self.position = stats, team, position
+        self.by_team = None
+        self.by_position = None
+
+    @staticmethod
+    def sort_logs(stats: pd.DataFrame, col: str, yyyyww: np.ndarray):
+        """
+        Sorts game logs by the specified column and then chronologically, 
+        and identifies where each value's block of games starts and stops.
+
+        Args:
+            stats (pd.DataFrame): per-game player statistics.  
+            col (str): column to sort by.  
+            yyyyww (np.ndarray): year and week of each game (YYYYWW).
+
+        Returns:
+            pd.DataFrame: sorted game logs.  
+            pd.Index: sorted unique values of the specified column.  
+            np.ndarray: row offsets where each value's block starts (plus the total number of rows).  
+            np.ndarray: year and week of each game in the sorted game logs.
+        """
+        keys = pd.Categorical(stats[col].astype(str))
+        order = np.lexsort((yyyyww, keys.codes))
+        offsets = np.searchsorted(keys.codes[order], np.arange(len(keys.categories) + 1))
+        return stats.iloc[order].reset_index(drop=True), keys.categories, offsets, yyyyww[order]
+
+    @staticmethod
+    def block(keys: pd.Index, offsets: np.ndarray, key: str):
+        """
+        Binary searches for the block of rows belonging to the specified key.
+
+        Args:
+            keys (pd.Index): sorted unique key values.  
+            offsets (np.ndarray): row offsets where each key's block starts.  
+            key (str): key of interest.
+
+        Returns:
+            int: first row of the key's block.  
+            int: row after the last row of the key's block.
+        """
+        ind = keys.searchsorted(str(key))
+        if ind >= len(keys) or keys[ind] != str(key):
+            return 0, 0
+        return offsets[ind], offsets[ind + 1]
+
+    def player_games(self, player: str, n: int = None, before: int = None):
+        """
+        Provides the most recent games for the specified player.
+
+        Args:
+            player (str): identifier of the player of interest.  
+            n (int, optional): number of games to provide, defaults to None (all games).  
+            before (int, optional): only include games before this week (YYYYWW), defaults to None (no cutoff).
+
+        Returns:
+            pd.DataFrame: view of the player's game logs in chronological order.
+        """
+        lo, hi = self.block(self.player_keys, self.player_offsets, player)
+        if before is not None:
+            hi = lo + np.searchsorted(self.player_weeks[lo:hi], before, side="left")
+        if n is not None:
+            lo = max(lo, hi - n)
+        return self.by_player.iloc[lo:hi]
+
+    def teams(self):
+        """
+        Sorts the game logs by team the first time around and provides every team in them.
+
+        Returns:
+            pd.Index: sorted unique teams.
+        """
+        if self.by_team is None:
+            self.by_team, self.team_keys, self.team_offsets, self.team_weeks = \
+            self.sort_logs(self.stats, self.team, self.yyyyww)
+        return self.team_keys
+
+    def team_week(self, team: str, season: int, week: int):
+        """
+        Provides all game logs for the specified team in the specified week.
+
+        Args:
+            team (str): abbreviation of the team of interest.  
+            season (int): season of interest.  
+            week (int): week of interest.
+
+        Returns:
+            pd.DataFrame: view of the team's game logs for that week.
+        """
+        lo, hi = self.block(self.teams(), self.team_offsets, team)
+        weeks = self.team_weeks[lo:hi]
+        return self.by_team.iloc[lo + np.searchsorted(weeks, season * 100 + week, side="left"):\
+        lo + np.searchsorted(weeks, season * 100 + week, side="right")]
+
+    def positions(self):
+        """
+        Sorts the game logs by position the first time around and provides every position in them.
+
+        Returns:
+            pd.Index: sorted unique positions.
+        """
+        if self.by_position is None:
+            self.by_position, self.position_keys, self.position_offsets, self.position_weeks = \
+            self.sort_logs(self.stats, self.position, self.yyyyww)
+        return self.position_keys
+
+    def position_games(self, position: str, start: int = None, finish: int = None):
+        """
+        Provides all game logs for the specified position during the specified timeframe.
+
+        Args:
+            position (str): position of interest.  
+            start (int, optional): year and number of the first week of interest (YYYYWW), defaults to None (no limit).  
+            finish (int, optional): year and number of the last week of interest (YYYYWW), defaults to None (no limit).
+
+        Returns:
+            pd.DataFrame: view of the position's game logs in chronological order.
+        """
+        lo, hi = self.block(self.positions(), self.position_offsets, position)
+        weeks = self.position_weeks[lo:hi]
+        if finish is not None:
+            hi = lo + np.searchsorted(weeks, finish, side="right")
+        if start is not None:
+            lo = lo + np.searchsorted(weeks, start, side="left")
+        return self.by_position.iloc[lo:hi]
+
+    def first_games(self, as_of: int):
+        """
+        Provides each player's first game on or after the specified week, 
+        searching every player's block at once.
+
+        Args:
+            as_of (int): year and number of the week of interest (YYYYWW).
+
+        Returns:
+            pd.DataFrame: one game log for each player who played on or after the week of interest.
+        """
+        starts, stops = self.player_offsets[:-1], self.player_offsets[1:]
+        codes = np.repeat(np.arange(len(self.player_keys), dtype=np.int64), stops - starts)
+        rows = np.searchsorted(codes * 1000000 + self.player_weeks, np.arange(len(self.player_keys)) * 1000000 + as_of)
+        return self.by_player.iloc[rows[rows < stops]]
+
+
+def parse_boxscore(game_id: str, html_path: str):
+    """
+    Parses a previously downloaded boxscore into per-player statistics.
+    Defined at the module level so it can be shipped off to a process pool.
+
+    Args:
+        game_id (str): Pro Football Reference identifier string for the game in question (e.g. 202209080ram).  
+        html_path (str): location of the gzipped html for the game in question.
+
+    Returns:
+        pd.DataFrame: dataframe containing player statistics for the game in question.
+    """
+    with gzip.open(html_path, "rt", encoding="utf-8") as f:
+        b = Boxscore(game_id, f.read())
+    game_stats = b.game_stats
+    game_stats["season"] = b.season
+    game_stats["week"] = b.week
+    game_stats["game_id"] = b.game_id
+    return game_stats
+
+
+def fetch_boxscores(game_ids: list, cache: str, pool: ProcessPoolExecutor, fetched: queue.Queue, stop: threading.Event):
+    """
+    Downloads the raw html for each of the specified games (respecting the rate limit in get_html),
+    caches it locally, and hands it off to the process pool for parsing. Meant to run in its own thread, 
+    passing (game_id, future) pairs to the writer in schedule order and a (None, exception) pair when finished.
+
+    Args:
+        game_ids (list): Pro Football Reference identifiers for the games to pull.  
+        cache (str): directory where raw html is cached.  
+        pool (ProcessPoolExecutor): process pool used to parse each boxscore.  
+        fetched (queue.Queue): queue feeding parsing jobs to the writer.  
+        stop (threading.Event): event signaling the fetcher to stop early.
+    """
+    try:
+        for game_id in game_ids:
+            if stop.is_set():
+                break
+            html_path = os.path.join(cache, "{}.htm.gz".format(game_id))
+            if not os.path.exists(html_path):
+                print(game_id)
+                raw_html = get_html("boxscores/{}.htm".format(game_id))
+                with gzip.open(html_path + ".tmp", "wt", encoding="utf-8") as f:
+                    f.write(raw_html)
+                os.replace(html_path + ".tmp", html_path)
+            fetched.put((game_id, pool.submit(parse_boxscore, game_id, html_path)))
+    except BaseException as e:
+        fetched.put((None, e))
+        return
+    fetched.put((None, None))
+
+
 def get_bulk_stats(
     start_season: int,
     start_week: int,
@@ -877,9 +1571,16 @@ def get_bulk_stats(
     finish_week: int,
     playoffs: bool = True,
     path: str = None,
+    cache: str = "BoxscoreCache",
+    workers: int = None,
+    columns: list = None,
+    categorical: bool = True,
 ):
     """
     Pulls individual player statistics for each game in the specified timeframe from Pro Football Reference.
+    New games are pulled in a three-stage pipeline: a rate-limited fetcher thread downloads and caches
+    the raw html, a process pool parses it, and a single writer appends each game to the stats store 
+    as soon as it's parsed, so an interrupted pull resumes exactly where it stopped.
 
     Args:
         start_season (int): first season of interest.  
@@ -887,7 +1588,12 @@ def get_bulk_stats(
         finish_season (int): last season of interest.  
         finish_week (int): last week of interest.  
         playoffs (bool, optional): whether to include playoff games, defaults to True.  
-        path(str, optional): file path where stats are/should be saved to, defaults to None.
+        path(str, optional): location of the columnar stats store (see write_stats), defaults to None. 
+        An old single-file csv at the same location (plus ".csv") is migrated into the store automatically.  
+        cache (str, optional): directory where raw boxscore html is cached, defaults to "BoxscoreCache".  
+        workers (int, optional): number of processes used to parse boxscores, defaults to None (number of CPUs).  
+        columns (list, optional): columns to return, defaults to None (all columns).  
+        categorical (bool, optional): whether to return team, position, and player ID columns as categoricals, defaults to True.
 
     Returns:
         pd.DataFrame: dataframe containing player statistics for games during the timespan of interest.
@@ -902,24 +1608,49 @@ def get_bulk_stats(
         & ~s.schedule.score1.isnull()
         & ~s.schedule.score2.isnull()
     ].reset_index(drop=True)
-    if path is not None and os.path.exists(str(path)):
-        stats = pd.read_csv(path)
+    start = start_season * 100 + start_week
+    finish = finish_season * 100 + finish_week
+    if path is not None:
+        path = str(path)[:-4] if str(path).endswith(".csv") else str(path)
+        if os.path.exists(path + ".csv") and stats_schema(path) is None:
+            # Migrating the old single-file csv into the stats store
+            write_stats(pd.read_csv(path + ".csv"), path, "legacy")
+        pulled = read_stats(start, finish, ["game_id"], path, False).game_id.unique()
+    else:
+        pulled = []
+    missing = s.schedule.loc[~s.schedule.boxscore_abbrev.isin(pulled)].reset_index(drop=True)
+    new_stats = []
+    if missing.shape[0] > 0:
+        os.makedirs(cache, exist_ok=True)
+        fetched = queue.Queue()
+        stop = threading.Event()
+        pool = ProcessPoolExecutor(max_workers=workers)
+        fetcher = threading.Thread(target=fetch_boxscores, args=(missing.boxscore_abbrev.tolist(), cache, pool, fetched, stop), daemon=True)
+        fetcher.start()
+        try:
+            while True:
+                game_id, result = fetched.get()
+                if game_id is None:
+                    if result is not None:
+                        raise result
+                    break
+                if path is not None:
+                    write_stats(result.result(), path, game_id)
+                else:
+                    new_stats.append(result.result())
+        finally:
+            stop.set()
+            pool.shutdown(cancel_futures=True)
+    if path is not None:
+        stats = read_stats(start, finish, columns, path, categorical)
+    elif len(new_stats) > 0:
+        stats = pd.concat(new_stats, ignore_index=True)
+        if columns:
+            stats = stats[[col for col in columns if col in stats.columns]]
     else:
-        stats = pd.DataFrame(columns=["season", "week", "game_id"])
-    to_save = path is not None and (~s.schedule.boxscore_abbrev.isin(stats.game_id.unique())).any()
-    for ind in range(s.schedule.shape[0]):
-        if s.schedule.iloc[ind]["boxscore_abbrev"] not in stats.game_id.unique():
-            print(s.schedule.iloc[ind]["boxscore_abbrev"])
-            b = Boxscore(s.schedule.iloc[ind]["boxscore_abbrev"])
-            stats = pd.concat([stats, b.game_stats], ignore_index=True)
-            stats.season = stats.season.fillna(b.season)
-            stats.week = stats.week.fillna(b.week)
-            stats.game_id = stats.game_id.fillna(b.game_id)
-            if to_save and b.season not in s.schedule.iloc[ind + 1:].season.unique():
-                stats.to_csv(path,index=False)
-    if to_save:
-        stats.to_csv(path,index=False)
-    stats = stats.loc[stats.game_id.isin(s.schedule.boxscore_abbrev.tolist())].reset_index(drop=True)
+        stats = pd.DataFrame(columns=columns if columns else ["season", "week", "game_id"])
+    if "game_id" in stats.columns:
+        stats = stats.loc[stats.game_id.isin(s.schedule.boxscore_abbrev.tolist())].reset_index(drop=True)
     return stats
 
 
@@ -938,36 +1669,97 @@ def get_draft(season: int):
     return draft_order
 
 
+def read_partitions(path: str, keys: list):
+    """
+    Reads the specified partitions of a keyed parquet store (e.g. one file per season).
+
+    Args:
+        path (str): directory of the parquet store.  
+        keys (list): partition keys of interest.
+
+    Returns:
+        pd.DataFrame: dataframe containing all available partitions of interest.
+    """
+    files = [os.path.join(path, "{}.parquet".format(key)) for key in keys]
+    frames = [pd.read_parquet(file) for file in files if os.path.exists(file)]
+    if len(frames) == 0:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_partition(frame: pd.DataFrame, path: str, key):
+    """
+    Writes a single partition of a keyed parquet store, replacing any previous version.
+    Columns of mixed type are stored as numbers if possible and as strings otherwise.
+
+    Args:
+        frame (pd.DataFrame): dataframe containing the partition's data.  
+        path (str): directory of the parquet store.  
+        key: partition key (e.g. season).
+    """
+    frame = frame.copy()
+    for col in frame.columns[frame.dtypes == object]:
+        try:
+            frame[col] = pd.to_numeric(frame[col])
+        except (ValueError, TypeError):
+            frame[col] = frame[col].where(frame[col].isnull(), frame[col].astype(str))
+    os.makedirs(path, exist_ok=True)
+    part_path = os.path.join(path, "{}.parquet".format(key))
+    frame.to_parquet(part_path + ".tmp", index=False)
+    os.replace(part_path + ".tmp", part_path)
+
+
+def migrate_csv(path: str, key: str):
+    """
+    Converts a legacy csv artifact into a keyed parquet store of the same name (minus the extension).
+
+    Args:
+        path (str): directory of the parquet store.  
+        key (str): column to partition the legacy data by.
+    """
+    if os.path.exists(path + ".csv") and not os.path.exists(path):
+        legacy = pd.read_csv(path + ".csv")
+        for val in legacy[key].dropna().unique():
+            write_partition(legacy.loc[legacy[key] == val], path, int(val))
+
+
 def get_bulk_draft_pos(start_season: int, finish_season: int, path: str = None, \
-best_qb_val: float = 34.313, qb_val_per_pick: float = -0.137):
+best_qb_val: float = 34.313, qb_val_per_pick: float = -0.137, workers: int = 2):
     """
     Pulls draft results for each season in the specified timeframe from Pro Football Reference
-    and infers initial QB elo values from draft positions.
+    and infers initial QB elo values from draft positions. When a path is provided, 
+    drafts are stored in a parquet store with one file per year and only missing years are pulled.
 
     Args:
         start_season (int): first season of interest.  
         finish_season (int): last season of interest.  
-        path (str, optional): where to save the draft results in csv form, defaults to None.  
+        path (str, optional): directory of the draft results store, defaults to None (legacy csv paths are migrated).  
         best_qb_val (float, optional): QB elo value assigned to a first overall pick, defaults to 34.313.  
-        qb_val_per_pick (float, optional): elo point decline per pick, defaults to -0.137.
+        qb_val_per_pick (float, optional): elo point decline per pick, defaults to -0.137.  
+        workers (int, optional): maximum number of drafts to pull at once (requests remain rate-limited), defaults to 2.
 
     Returns:
         pd.DataFrame: dataframe containing all draft results over the timeframe of interest.
     """
     start_season = int(start_season)
     finish_season = int(finish_season)
-    if path and os.path.exists(str(path)):
-        draft_pos = pd.read_csv(path)
+    years = list(range(start_season,finish_season + 1))
+    if path:
+        path = str(path)[:-4] if str(path).endswith(".csv") else str(path)
+        migrate_csv(path, "year")
+        missing = [year for year in years if not os.path.exists(os.path.join(path, "{}.parquet".format(year)))]
+    else:
+        missing = years
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        drafts = dict(zip(missing, pool.map(get_draft, missing)))
+    for year in missing:
+        drafts[year]['year'] = year
+        if path:
+            write_partition(drafts[year], path, year)
+    if path:
+        draft_pos = read_partitions(path, years)
     else:
-        draft_pos = pd.DataFrame(columns=['year'])
-    new_drafts = any([year not in draft_pos.year.unique() for year in range(start_season,finish_season + 1)])
-    for year in range(start_season,finish_season + 1):
-        if year not in draft_pos.year.unique():
-            draft_pos = pd.concat([draft_pos,get_draft(year)],ignore_index=True)
-            draft_pos.year = draft_pos.year.fillna(year)
-    if path and new_drafts:
-        draft_pos.to_csv(path,index=False)
-    draft_pos = draft_pos.loc[draft_pos.year.isin(list(range(start_season,finish_season + 1)))].reset_index(drop=True)
+        draft_pos = pd.concat([drafts[year] for year in years], ignore_index=True)
     qbs = draft_pos.pos == 'QB'
     draft_pos.loc[qbs,'qb_value_init'] = draft_pos.loc[qbs,'draft_pick']*qb_val_per_pick + best_qb_val
     return draft_pos
@@ -989,34 +1781,47 @@ def get_roster(team: str, season: int):
     return roster
 
 
-def get_bulk_rosters(start_season: int, finish_season: int, path: str = None):
+def get_bulk_rosters(start_season: int, finish_season: int, path: str = None, workers: int = 2):
     """
     Pulls all NFL rosters during the specified timeframe from Pro Football Reference.
+    When a path is provided, rosters are stored in a parquet store with one file per season 
+    and only team-seasons missing from the store are pulled.
 
     Args:
         start_season (int): first season of interest.  
         finish_season (int): last season of interest.  
-        path (str, optional): where to save the rosters in csv form, defaults to None.
+        path (str, optional): directory of the roster store, defaults to None (legacy csv paths are migrated).  
+        workers (int, optional): maximum number of rosters to pull at once (requests remain rate-limited), defaults to 2.
 
     Returns:
         pd.DataFrame: dataframe containing all rosters for the specified timeframe.
     """
+    start_season = int(start_season)
+    finish_season = int(finish_season)
+    seasons = list(range(start_season,finish_season + 1))
     s = Schedule(start_season,finish_season)
     # Need to delete and repull after every new week to account for trades, etc.
-    if path and os.path.exists(str(path)):
-        teams = pd.read_csv(path)
+    if path:
+        path = str(path)[:-4] if str(path).endswith(".csv") else str(path)
+        migrate_csv(path, "season")
+        teams = read_partitions(path, seasons)
     else:
-        teams = pd.DataFrame(columns=["season"])
-    new_games = any([season not in teams.season.unique() for season in range(start_season,finish_season + 1)])
-    for season in range(start_season,finish_season + 1):
-        if season not in teams.season.unique():
-            for team in s.schedule.loc[s.schedule.season == season,'team1_abbrev'].unique():
-                roster = get_roster(team,season)
-                roster['team'] = team
-                roster['season'] = season
-                teams = pd.concat([teams,roster],ignore_index=True)
-    if path and (new_games or finish_season == datetime.datetime.now().year):
-        teams.to_csv(path,index=False)
+        teams = pd.DataFrame()
+    if teams.shape[0] == 0:
+        teams = pd.DataFrame(columns=["season","team"])
+    needed = s.schedule[["season","team1_abbrev"]].drop_duplicates()
+    stored = set(zip(teams.season.astype(int), teams.team))
+    missing = [(int(season), team) for season, team in needed.values if (int(season), team) not in stored]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rosters = list(pool.map(lambda key: get_roster(key[1], key[0]), missing))
+    for (season, team), roster in zip(missing, rosters):
+        roster['team'] = team
+        roster['season'] = season
+    if len(missing) > 0:
+        teams = pd.concat([teams] + rosters, ignore_index=True)
+        if path:
+            for season in set([season for season, team in missing]):
+                write_partition(teams.loc[teams.season.astype(int) == season], path, season)
     teams.player = teams.player.str.split(' (',regex=False).str[0]
     return teams
 
@@ -1037,7 +1842,8 @@ qb_games: int = 10, team_games: int = 20, elo_adj: float = 3.3):
     Returns:
         pd.DataFrame: dataframe containing QB statistics and elo ratings throughout the timeframe of interest.
     """
-    stats = get_bulk_stats(start - 3,1,finish,50,True,"GameByGameFantasyFootballStats.csv")
+    stats = get_bulk_stats(start - 3,1,finish,50,True,"GameByGameFantasyFootballStats",\
+    columns=['season','week','game_id','player','team','opponent','pos','string','VALUE'],categorical=False)
     if finish == datetime.datetime.now().year and datetime.datetime.now().month > 5:
         # Accounting for current season
         sched = Schedule(finish,finish).schedule.copy()
@@ -1050,7 +1856,7 @@ qb_games: int = 10, team_games: int = 20, elo_adj: float = 3.3):
         current = current.loc[(current.pos == 'QB') & (current.string == 1.0)]
         missing = pd.merge(left=missing,right=current,how='inner',on='team')
         stats = pd.concat([stats,missing],ignore_index=True)
-    draft_pos = get_bulk_draft_pos(start - 10,finish,"NFLDraftPositions.csv")
+    draft_pos = get_bulk_draft_pos(start - 10,finish,"NFLDraftPositions")
     prev_all = stats.loc[(stats.season < stats.season.min() + 2) & \
     (stats.pos == 'QB') & (stats.string == 1)].reset_index(drop=True)
     by_opponent = prev_all.groupby(['season','week','game_id','opponent']).VALUE.sum().reset_index()
@@ -8,7 +8,9 @@ setup(
     author='Taylor Firman',
     author_email='tefirman@gmail.com',
     license='MIT',
-    packages=['FantasySports'],
+    packages=['FantasySports', 'FantasySports.res'],
+    package_dir={'FantasySports': 'FantasySports', 'FantasySports.res': 'res'},
+    package_data={'FantasySports.res': ['*/*.csv']},
     install_requires=["numpy",
                       "pandas",
                       "wget",
@@ -16,14 +18,14 @@ setup(
                       "yahoo_fantasy_api",
                       "python-dotenv",
                       "XlsxWriter",
-                      "geopy",
                       "matplotlib",
                       "beautifulsoup4",
                       "Unidecode",
                       "black",
                       "lxml",
                       "scipy",
-                      "pdoc"],
+                      "pdoc",
+                      "pyarrow>=14"],
 
     classifiers=[
         'Development Status :: 1 - Planning',